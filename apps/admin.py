@@ -3,6 +3,7 @@ from django.contrib import admin
 from .models import (
     Car,
     Customer,
+    MediaBlob,
     Master,
     Order,
     OrderPart,
@@ -11,6 +12,7 @@ from .models import (
     OrderPayment,
     Part,
     Service,
+    StockMovement,
     User,
 )
 
@@ -52,6 +54,19 @@ class PartAdmin(admin.ModelAdmin):
     search_fields = ("name", "article")
 
 
+class OrderTotalsAdminMixin:
+    """
+    Qator va to'lov adminlari uchun: "delete selected" ``QuerySet.delete()``
+    bilan ishlaydi va ``OrderTotalsMixin.delete`` ni chetlab o'tadi (buyurtma
+    summalari yangilanmaydi), shuning uchun faqat bittalab o'chiriladi.
+    """
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+
 class OrderServiceInline(admin.TabularInline):
     model = OrderService
     extra = 1
@@ -82,6 +97,7 @@ class OrderAdmin(admin.ModelAdmin):
         "status",
         "payment_status",
         "total_amount",
+        "paid_amount",
         "created_at",
     )
     list_filter = ("status", "payment_status", "payment_type", "created_at")
@@ -90,20 +106,41 @@ class OrderAdmin(admin.ModelAdmin):
 
 
 @admin.register(OrderService)
-class OrderServiceAdmin(admin.ModelAdmin):
+class OrderServiceAdmin(OrderTotalsAdminMixin, admin.ModelAdmin):
     list_display = ("order", "service", "status", "quantity", "price")
 
 
 @admin.register(OrderPart)
-class OrderPartAdmin(admin.ModelAdmin):
+class OrderPartAdmin(OrderTotalsAdminMixin, admin.ModelAdmin):
     list_display = ("order", "part", "quantity", "price")
 
 
 @admin.register(OrderPhoto)
 class OrderPhotoAdmin(admin.ModelAdmin):
-    list_display = ("order", "is_before", "uploaded_at")
+    list_display = ("order", "is_before", "processing_status", "width", "height", "uploaded_at")
+    list_filter = ("processing_status",)
 
 
 @admin.register(OrderPayment)
-class OrderPaymentAdmin(admin.ModelAdmin):
+class OrderPaymentAdmin(OrderTotalsAdminMixin, admin.ModelAdmin):
     list_display = ("order", "amount", "payment_type", "paid_at")
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ("part", "kind", "quantity", "order", "created_at")
+    list_filter = ("kind",)
+    # Jurnal faqat apps.stock orqali to'ldiriladi
+    readonly_fields = ("part", "order", "order_part", "kind", "quantity", "note", "created_at")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ("name", "size", "ref_count", "created_at")
+    readonly_fields = ("name", "size", "ref_count", "created_at")
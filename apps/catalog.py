@@ -0,0 +1,221 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import CatalogVersion, Part, Service, StockMovement
+
+
+# Jarayon bo'yicha (versiya, o'qilgan vaqt)
+_version_memo = {"value": None}
+
+
+def _cache():
+    return caches[getattr(settings, "CATALOG_CACHE_ALIAS", "default")]
+
+
+def version_key(version: CatalogVersion) -> str:
+    # updated_at ham qo'shiladi: rollback qilingan bump dan keyin raqam qayta
+    # ishlatilsa ham kalit boshqa bo'ladi
+    return f"{version.version}-{version.updated_at.timestamp():.6f}"
+
+
+def _memoized_version():
+    ttl = getattr(settings, "CATALOG_VERSION_TTL", 1.0)
+    cached = _version_memo["value"]
+    if cached is not None and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+    return None
+
+
+def current_version() -> str:
+    """
+    Katalog versiyasi kaliti. Bazadan ``CATALOG_VERSION_TTL`` soniyada bir marta
+    o'qiladi; shu jarayondagi o'zgarishlar ``bump_version`` orqali darhol ko'rinadi.
+    """
+    key = _memoized_version()
+    if key is None:
+        key = version_key(CatalogVersion.current())
+        _version_memo["value"] = (key, time.monotonic())
+    return key
+
+
+async def acurrent_version() -> str:
+    key = _memoized_version()
+    if key is None:
+        key = version_key(await CatalogVersion.acurrent())
+        _version_memo["value"] = (key, time.monotonic())
+    return key
+
+
+def _service_rows():
+    return Service.objects.order_by("name").values_list("pk", "name", "base_price")
+
+
+def _part_rows():
+    # Qoldiq bu yerda yo'q: u har buyurtmada o'zgaradi (``part_stock`` ga qarang)
+    return Part.objects.order_by("name").values_list("pk", "name", "article", "price")
+
+
+def _catalog(service_rows, part_rows) -> dict:
+    services = [
+        {"pk": pk, "name": name, "base_price": price}
+        for pk, name, price in service_rows
+    ]
+    parts = [
+        {
+            "pk": pk,
+            "name": name,
+            "article": article,
+            "price": price,
+        }
+        for pk, name, article, price in part_rows
+    ]
+    return {
+        "services": services,
+        "parts": parts,
+        "services_by_id": {s["pk"]: s for s in services},
+        "parts_by_id": {p["pk"]: p for p in parts},
+    }
+
+
+def _build_catalog() -> dict:
+    return _catalog(_service_rows(), _part_rows())
+
+
+async def _abuild_catalog() -> dict:
+    return _catalog(
+        [row async for row in _service_rows()],
+        [row async for row in _part_rows()],
+    )
+
+
+def get_catalog(version: str | None = None) -> dict:
+    """
+    ``Service``/``Part`` ro'yxatlari (nomi bo'yicha) va id -> yozuv xaritalari.
+
+    Kesh kaliti versiyani o'z ichiga oladi, shuning uchun eski kalitlar
+    versiya oshganda o'z-o'zidan ishlatilmay qoladi.
+    """
+    if version is None:
+        version = current_version()
+    key = f"catalog:v{version}"
+    cache = _cache()
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = _build_catalog()
+        cache.set(key, catalog, timeout=None)
+    return catalog
+
+
+async def aget_catalog(version: str | None = None) -> dict:
+    """``get_catalog`` ning async varianti (ASGI ko'rinishlari uchun)."""
+    if version is None:
+        version = await acurrent_version()
+    key = f"catalog:v{version}"
+    cache = _cache()
+    catalog = await cache.aget(key)
+    if catalog is None:
+        catalog = await _abuild_catalog()
+        await cache.aset(key, catalog, timeout=None)
+    return catalog
+
+
+def service_choices():
+    return [(s["pk"], s["name"]) for s in get_catalog()["services"]]
+
+
+def part_choices():
+    return [
+        (p["pk"], f"{p['name']} ({p['article']})") for p in get_catalog()["parts"]
+    ]
+
+
+def line_choices(kind: str):
+    """Buyurtma qatori formalari uchun tanlovlar: ``kind`` - ``"service"`` yoki ``"part"``."""
+    return {"service": service_choices, "part": part_choices}[kind]()
+
+
+def parse_ids(value: str):
+    """``"1,2,3"`` -> ``[1, 2, 3]``; bo'sh yoki noto'g'ri qiymatlar tashlanadi."""
+    ids = []
+    for chunk in (value or "").split(","):
+        chunk = chunk.strip()
+        if chunk.isdigit():
+            ids.append(int(chunk))
+    return ids
+
+
+def part_stock(part_ids=None) -> dict:
+    """Zapchast id -> joriy qoldiq (bazadan, keshsiz)."""
+    parts = Part.objects.all()
+    if part_ids is not None:
+        parts = parts.filter(pk__in=part_ids)
+    return dict(parts.values_list("pk", "stock_quantity"))
+
+
+def stock_state():
+    """
+    Qoldiqlar versiyasi: oxirgi ombor harakati ``(id, vaqt)`` yoki ``(0, None)``.
+
+    Buyurtma qatorlari katalog versiyasini oshirmaydi - qoldiq o'zgarganini
+    ETag/Last-Modified shu orqali biladi.
+    """
+    return StockMovement.objects.order_by("-pk").values_list("pk", "created_at").first() or (
+        0,
+        None,
+    )
+
+
+def request_stock_state(request):
+    if not hasattr(request, "_stock_state"):
+        request._stock_state = stock_state()
+    return request._stock_state
+
+
+def catalog_payload(service_ids=None, part_ids=None, version: str | None = None) -> dict:
+    """
+    Xizmat va zapchastlar narxlari (zapchast uchun qoldiq ham).
+
+    ID lar berilmasa butun katalog qaytariladi. Nom/narx keshlangan
+    katalogdan, qoldiq ``part_stock`` dan.
+    """
+    catalog = get_catalog(version)
+    services = catalog["services"]
+    parts = catalog["parts"]
+    if service_ids is not None:
+        wanted = set(service_ids)
+        services = [s for s in services if s["pk"] in wanted]
+    if part_ids is not None:
+        wanted = set(part_ids)
+        parts = [p for p in parts if p["pk"] in wanted]
+    stock = part_stock(part_ids)
+    return {
+        "services": {
+            str(s["pk"]): {"name": s["name"], "price": str(s["base_price"])}
+            for s in services
+        },
+        "parts": {
+            str(p["pk"]): {
+                "name": p["name"],
+                "price": str(p["price"]),
+                "stock": stock.get(p["pk"], 0),
+            }
+            for p in parts
+        },
+    }
+
+
+def request_catalog_version(request) -> CatalogVersion:
+    """Bitta so'rov ichida versiyani bir marta o'qish (ETag va Last-Modified uchun)."""
+    if not hasattr(request, "_catalog_version"):
+        request._catalog_version = CatalogVersion.current()
+    return request._catalog_version
+
+
+def bump_version() -> None:
+    cached = _version_memo["value"]
+    CatalogVersion.bump()
+    _version_memo["value"] = None
+    if cached is not None:
+        _cache().delete(f"catalog:v{cached[0]}")
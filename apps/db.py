@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+@contextmanager
+def write_atomic(using=None):
+    """
+    Yozuvchi yo'llar uchun ``transaction.atomic()``.
+
+    SQLite da tashqi blok ``BEGIN IMMEDIATE`` bilan ochiladi: yozish qulfi
+    boshida olinadi, parallel yozuvchilar busy_timeout bo'yicha navbatda
+    kutadi (o'qib bo'lgach qulfni oshirishda "database is locked" bo'lmaydi).
+    Qolgan atomic() bloklar DEFERRED qoladi. Ichma-ich chaqirilganda yoki
+    boshqa bazalarda - oddiy atomic().
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+    # transaction_mode har yangi ulanishda sozlamalardan qayta o'rnatiladi
+    connection.ensure_connection()
+    previous = connection.transaction_mode
+    connection.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = previous
+            yield
+    finally:
+        connection.transaction_mode = previous
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+from .models import ServiceStatus
+
+
+logger = logging.getLogger(__name__)
+
+# Sekin mijoz navbati to'lsa yuboriladi: sahifa ro'yxatni qaytadan yuklaydi
+RESYNC = {"type": "resync"}
+
+
+class TooManySubscribers(Exception):
+    """``ORDER_EVENTS_MAX_CLIENTS`` dan ortiq ulanish."""
+
+
+class Subscription:
+    """Bitta SSE mijozi: o'z event loop'idagi cheklangan navbat."""
+
+    def __init__(self, loop, maxsize: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event) -> None:
+        # Faqat mijoz loop'ida chaqiriladi (call_soon_threadsafe)
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Backpressure: eski hodisalar o'rniga bitta resync - xotira cheklangan
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InMemoryBroker:
+    """
+    Jarayon ichidagi pub/sub (standart). Hodisalarga ketma-ket ``id`` beriladi
+    va oxirgi ``history`` tasi saqlanadi - qayta ulangan mijoz ``Last-Event-ID``
+    dan keyingilarini oladi. Bir nechta worker bo'lsa har biri faqat o'z
+    jarayonidagi o'zgarishlarni ko'radi (``PostgresBroker`` ga qarang).
+    """
+
+    def __init__(self, queue_size: int = 100, max_clients: int = 200, history: int = 256):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._next_id = 1
+
+    def publish(self, event: dict) -> None:
+        self.deliver(event)
+
+    def deliver(self, event: dict) -> None:
+        with self._lock:
+            event = {**event, "id": self._next_id}
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # Loop yopilgan - mijoz ketgan
+                self.unsubscribe(subscription)
+
+    def subscribe(self, last_id: int | None = None) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                raise TooManySubscribers
+            self._subscribers.add(subscription)
+            if last_id is not None:
+                missed = [event for event in self._history if event["id"] > last_id]
+                oldest = self._history[0]["id"] if self._history else self._next_id
+                if last_id + 1 < oldest or last_id >= self._next_id:
+                    # Tarixdan tashqarida qolgan yoki server qayta ishga tushgan
+                    missed = [RESYNC]
+                for event in missed[-self.queue_size:]:
+                    subscription.queue.put_nowait(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clients": len(self._subscribers), "last_id": self._next_id - 1}
+
+
+class PostgresBroker(InMemoryBroker):
+    """
+    Bir nechta worker/server uchun: hodisa ``pg_notify`` bilan yuboriladi,
+    har bir jarayondagi tinglovchi oqim uni o'z mijozlariga tarqatadi.
+    """
+
+    channel = "order_events"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._listener = None
+
+    def publish(self, event: dict) -> None:
+        with connections["default"].cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_notify(%s, %s)",
+                [self.channel, json.dumps(event, cls=DjangoJSONEncoder)],
+            )
+
+    def subscribe(self, last_id: int | None = None) -> Subscription:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="order-events-listener", daemon=True
+                )
+                self._listener.start()
+        return super().subscribe(last_id)
+
+    def _listen(self) -> None:
+        import psycopg
+
+        params = connections["default"].get_connection_params()
+        params.pop("cursor_factory", None)
+        params.pop("context", None)
+        params.pop("pool", None)
+        while True:
+            try:
+                with psycopg.connect(**params, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    for notify in conn.notifies():
+                        self.deliver(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Order events listener failed, reconnecting")
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> InMemoryBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.ORDER_EVENTS_BROKER)(
+                    **getattr(settings, "ORDER_EVENTS_OPTIONS", {})
+                )
+    return _broker
+
+
+def publish_on_commit(event: dict) -> None:
+    """Tranzaksiya muvaffaqiyatli tugagandan keyin yuborish (rollback - hodisa yo'q)."""
+
+    def send():
+        try:
+            get_broker().publish(event)
+        except Exception:
+            # Jonli panel ixtiyoriy - saqlash xato bermasligi kerak
+            logger.exception("Failed to publish order event")
+
+    transaction.on_commit(send)
+
+
+def _event_key(order) -> tuple:
+    return (
+        order.status,
+        order.payment_status,
+        order.total_amount,
+        order.paid_amount,
+        order.master_id,
+    )
+
+
+def order_saved(order, created: bool) -> None:
+    """Yangi buyurtma yoki status/to'lov/summa/usta o'zgarishi - hodisa."""
+    key = _event_key(order)
+    if not created and getattr(order, "_saved_event_key", None) == key:
+        return
+    order._saved_event_key = key
+    publish_on_commit(
+        {
+            "type": "order.created" if created else "order.updated",
+            "order": order.pk,
+            "status": order.status,
+            "status_label": order.get_status_display(),
+            "payment_status": order.payment_status,
+            "payment_status_label": order.get_payment_status_display(),
+            "total": str(order.total_amount),
+            "paid": str(order.paid_amount),
+            "remaining": str(order.total_amount - order.paid_amount),
+            "master": order.master_id,
+        }
+    )
+
+
+def _service_event(order_id: int, item_id: int, status: str) -> None:
+    publish_on_commit(
+        {
+            "type": "service.updated",
+            "order": order_id,
+            "item": item_id,
+            "status": status,
+            "status_label": ServiceStatus(status).label,
+        }
+    )
+
+
+def service_saved(item, created: bool) -> None:
+    if not created and getattr(item, "_saved_event_status", None) == item.status:
+        return
+    item._saved_event_status = item.status
+    _service_event(item.order_id, item.pk, item.status)
+
+
+def services_saved(new=(), changed=()) -> None:
+    """``bulk_create``/``bulk_update`` dan keyin (post_save chaqirilmaydi)."""
+    for item in new:
+        service_saved(item, created=True)
+    for item in changed:
+        service_saved(item, created=False)
+
+
+def services_moved(order_id: int, item_ids, status: str) -> None:
+    """``update()`` bilan status o'zgartirilgan xizmatlar uchun."""
+    for item_id in item_ids:
+        _service_event(order_id, item_id, status)
@@ -1,6 +1,12 @@
+from collections import defaultdict
+
 from django import forms
+from django.core.exceptions import ValidationError
 from django.forms import inlineformset_factory
+from django.urls import reverse_lazy
 
+from . import stock
+from .catalog import line_choices
 from .models import (
     Customer,
     Car,
@@ -22,6 +28,41 @@ TAILWIND_INPUT = (
 )
 
 
+class AutocompleteSelect(forms.Select):
+    """
+    Faqat tanlangan qiymatni ``<option>`` sifatida chiqaradigan select.
+
+    Qolgan variantlar ``data-autocomplete-url`` orqali brauzerda qidiriladi,
+    shuning uchun sahifa hajmi mijozlar/mashinalar soniga bog'liq emas.
+    """
+
+    def __init__(self, url, attrs=None):
+        attrs = {**(attrs or {}), "data-autocomplete-url": url}
+        super().__init__(attrs=attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [v for v in value if v not in ("", None)]
+        field = getattr(self.choices, "field", None)
+        empty_label = getattr(field, "empty_label", None) or "---------"
+        options = [self.create_option(name, "", empty_label, not selected, 0)]
+        if selected and field is not None:
+            try:
+                objects = list(self.choices.queryset.filter(pk__in=selected))
+            except (ValueError, TypeError, ValidationError):
+                objects = []
+            for index, obj in enumerate(objects, start=1):
+                options.append(
+                    self.create_option(
+                        name,
+                        str(obj.pk),
+                        field.label_from_instance(obj),
+                        True,
+                        index,
+                    )
+                )
+        return [(None, options, 0)]
+
+
 class TailwindModelForm(forms.ModelForm):
     """
     Barcha ModelFormlar uchun umumiy Tailwind klasslarini qo'llash.
@@ -52,6 +93,9 @@ class CarForm(TailwindModelForm):
     class Meta:
         model = Car
         fields = ["customer", "brand", "model", "plate_number", "vin"]
+        widgets = {
+            "customer": AutocompleteSelect(reverse_lazy("apps:api_customer_search")),
+        }
 
 
 class OrderForm(TailwindModelForm):
@@ -66,12 +110,74 @@ class OrderForm(TailwindModelForm):
             "payment_status",
             "payment_type",
         ]
+        widgets = {
+            "customer": AutocompleteSelect(reverse_lazy("apps:api_customer_search")),
+            "car": AutocompleteSelect(reverse_lazy("apps:api_car_search")),
+        }
+
+
+class PrefetchedModelChoiceField(forms.ModelChoiceField):
+    """``objects`` (pk -> obj) berilgan bo'lsa, qiymat bazaga so'rovsiz tanlanadi."""
+
+    objects = None
+
+    def to_python(self, value):
+        if self.objects is not None and value not in self.empty_values:
+            try:
+                obj = self.objects.get(int(value))
+            except (TypeError, ValueError):
+                obj = None
+            if obj is not None:
+                return obj
+        return super().to_python(value)
+
+
+class OrderLineFormMixin:
+    """
+    Formset bo'sh deb belgilagan qo'shimcha qator o'zgarmagan hisoblanadi:
+    Django uni tekshirmaydi va saqlamaydi.
+    """
+
+    blank_row = False
+
+    def has_changed(self):
+        return not self.blank_row and super().has_changed()
+
+
+class CatalogLineFormMixin(OrderLineFormMixin):
+    """
+    Xizmat/zapchast qatori formasi.
+
+    Tanlovlar katalog keshidan, tanlangan obyekt esa formset oldindan
+    yuklagan ``objects`` dan olinadi - qator uchun SELECT ham, ForeignKey
+    mavjudligini qayta tekshirish ham bo'lmaydi.
+    """
+
+    # "service" yoki "part" - maydon nomi va katalog tanlovlari turi
+    catalog_field = ""
+
+    def __init__(self, *args, choices=None, objects=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields[self.catalog_field]
+        if choices is None:
+            choices = [("", field.empty_label), *line_choices(self.catalog_field)]
+        field.choices = choices
+        field.objects = objects
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        if self.fields[self.catalog_field].objects is not None:
+            exclude.add(self.catalog_field)
+        return exclude
+
 
+class OrderServiceForm(CatalogLineFormMixin, TailwindModelForm):
+    catalog_field = "service"
 
-class OrderServiceForm(TailwindModelForm):
     class Meta:
         model = OrderService
         fields = ["service", "status", "price", "discount"]
+        field_classes = {"service": PrefetchedModelChoiceField}
         widgets = {
             "price": forms.NumberInput(attrs={
                 "readonly": True,
@@ -88,10 +194,13 @@ class OrderServiceForm(TailwindModelForm):
         }
 
 
-class OrderPartForm(TailwindModelForm):
+class OrderPartForm(CatalogLineFormMixin, TailwindModelForm):
+    catalog_field = "part"
+
     class Meta:
         model = OrderPart
         fields = ["part", "quantity", "price", "discount"]
+        field_classes = {"part": PrefetchedModelChoiceField}
         widgets = {
             "price": forms.NumberInput(attrs={
                 "readonly": True,
@@ -108,13 +217,13 @@ class OrderPartForm(TailwindModelForm):
         }
 
 
-class OrderPhotoForm(TailwindModelForm):
+class OrderPhotoForm(OrderLineFormMixin, TailwindModelForm):
     class Meta:
         model = OrderPhoto
         fields = ["image", "is_before"]
 
 
-class OrderPaymentForm(TailwindModelForm):
+class OrderPaymentForm(OrderLineFormMixin, TailwindModelForm):
     class Meta:
         model = OrderPayment
         fields = ["amount", "payment_type", "note"]
@@ -138,37 +247,119 @@ class PartForm(TailwindModelForm):
         fields = ["name", "article", "price", "stock_quantity"]
 
 
-class BaseOrderServiceFormSet(forms.BaseInlineFormSet):
+class SharedChoicesFormSetMixin:
+    """Katalog tanlovlarini formset bo'yicha bir marta hisoblab, har bir formaga berish."""
+
+    def shared_objects(self):
+        """Yuborilgan barcha qatorlardagi katalog obyektlarini bitta so'rovda yuklash."""
+        if not self.is_bound:
+            return None
+        name = self.form.catalog_field
+        ids = {
+            self.data.get(f"{self.add_prefix(i)}-{name}", "")
+            for i in range(self.total_form_count())
+        }
+        model = self.form._meta.model._meta.get_field(name).related_model
+        return model.objects.in_bulk([int(v) for v in ids if str(v).isdigit()])
+
+    def get_form_kwargs(self, index):
+        kwargs = super().get_form_kwargs(index)
+        if not hasattr(self, "_shared_choices"):
+            self._shared_choices = [("", "---------"), *line_choices(self.form.catalog_field)]
+            self._shared_objects = self.shared_objects()
+        kwargs["choices"] = self._shared_choices
+        kwargs["objects"] = self._shared_objects
+        return kwargs
+
+
+class BaseOrderLineFormSet(forms.BaseInlineFormSet):
+    """
+    Buyurtma qatorlari formseti.
+
+    Bo'sh qo'shimcha qatorlar (``blank_field`` yuborilmagan) forma
+    yaratilayotganda bir marta aniqlanadi va tekshiruvdan o'tkazib yuboriladi;
+    mavjud qatorlar ``id`` maydoni formset querysetidan olinadi (qator uchun SELECT yo'q).
+    """
+
+    blank_field = ""
+
+    def is_blank_row(self, index: int) -> bool:
+        key = f"{self.add_prefix(index)}-{self.blank_field}"
+        return not self.data.get(key) and not self.files.get(key)
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if self.is_bound and i >= self.initial_form_count() and self.is_blank_row(i):
+            form.blank_row = True
+            form.empty_permitted = True
+        return form
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        pk_name = self._pk_field.name
+        field = form.fields.get(pk_name)
+        if self.is_bound and isinstance(field, forms.ModelChoiceField):
+            prefetched = PrefetchedModelChoiceField(
+                field.queryset,
+                initial=field.initial,
+                required=False,
+                widget=field.widget,
+            )
+            # get_queryset() natijasi keshlanadi - qo'shimcha so'rov bo'lmaydi
+            prefetched.objects = {obj.pk: obj for obj in self.get_queryset()}
+            form.fields[pk_name] = prefetched
+
+
+class BaseOrderServiceFormSet(SharedChoicesFormSetMixin, BaseOrderLineFormSet):
+    blank_field = "service"
+
+
+class BaseOrderPartFormSet(SharedChoicesFormSetMixin, BaseOrderLineFormSet):
+    blank_field = "part"
+
     def clean(self):
-        """Bo'sh formlarni o'tkazib yuborish"""
         if any(self.errors):
             return
-        # Bo'sh formlarni o'tkazib yuborish
+        self.check_stock()
+
+    def check_stock(self):
+        """Omborda yetarli zapchast borligini tekshirish (mavjud qatorlar miqdori hisobga olinadi)."""
+        needed = defaultdict(int)
+        first_form = {}
         for form in self.forms:
+            saved = getattr(form.instance, "_saved_stock_key", None) if form.instance.pk else None
+            if saved:
+                needed[saved[1]] -= saved[2]
             if form in self.deleted_forms:
                 continue
-            # cleaned_data hali mavjud emas, shuning uchun data dan tekshiramiz
-            service_value = form.data.get(form.add_prefix('service'), '')
-            if not service_value or service_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in form.fields:
-                    form.fields[field_name].required = False
-
-class BaseOrderPartFormSet(forms.BaseInlineFormSet):
-    def clean(self):
-        """Bo'sh formlarni o'tkazib yuborish"""
-        if any(self.errors):
-            return
-        # Bo'sh formlarni o'tkazib yuborish
-        for form in self.forms:
-            if form in self.deleted_forms:
+            part = form.cleaned_data.get("part")
+            if part is None:
                 continue
-            # cleaned_data hali mavjud emas, shuning uchun data dan tekshiramiz
-            part_value = form.data.get(form.add_prefix('part'), '')
-            if not part_value or part_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in form.fields:
-                    form.fields[field_name].required = False
+            needed[part.pk] += form.cleaned_data.get("quantity") or 0
+            first_form.setdefault(part.pk, form)
+        wanted = {pk: qty for pk, qty in needed.items() if qty > 0 and pk in first_form}
+        if not wanted:
+            return
+        for part in Part.objects.filter(pk__in=wanted).only("pk", "name", "article", "stock_quantity"):
+            if wanted[part.pk] > part.stock_quantity:
+                first_form[part.pk].add_error(
+                    "quantity",
+                    str(stock.InsufficientStock(part, wanted[part.pk], part.stock_quantity)),
+                )
+
+    def save(self, commit=True):
+        # Barcha qatorlarning ombor harakatlari bitta tranzaksiyada
+        with stock.batch():
+            return super().save(commit)
+
+
+class BaseOrderPhotoFormSet(BaseOrderLineFormSet):
+    blank_field = "image"
+
+
+class BaseOrderPaymentFormSet(BaseOrderLineFormSet):
+    blank_field = "amount"
+
 
 OrderServiceFormSet = inlineformset_factory(
     Order,
@@ -194,6 +385,7 @@ OrderPhotoFormSet = inlineformset_factory(
     Order,
     OrderPhoto,
     form=OrderPhotoForm,
+    formset=BaseOrderPhotoFormSet,
     extra=1,
     can_delete=True,
 )
@@ -202,6 +394,7 @@ OrderPaymentFormSet = inlineformset_factory(
     Order,
     OrderPayment,
     form=OrderPaymentForm,
+    formset=BaseOrderPaymentFormSet,
     extra=1,
     can_delete=True,
 )
@@ -0,0 +1,71 @@
+import hashlib
+
+from . import catalog
+from .models import Order
+
+
+# Shablon fragmentlari keshi ({% cache ... using="fragments" %}) kalitlari.
+# Kalit fragmentda ko'rinadigan maydonlardan tuziladi: buyurtma, qator yoki
+# to'lov, mijoz/mashina yoki katalog o'zgarsa kalit ham o'zgaradi - eski
+# fragment o'chirilmaydi, shunchaki boshqa ishlatilmaydi (TTL/siqib chiqarish).
+
+# Ro'yxat qatori (orders/order_list.jinja)
+ROW_FIELDS = (
+    "id",
+    "updated_at",
+    "lines_version",
+    "payments_version",
+    # update_fields bilan saqlashda updated_at yangilanmaydi
+    "status",
+    "payment_status",
+    "total_amount",
+    "paid_amount",
+    "customer__full_name",
+    "customer__phone",
+    "car__plate_number",
+    "car__brand",
+    "car__model",
+)
+# Xizmatlar/zapchastlar jadvallari (orders/order_detail.jinja); status -
+# buyurtma yakunlanganda xizmatlar ``update()`` bilan "done" bo'ladi
+LINES_FIELDS = ("id", "updated_at", "lines_version", "status")
+# Hisob-kitob bloki
+SUMMARY_FIELDS = (
+    "id",
+    "updated_at",
+    "lines_version",
+    "payments_version",
+    "total_amount",
+    "paid_amount",
+)
+
+
+def _key(order: Order, fields, *extra) -> str:
+    parts = []
+    for field in fields:
+        obj = order
+        for attr in field.split("__"):
+            obj = getattr(obj, attr)
+        parts.append(str(obj))
+    parts.extend(str(value) for value in extra)
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+def row_key(order: Order) -> str:
+    """``Order.objects.select_related("customer", "car")`` qatori uchun (saqlangan summalar)."""
+    return _key(order, ROW_FIELDS)
+
+
+def set_row_keys(orders):
+    """Ro'yxatdagi har bir buyurtmaga ``fragment_key`` (shablonda ishlatiladi)."""
+    for order in orders:
+        order.fragment_key = row_key(order)
+    return orders
+
+
+def detail_keys(order: Order) -> dict:
+    # Xizmat/zapchast nomlari katalogdan - katalog versiyasi ham kalitda
+    return {
+        "lines": _key(order, LINES_FIELDS, catalog.current_version()),
+        "summary": _key(order, SUMMARY_FIELDS),
+    }
@@ -0,0 +1,219 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["RequestMetrics | None"] = ContextVar("request_metrics", default=None)
+_untracked: ContextVar[bool] = ContextVar("untracked_sql", default=False)
+
+
+class QueryBudgetExceeded(Exception):
+    """View o'ziga ajratilgan so'rovlar/vaqt byudjetidan oshib ketdi."""
+
+
+@dataclass
+class RequestMetrics:
+    queries: int = 0
+    sql_ms: float = 0.0
+    template_ms: float = 0.0
+    total_ms: float = 0.0
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None or _untracked.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql_ms += (time.perf_counter() - start) * 1000
+
+
+def track_queries(connection) -> None:
+    """
+    Ulanish so'rovlarini joriy so'rov metrikalariga yozish (bir marta o'rnatiladi).
+
+    Metrikalar ``ContextVar`` dan olinadi: ASGI da ORM bir oqimdagi umumiy
+    ulanishdan ishlasa ham har bir so'rov faqat o'zinikini sanaydi.
+    """
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_ms += (time.perf_counter() - start) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Shablon render vaqtini joriy so'rov metrikalariga qo'shadigan backend."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+@contextmanager
+def untracked():
+    """Xizmat so'rovlari (masalan, replika tekshiruvi) view byudjetiga kirmaydi."""
+    token = _untracked.set(True)
+    try:
+        yield
+    finally:
+        _untracked.reset(token)
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class StatsRegistry:
+    """URL nomi bo'yicha oxirgi N ta so'rov metrikalari (jarayon xotirasida)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(deque)
+
+    def record(self, name: str, metrics: RequestMetrics) -> None:
+        window = getattr(settings, "PERF_STATS_WINDOW", 1000)
+        with self._lock:
+            samples = self._samples[name]
+            samples.append(
+                (metrics.total_ms, metrics.sql_ms, metrics.queries, metrics.template_ms)
+            )
+            while len(samples) > window:
+                samples.popleft()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self) -> dict:
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+        result = {}
+        for name, samples in sorted(snapshot.items()):
+            columns = {
+                "total_ms": sorted(s[0] for s in samples),
+                "sql_ms": sorted(s[1] for s in samples),
+                "queries": sorted(s[2] for s in samples),
+                "template_ms": sorted(s[3] for s in samples),
+            }
+            result[name] = {"count": len(samples)}
+            for column, values in columns.items():
+                result[name][column] = {
+                    "p50": round(percentile(values, 0.50), 2),
+                    "p95": round(percentile(values, 0.95), 2),
+                    "p99": round(percentile(values, 0.99), 2),
+                }
+        return result
+
+
+stats = StatsRegistry()
+
+
+def check_budget(name: str, metrics: RequestMetrics, method: str = "GET") -> list:
+    """
+    ``VIEW_BUDGETS`` dagi cheklovlardan oshgan qiymatlar ro'yxati.
+    Avval ``"POST apps:order_create"`` kabi metodli kalit, keyin URL nomi qidiriladi.
+    """
+    budgets = getattr(settings, "VIEW_BUDGETS", {})
+    budget = budgets.get(f"{method} {name}", budgets.get(name))
+    if not budget:
+        return []
+    problems = []
+    if "queries" in budget and metrics.queries > budget["queries"]:
+        problems.append(f"{metrics.queries} queries > {budget['queries']}")
+    if "ms" in budget and metrics.total_ms > budget["ms"]:
+        problems.append(f"{metrics.total_ms:.1f} ms > {budget['ms']} ms")
+    return problems
+
+
+class RequestMetricsMiddleware:
+    """
+    Har bir so'rov uchun SQL soni/vaqti, shablon va umumiy vaqtni o'lchash.
+
+    Natijalar ``Server-Timing`` sarlavhasida qaytariladi va ``stats`` ga
+    yoziladi. ``VIEW_BUDGETS`` dan oshilsa ogohlantirish yoziladi,
+    ``PERF_BUDGET_STRICT = True`` bo'lsa ``QueryBudgetExceeded`` ko'tariladi
+    (testlarda regressiyani ushlash uchun). ASGI da async ko'rinishlar
+    oqimga o'tkazilmasligi uchun middleware async ham ishlaydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, start)
+
+    def _finish(self, request, response, metrics: RequestMetrics, start: float):
+        metrics.total_ms = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        name = match.view_name if match else "<unresolved>"
+        stats.record(name, metrics)
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'sql;dur={metrics.sql_ms:.1f};desc="{metrics.queries} queries"',
+                f"tpl;dur={metrics.template_ms:.1f}",
+                f"total;dur={metrics.total_ms:.1f}",
+            ]
+        )
+
+        problems = check_budget(name, metrics, request.method)
+        if problems:
+            message = f"{name}: budget exceeded ({', '.join(problems)})"
+            if getattr(settings, "PERF_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
@@ -0,0 +1,213 @@
+import json
+import statistics
+import subprocess
+import time
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.db import write_atomic
+from apps.instrumentation import percentile
+from apps.models import Order, OrderStatus, Part, PaymentStatus, Service
+
+
+BENCH_USERNAME = "bench"
+BENCH_DESCRIPTION = "benchmark"
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives key views through the test client and writes latency percentiles "
+        "and query counts to a JSON file (for comparing commits)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--output", default="", help="JSON file (default: benchmarks/<git rev>.json)"
+        )
+        parser.add_argument(
+            "--only", default="", help="Comma separated scenario names"
+        )
+        parser.add_argument(
+            "--read-only", action="store_true", help="Skip write scenarios (order_create POST)"
+        )
+        parser.add_argument(
+            "--commit",
+            action="store_true",
+            help="Keep rows created by write scenarios (default: deleted after each scenario)",
+        )
+
+    def handle(self, *args, **options):
+        order = Order.objects.order_by("-id").first()
+        service = Service.objects.order_by("id").first()
+        part = Part.objects.order_by("id").first()
+        if not (order and service and part):
+            raise CommandError("No data to benchmark - run `seed_data --scale N` first.")
+
+        client = Client(HTTP_HOST="localhost")
+        user, created = get_user_model().objects.get_or_create(
+            username=BENCH_USERNAME, defaults={"is_staff": True, "is_superuser": True}
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+        client.force_login(user)
+
+        scenarios = self.build_scenarios(client, order, service, part, options["read_only"])
+        if options["only"]:
+            wanted = {name.strip() for name in options["only"].split(",") if name.strip()}
+            scenarios = [s for s in scenarios if s[0] in wanted]
+
+        results = {}
+        for name, run in scenarios:
+            # Har bir ssenariy haqiqiy (commit qilinadigan) tranzaksiyalarda o'lchanadi -
+            # tashqi atomic savepoint larga aylantirib, lock va fsync narxini yashiradi
+            last_id = Order.objects.aggregate(last=Max("id"))["last"] or 0
+            results[name] = self.measure(name, run, options["iterations"], options["warmup"])
+            if not options["commit"]:
+                self.cleanup(last_id)
+
+        revision = git_revision()
+        report = {
+            "revision": revision,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "rows": {
+                "orders": Order.objects.count(),
+                "services": Service.objects.count(),
+                "parts": Part.objects.count(),
+            },
+            "scenarios": results,
+        }
+        output = Path(options["output"] or Path("benchmarks") / f"{revision or 'local'}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        self.stdout.write(self.style.SUCCESS(f"✓ Benchmark written to {output}"))
+
+    def build_scenarios(self, client, order, service, part, read_only):
+        today = date.today()
+
+        def get(url, **params):
+            def run():
+                response = client.get(url, params)
+                if getattr(response, "streaming", False):
+                    # Streaming javobni oxirigacha o'qish - aks holda so'rovlar bajarilmaydi
+                    for _ in response.streaming_content:
+                        pass
+                return response
+            return run
+
+        scenarios = [
+            ("order_list", get(reverse("apps:order_list"))),
+            ("order_list_search", get(reverse("apps:order_list"), q=order.customer.full_name[:4])),
+            ("order_list_status", get(reverse("apps:order_list"), status=OrderStatus.COMPLETED)),
+            ("order_detail", get(reverse("apps:order_detail", args=[order.pk]))),
+            ("order_create_get", get(reverse("apps:order_create"))),
+            ("daily_report_csv", get(reverse("apps:daily_report_csv"), date=today.isoformat())),
+            (
+                "monthly_report_csv",
+                get(reverse("apps:monthly_report_csv"), year=today.year, month=today.month),
+            ),
+            ("api_service_price", get(reverse("apps:api_service_price", args=[service.pk]))),
+            ("api_part_price", get(reverse("apps:api_part_price", args=[part.pk]))),
+            ("api_catalog", get(reverse("apps:api_catalog"))),
+        ]
+        if not read_only:
+            scenarios.append(
+                ("order_create_post", self.order_create_post(client, order, service, part))
+            )
+        return scenarios
+
+    def order_create_post(self, client, order, service, part):
+        url = reverse("apps:order_create")
+        data = {
+            "customer": order.customer_id,
+            "car": order.car_id,
+            "master": order.master_id or "",
+            "description": BENCH_DESCRIPTION,
+            "status": OrderStatus.NEW,
+            "payment_status": PaymentStatus.UNPAID,
+            "payment_type": "",
+            "services-TOTAL_FORMS": 1,
+            "services-INITIAL_FORMS": 0,
+            "services-0-service": service.pk,
+            "services-0-status": "in_progress",
+            "services-0-price": service.base_price,
+            "services-0-discount": 0,
+            "parts-TOTAL_FORMS": 1,
+            "parts-INITIAL_FORMS": 0,
+            "parts-0-part": part.pk,
+            "parts-0-quantity": 1,
+            "parts-0-price": part.price,
+            "parts-0-discount": 0,
+            "photos-TOTAL_FORMS": 0,
+            "photos-INITIAL_FORMS": 0,
+            "payments-TOTAL_FORMS": 0,
+            "payments-INITIAL_FORMS": 0,
+        }
+
+        def run():
+            return client.post(url, data)
+        return run
+
+    def cleanup(self, last_id: int) -> int:
+        # Ssenariy yaratgan buyurtmalar; qatorlar kaskad bilan o'chiriladi,
+        # post_delete signallari ombor, rollup va yuklamani qaytaradi
+        with write_atomic():
+            deleted, _ = Order.objects.filter(pk__gt=last_id, description=BENCH_DESCRIPTION).delete()
+        return deleted
+
+    def measure(self, name, run, iterations, warmup):
+        for _ in range(warmup):
+            run()
+
+        timings, queries, statuses = [], [], set()
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = run()
+                elapsed = (time.perf_counter() - started) * 1000
+            timings.append(elapsed)
+            queries.append(len(captured.captured_queries))
+            statuses.add(response.status_code)
+
+        timings.sort()
+        result = {
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+            "queries_min": min(queries),
+            "queries_max": max(queries),
+            "queries_mean": round(statistics.fmean(queries), 1),
+            "status_codes": sorted(statuses),
+        }
+        self.stdout.write(
+            f"  {name:<22} p50={result['p50_ms']:>8.2f}ms  p95={result['p95_ms']:>8.2f}ms  "
+            f"queries={result['queries_max']}  status={result['status_codes']}"
+        )
+        return result
@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from apps.fragments import set_row_keys
+from apps.instrumentation import percentile
+from apps.models import Order
+from apps.pagination import KeysetPage
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders orders/order_list.jinja with --rows orders with the fragment cache "
+        "off, cold and warm, and reports render time percentiles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+
+    def handle(self, *args, **options):
+        orders = list(
+            Order.objects.select_related("customer", "car", "master")
+            .order_by("-created_at", "-id")[: options["rows"]]
+        )
+        if not orders:
+            raise CommandError("No orders - run `seed_data --scale N` first.")
+        set_row_keys(orders)
+
+        request = RequestFactory(HTTP_HOST="localhost").get(reverse("apps:order_list"))
+        request.user = (
+            get_user_model().objects.filter(is_superuser=True).order_by("pk").first()
+            or AnonymousUser()
+        )
+        context = {"orders": orders, "page": KeysetPage(object_list=orders), "filter": {}}
+
+        def render():
+            return render_to_string("orders/order_list.jinja", context, request=request)
+
+        def cold():
+            caches["fragments"].clear()
+            return render()
+
+        self.stdout.write(f"  orders/order_list.jinja  rows={len(orders)}")
+        # Keshsiz: fragments -> DummyCache ({% cache %} har safar chizadi)
+        dummy = {
+            **settings.CACHES,
+            "fragments": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+        with override_settings(CACHES=dummy):
+            off = self.measure("off", render, options)
+        self.measure("cold", cold, options)
+        caches["fragments"].clear()
+        warm = self.measure("warm", render, options)
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Warm fragments render {off / warm:.1f}x faster (p50)")
+        )
+
+    def measure(self, name, run, options):
+        for _ in range(options["warmup"]):
+            run()
+        timings = []
+        for _ in range(options["iterations"]):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p50 = percentile(timings, 0.50)
+        self.stdout.write(
+            f"  {name:<5} p50={p50:>8.2f}ms  p95={percentile(timings, 0.95):>8.2f}ms  "
+            f"mean={statistics.fmean(timings):>8.2f}ms"
+        )
+        return p50
@@ -0,0 +1,126 @@
+import random
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from apps.db import write_atomic
+from apps.instrumentation import percentile
+from apps.models import Order, OrderPayment, PaymentType
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs parallel writer threads (order locked, payment added and removed again, with totals, "
+        "rollups and receipt versions) plus readers, and reports throughput, latency "
+        "and 'database is locked' errors. Compare SQLITE_PROFILE=plain and tuned."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--orders", type=int, default=200, help="Orders to spread writes over")
+
+    def handle(self, *args, **options):
+        order_ids = list(
+            Order.objects.order_by("-created_at").values_list("pk", flat=True)[: options["orders"]]
+        )
+        if not order_ids:
+            raise CommandError("No orders - run `seed_data --scale N` first.")
+        journal = connection.vendor
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal = cursor.fetchone()[0]
+        mode = connection.settings_dict.get("OPTIONS", {}).get("transaction_mode") or "DEFERRED"
+        if connection.vendor == "sqlite":
+            mode += " (writers: IMMEDIATE)"
+        self.stdout.write(
+            f"  journal_mode={journal}  transaction_mode={mode}  "
+            f"writers={options['writers']}  readers={options['readers']}"
+        )
+        connections.close_all()
+
+        deadline = time.monotonic() + options["seconds"]
+        results = {"writes": [], "reads": 0, "locked": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def writer(seed):
+            rng = random.Random(seed)
+            timings, locked, errors = [], 0, 0
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        with write_atomic():
+                            # Ko'rinishlardagidek: avval buyurtmani o'qish (qulflash), keyin yozish
+                            order = Order.objects.select_for_update().only("pk").get(
+                                pk=rng.choice(order_ids)
+                            )
+                            payment = OrderPayment(
+                                order_id=order.pk,
+                                amount=1,
+                                payment_type=PaymentType.CASH,
+                                note="benchmark",
+                            )
+                            payment.save()
+                            payment.delete()
+                    except OperationalError as exc:
+                        if "locked" in str(exc):
+                            locked += 1
+                        else:
+                            errors += 1
+                        continue
+                    timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+                with lock:
+                    results["writes"].extend(timings)
+                    results["locked"] += locked
+                    results["errors"] += errors
+
+        def reader():
+            reads = 0
+            try:
+                while time.monotonic() < deadline:
+                    try:
+                        list(Order.objects.order_by("-created_at", "-id").values_list("pk", "status")[:50])
+                        reads += 1
+                    except OperationalError:
+                        with lock:
+                            results["locked"] += 1
+            finally:
+                connections.close_all()
+                with lock:
+                    results["reads"] += reads
+
+        threads = [
+            threading.Thread(target=writer, args=(i,)) for i in range(options["writers"])
+        ] + [threading.Thread(target=reader) for _ in range(options["readers"])]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        timings = sorted(results["writes"])
+        if timings:
+            latency = (
+                f"p50={percentile(timings, 0.50):.1f}ms  p95={percentile(timings, 0.95):.1f}ms  "
+                f"mean={statistics.fmean(timings):.1f}ms"
+            )
+        else:
+            latency = "no successful writes"
+        self.stdout.write(
+            f"  writes: {len(timings)} ({len(timings) / elapsed:.1f}/s)  {latency}\n"
+            f"  reads:  {results['reads']} ({results['reads'] / elapsed:.1f}/s)\n"
+            f"  locked: {results['locked']}  other errors: {results['errors']}"
+        )
+        if results["locked"] or results["errors"]:
+            self.stdout.write(self.style.WARNING(f"! Done in {elapsed:.1f}s with failed writes"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✓ Done in {elapsed:.1f}s"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.query_plans import explain_hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN for the hot order queries (lists, reports, histories) and "
+        "fails if any of them needs a full table scan or a separate sort"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print full plans")
+
+    def handle(self, *args, **options):
+        results = explain_hot_queries()
+        if not results:
+            raise CommandError("No orders - run `seed_data --scale N` first.")
+
+        failed = []
+        for name, plan, problems in results:
+            mark = self.style.ERROR("✗") if problems else self.style.SUCCESS("✓")
+            self.stdout.write(f"{mark} {name}")
+            if options["verbose_plans"] or problems:
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+            if problems:
+                failed.append(name)
+
+        if failed:
+            raise CommandError(f"Queries without a usable index: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"✓ All {len(results)} hot queries use an index"))
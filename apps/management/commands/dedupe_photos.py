@@ -0,0 +1,156 @@
+import re
+from collections import Counter
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.db import write_atomic
+from apps.models import MediaBlob, OrderPhoto, PhotoStatus
+from apps.storage import photo_storage
+
+
+CONTENT_ADDRESSED = re.compile(r"/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$")
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves existing order photos into content-addressed storage, deduplicates "
+        "identical files and rebuilds blob reference counts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument(
+            "--keep-originals",
+            action="store_true",
+            help="Do not delete the old (name-based) files after migrating",
+        )
+
+    def handle(self, *args, **options):
+        storage = photo_storage()
+        dry_run = options["dry_run"]
+        refs = Counter()
+        legacy_files, old_derivatives = set(), set()
+        migrated = missing = 0
+
+        photos = OrderPhoto.objects.order_by("pk").only("pk", "image", "thumbnail", "medium")
+        for photo in photos.iterator(chunk_size=500):
+            name = photo.image.name
+            if not name:
+                continue
+            if CONTENT_ADDRESSED.search(name):
+                refs[name] += 1
+                continue
+            if not storage.exists(name):
+                missing += 1
+                continue
+            if dry_run:
+                migrated += 1
+                continue
+            with storage.open(name, "rb") as fh:
+                new_name = storage.save(name, File(fh, name=name))
+            # Nusxalar yangi nom (xesh) bo'yicha qayta yaratiladi
+            OrderPhoto.objects.filter(pk=photo.pk).update(
+                image=new_name,
+                thumbnail="",
+                medium="",
+                processing_status=PhotoStatus.PENDING,
+            )
+            refs[new_name] += 1
+            legacy_files.add(name)
+            old_derivatives.update(n for n in (photo.thumbnail.name, photo.medium.name) if n)
+            migrated += 1
+
+        if dry_run:
+            self.stdout.write(
+                f"Would migrate {migrated} photos ({missing} missing files); "
+                f"{len(refs)} blobs already content-addressed."
+            )
+            return
+
+        blobs = self.reconcile_blobs(storage)
+
+        removed = 0
+        if not options["keep_originals"]:
+            still_used = set(
+                OrderPhoto.objects.filter(image__in=legacy_files).values_list("image", flat=True)
+            )
+            for name in legacy_files - still_used:
+                storage.delete(name)
+                removed += 1
+            for name in old_derivatives:
+                storage.delete(name)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✓ Photos: {blobs['references']} references -> {blobs['blobs']} blobs "
+                f"(migrated {migrated}, missing {missing}, old files removed {removed}; "
+                f"blobs created {blobs['created']}, updated {blobs['updated']}, "
+                f"orphans deleted {blobs['deleted']}). "
+                "Run `process_photos` to regenerate thumbnails."
+            )
+        )
+
+    def reconcile_blobs(self, storage) -> dict:
+        """
+        Blob havolalar sonini joyida tuzatish. Jadval tozalanib qayta yozilmaydi -
+        aks holda shu orada ``acquire`` qilgan yuklamalar yo'qoladi; hisob yozish
+        qulfi ostida qayta olinadi.
+        """
+        with write_atomic():
+            refs = Counter()
+            counted = (
+                OrderPhoto.objects.exclude(image="")
+                .values_list("image")
+                .annotate(n=Count("pk"))
+                .order_by()
+            )
+            for name, count in counted:
+                if CONTENT_ADDRESSED.search(name):
+                    refs[name] = count
+
+            existing = {blob.name: blob for blob in MediaBlob.objects.only("pk", "name", "ref_count")}
+            changed = []
+            for name, count in refs.items():
+                blob = existing.get(name)
+                if blob is not None and blob.ref_count != count:
+                    blob.ref_count = count
+                    changed.append(blob)
+            MediaBlob.objects.bulk_update(changed, ["ref_count"], batch_size=1000)
+
+            created = [
+                MediaBlob(
+                    name=name,
+                    size=storage.size(name) if storage.exists(name) else 0,
+                    ref_count=count,
+                )
+                for name, count in refs.items()
+                if name not in existing
+            ]
+            MediaBlob.objects.bulk_create(created, batch_size=1000)
+
+            orphans = [name for name in existing if name not in refs]
+            for start in range(0, len(orphans), 1000):
+                MediaBlob.objects.filter(name__in=orphans[start : start + 1000]).delete()
+
+            def delete_files():
+                # Shu orada qayta yuklangan mazmun o'chirilmaydi (``release`` kabi)
+                revived = set(
+                    MediaBlob.objects.filter(name__in=orphans).values_list("name", flat=True)
+                )
+                for name in orphans:
+                    if name not in revived:
+                        storage.delete(name)
+
+            if orphans:
+                transaction.on_commit(delete_files)
+
+        return {
+            "references": sum(refs.values()),
+            "blobs": len(refs),
+            "created": len(created),
+            "updated": len(changed),
+            "deleted": len(orphans),
+        }
@@ -0,0 +1,132 @@
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.instrumentation import percentile
+from apps.models import Part, Service
+
+
+DEFAULT_PATHS = [
+    "/api/service/{service}/price/",
+    "/api/part/{part}/price/",
+    "/api/orders/search/?q=90",
+    "/api/search/?q=ali",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests a running server (uvicorn config.asgi / gunicorn config.wsgi) with N "
+        "concurrent keep-alive clients logged in as --user, and reports throughput and latency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base", default="http://127.0.0.1:8000", help="Server address")
+        parser.add_argument(
+            "--path", action="append", dest="paths", help="Path to request (repeatable)"
+        )
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--seconds", type=float, default=10.0)
+        parser.add_argument("--user", help="Username (default: first superuser)")
+
+    def _session_cookie(self, username):
+        users = get_user_model().objects
+        user = (
+            users.filter(username=username).first()
+            if username
+            else users.filter(is_superuser=True).order_by("pk").first()
+        )
+        if user is None:
+            raise CommandError("User not found - pass --user or create a superuser.")
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store[SESSION_KEY] = str(user.pk)
+        store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        store.create()
+        return store, f"{settings.SESSION_COOKIE_NAME}={store.session_key}"
+
+    def _default_paths(self):
+        service = Service.objects.order_by("pk").values_list("pk", flat=True).first()
+        part = Part.objects.order_by("pk").values_list("pk", flat=True).first()
+        if service is None or part is None:
+            raise CommandError("No services/parts - run `seed_data` first or pass --path.")
+        return [path.format(service=service, part=part) for path in DEFAULT_PATHS]
+
+    def handle(self, *args, **options):
+        base = urlsplit(options["base"])
+        paths = options["paths"] or self._default_paths()
+        store, cookie = self._session_cookie(options["user"])
+        headers = {"Cookie": cookie, "Host": base.netloc, "Connection": "keep-alive"}
+
+        deadline = time.monotonic() + options["seconds"]
+        timings, statuses, errors = [], Counter(), Counter()
+        lock = threading.Lock()
+
+        def client(offset):
+            local_timings, local_statuses, local_errors = [], Counter(), Counter()
+            conn = None
+            n = offset
+            while time.monotonic() < deadline:
+                path = paths[n % len(paths)]
+                n += 1
+                started = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=30)
+                    conn.request("GET", path, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    if response.getheader("Connection", "").lower() == "close":
+                        conn.close()
+                        conn = None
+                except (OSError, http.client.HTTPException) as exc:
+                    local_errors[type(exc).__name__] += 1
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                    continue
+                local_timings.append((time.perf_counter() - started) * 1000)
+                local_statuses[response.status] += 1
+            if conn is not None:
+                conn.close()
+            with lock:
+                timings.extend(local_timings)
+                statuses.update(local_statuses)
+                errors.update(local_errors)
+
+        self.stdout.write(
+            f"  {options['base']}  concurrency={options['concurrency']}  "
+            f"seconds={options['seconds']}  paths={len(paths)}"
+        )
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(options["concurrency"])]
+        started = time.monotonic()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            store.delete()
+        elapsed = time.monotonic() - started
+
+        timings.sort()
+        if not timings:
+            raise CommandError(f"No successful requests ({dict(errors)}) - is the server running?")
+        self.stdout.write(
+            f"  requests: {len(timings)} ({len(timings) / elapsed:.1f}/s)\n"
+            f"  latency:  p50={percentile(timings, 0.50):.1f}ms  p95={percentile(timings, 0.95):.1f}ms  "
+            f"p99={percentile(timings, 0.99):.1f}ms  mean={statistics.fmean(timings):.1f}ms\n"
+            f"  statuses: {dict(sorted(statuses.items()))}  errors: {dict(errors) or 0}"
+        )
+        if errors or any(status >= 400 for status in statuses):
+            self.stdout.write(self.style.WARNING(f"! Done in {elapsed:.1f}s with failed requests"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"✓ Done in {elapsed:.1f}s"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.models import OrderPhoto, PhotoStatus
+from apps.photos import process_photo
+
+
+class Command(BaseCommand):
+    help = "Generates thumbnails/medium copies for order photos that are pending or failed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true", help="Reprocess every photo, including ready ones"
+        )
+
+    def handle(self, *args, **options):
+        photos = OrderPhoto.objects.order_by("pk")
+        if not options["all"]:
+            photos = photos.exclude(processing_status=PhotoStatus.READY)
+        done = failed = 0
+        for photo_id in photos.values_list("pk", flat=True).iterator():
+            if process_photo(photo_id):
+                done += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(f"✓ Photos processed: {done}, failed: {failed}"))
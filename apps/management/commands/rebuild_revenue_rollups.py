@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuilds daily revenue rollups (day x payment type x status x master) from payments"
+
+    def handle(self, *args, **options):
+        created = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"✓ Revenue rollups rebuilt: {created} rows"))
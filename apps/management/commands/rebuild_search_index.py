@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized customer/car/order search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Search index rebuilt: {created} rows"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.stock import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Recomputes Part.stock_quantity from the stock movement ledger"
+
+    def handle(self, *args, **options):
+        fixed = rebuild_balances()
+        self.stdout.write(self.style.SUCCESS(f"✓ Stock balances rebuilt: {fixed} parts corrected"))
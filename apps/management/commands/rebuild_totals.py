@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.submission import rebuild_totals
+
+
+class Command(BaseCommand):
+    help = "Recomputes order totals, paid amounts and payment status from lines and payments"
+
+    def handle(self, *args, **options):
+        fixed = rebuild_totals()
+        self.stdout.write(self.style.SUCCESS(f"✓ Order totals rebuilt: {fixed} orders corrected"))
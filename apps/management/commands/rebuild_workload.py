@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.workload import rebuild_workload
+
+
+class Command(BaseCommand):
+    help = "Rebuilds master workload counters and daily throughput from orders and services"
+
+    def handle(self, *args, **options):
+        counters, days = rebuild_workload()
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ Workload rebuilt: {counters} counters, {days} daily rows")
+        )
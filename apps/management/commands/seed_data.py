@@ -1,6 +1,12 @@
 import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
 from decimal import Decimal
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
 from faker import Faker
 
 from apps.models import (
@@ -9,15 +15,81 @@ from apps.models import (
     Part,
     Service,
     Master,
+    Order,
+    OrderService,
+    OrderPart,
+    OrderPayment,
+    OrderPhoto,
+    OrderStatus,
+    PaymentStatus,
+    PaymentType,
+    ServiceStatus,
+    StockMovement,
+    StockMovementKind,
+    money,
 )
+from apps.rollups import rebuild_rollups
+from apps.search import rebuild_index
+from apps.stock import apply_movements
+from apps.workload import rebuild_workload
+
+
+CAR_DATA = {
+    "Chevrolet": ["Cobalt", "Gentra", "Malibu", "Onix", "Tracker"],
+    "Toyota": ["Camry", "Corolla", "RAV4", "Prado"],
+    "Kia": ["K5", "Sportage", "Rio"],
+    "Hyundai": ["Elantra", "Sonata", "Tucson"],
+    "Mercedes": ["C200", "E200", "GLA"],
+}
+PLATE_LETTERS = "ABCDEFHKMNOPTXYZ"
+
+
+@contextmanager
+def manual_timestamps(*fields):
+    """bulk_create da auto_now_add ni vaqtincha o'chirish (tarixiy sanalar uchun)."""
+    saved = [(field, field.auto_now_add) for field in fields]
+    for field, _ in saved:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in saved:
+            field.auto_now_add = value
 
 
 class Command(BaseCommand):
-    help = "Seeds auto-service system with realistic demo data (customers, cars, parts, services)"
+    help = (
+        "Seeds auto-service system with realistic demo data (customers, cars, parts, services). "
+        "With --scale N generates N orders (plus customers, cars, lines, payments, photos) via bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            help="Number of orders to generate in bulk (e.g. 10000 ... 10000000)",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--days", type=int, default=730, help="Spread orders over the last N days"
+        )
+        parser.add_argument("--seed", type=int, default=None, help="Random seed")
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         fake = Faker("uz_UZ")
+        if options["seed"] is not None:
+            random.seed(options["seed"])
+            Faker.seed(options["seed"])
 
+        if options["scale"]:
+            if not (Service.objects.exists() and Part.objects.exists() and Master.objects.exists()):
+                self.seed_demo(fake)
+            self.seed_scale(fake, options["scale"], options["batch_size"], options["days"])
+            return
+        self.seed_demo(fake)
+
+    def seed_demo(self, fake):
         self.stdout.write(self.style.WARNING("Seeding started..."))
 
         # ============================
@@ -37,13 +109,7 @@ class Command(BaseCommand):
         # ============================
         # 2) CARS
         # ============================
-        car_data = {
-            "Chevrolet": ["Cobalt", "Gentra", "Malibu", "Onix", "Tracker"],
-            "Toyota": ["Camry", "Corolla", "RAV4", "Prado"],
-            "Kia": ["K5", "Sportage", "Rio"],
-            "Hyundai": ["Elantra", "Sonata", "Tucson"],
-            "Mercedes": ["C200", "E200", "GLA"],
-        }
+        car_data = CAR_DATA
 
         cars = []
         for customer in customers:
@@ -136,3 +202,258 @@ class Command(BaseCommand):
         # ============================
 
         self.stdout.write(self.style.SUCCESS("\n=== SEED COMPLETED SUCCESSFULLY ==="))
+
+    # ============================
+    # SCALE MODE
+    # ============================
+
+    def _progress(self, label, done, total, started):
+        rate = done / max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f"  {label}: {done}/{total} ({rate:,.0f}/s)")
+
+    def seed_scale(self, fake, scale, batch_size, days):
+        self.stdout.write(self.style.WARNING(f"Scale seeding: {scale} orders..."))
+        started = time.monotonic()
+
+        # Faker sekin - nomlar havzasini bir marta tayyorlab, tasodifiy birlashtiramiz
+        first_names = [fake.first_name() for _ in range(300)]
+        last_names = [fake.last_name() for _ in range(300)]
+        usernames = [fake.user_name() for _ in range(300)]
+
+        services = list(Service.objects.values_list("pk", "base_price"))
+        parts = list(Part.objects.values_list("pk", "price"))
+        master_ids = list(Master.objects.values_list("pk", flat=True))
+        stock = dict(Part.objects.values_list("pk", "stock_quantity"))
+
+        # 1) Customers
+        n_customers = max(1, scale // 5)
+        customer_ids = []
+        for start in range(0, n_customers, batch_size):
+            objs = [
+                Customer(
+                    full_name=f"{random.choice(first_names)} {random.choice(last_names)}",
+                    phone=f"+9989{random.randint(10, 99)}{random.randint(1000000, 9999999)}",
+                    telegram_username=(
+                        f"{random.choice(usernames)}{random.randint(1, 9999)}"
+                        if random.random() < 0.4
+                        else None
+                    ),
+                )
+                for _ in range(min(batch_size, n_customers - start))
+            ]
+            with transaction.atomic():
+                customer_ids.extend(c.pk for c in Customer.objects.bulk_create(objs))
+            self._progress("customers", len(customer_ids), n_customers, started)
+
+        # 2) Cars (har bir mijozga 1-2 ta)
+        cars = []
+        brands = list(CAR_DATA)
+        for start in range(0, len(customer_ids), batch_size):
+            objs = []
+            for customer_id in customer_ids[start:start + batch_size]:
+                for _ in range(1 if random.random() < 0.75 else 2):
+                    brand = random.choice(brands)
+                    objs.append(
+                        Car(
+                            customer_id=customer_id,
+                            brand=brand,
+                            model=random.choice(CAR_DATA[brand]),
+                            plate_number=(
+                                f"{random.randint(1, 95):02d}"
+                                f"{random.choice(PLATE_LETTERS)}"
+                                f"{random.randint(100, 999)}"
+                                f"{random.choice(PLATE_LETTERS)}{random.choice(PLATE_LETTERS)}"
+                            ),
+                            vin=fake.pystr(min_chars=17, max_chars=17).upper(),
+                        )
+                    )
+            with transaction.atomic():
+                cars.extend((c.pk, c.customer_id) for c in Car.objects.bulk_create(objs))
+            self._progress("cars", len(cars), len(cars), started)
+
+        # 3) Orders + lines + payments + photos
+        now = timezone.now()
+        span_seconds = days * 24 * 3600
+        counts = {
+            "orders": 0, "services": 0, "parts": 0, "payments": 0, "photos": 0, "reservations": 0
+        }
+        timestamp_fields = [
+            Order._meta.get_field("created_at"),
+            OrderPayment._meta.get_field("paid_at"),
+            OrderPhoto._meta.get_field("uploaded_at"),
+            StockMovement._meta.get_field("created_at"),
+        ]
+        with manual_timestamps(*timestamp_fields):
+            for start in range(0, scale, batch_size):
+                size = min(batch_size, scale - start)
+                orders, plans = [], []
+                for _ in range(size):
+                    order, plan = self._plan_order(
+                        now, span_seconds, cars, master_ids, services, parts
+                    )
+                    orders.append(order)
+                    plans.append(plan)
+                with transaction.atomic():
+                    Order.objects.bulk_create(orders)
+                    service_items, part_items, payments, photos = [], [], [], []
+                    for order, (s_items, p_items, pays, photo_count) in zip(orders, plans):
+                        for item in s_items:
+                            item.order_id = order.pk
+                        for item in p_items:
+                            item.order_id = order.pk
+                        for pay in pays:
+                            pay.order_id = order.pk
+                        service_items.extend(s_items)
+                        part_items.extend(p_items)
+                        payments.extend(pays)
+                        photos.extend(
+                            OrderPhoto(
+                                order_id=order.pk,
+                                image=f"orders/photos/seed/{order.pk}_{i}.jpg",
+                                is_before=i == 0,
+                                uploaded_at=order.created_at,
+                            )
+                            for i in range(photo_count)
+                        )
+                    OrderService.objects.bulk_create(service_items)
+                    OrderPart.objects.bulk_create(part_items)
+                    reservations = self._reserve_stock(part_items, orders, stock)
+                    OrderPayment.objects.bulk_create(payments)
+                    OrderPhoto.objects.bulk_create(photos)
+                counts["orders"] += size
+                counts["services"] += len(service_items)
+                counts["parts"] += len(part_items)
+                counts["reservations"] += reservations
+                counts["payments"] += len(payments)
+                counts["photos"] += len(photos)
+                self._progress("orders", counts["orders"], scale, started)
+
+        # bulk_create signallarni chaqirmaydi - hosila jadvallarni qayta qurish
+        self.stdout.write("  rebuilding search index, revenue rollups and workload...")
+        rebuild_index(batch_size=batch_size)
+        rebuild_rollups()
+        rebuild_workload()
+
+        summary = ", ".join(f"{k}: {v}" for k, v in counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n=== SCALE SEED COMPLETED in {time.monotonic() - started:.1f}s "
+                f"(customers: {len(customer_ids)}, cars: {len(cars)}, {summary}) ==="
+            )
+        )
+
+    def _reserve_stock(self, part_items, orders, stock):
+        """
+        Zapchast qatorlari uchun band qilish harakatlari va qoldiqlar (bulk_create
+        signallarni chaqirmaydi). Qoldiq yetmasa avval kirim (tuzatish) yoziladi.
+        """
+        created_at = {order.pk: order.created_at for order in orders}
+        needed = defaultdict(int)
+        for item in part_items:
+            needed[item.part_id] += item.quantity
+        receipts = []
+        for part_id, quantity in needed.items():
+            shortage = quantity - stock[part_id]
+            if shortage > 0:
+                restock = shortage + random.randint(20, 100)
+                receipts.append(
+                    StockMovement(
+                        part_id=part_id,
+                        kind=StockMovementKind.ADJUSTMENT,
+                        quantity=restock,
+                        note="seed_data: kirim",
+                        created_at=min(created_at.values()),
+                    )
+                )
+                stock[part_id] += restock
+            stock[part_id] -= quantity
+        reservations = [
+            StockMovement(
+                part_id=item.part_id,
+                order_id=item.order_id,
+                order_part_id=item.pk,
+                kind=StockMovementKind.RESERVE,
+                quantity=-item.quantity,
+                created_at=created_at[item.order_id],
+            )
+            for item in part_items
+        ]
+        apply_movements(receipts + reservations)
+        return len(reservations)
+
+    def _plan_order(self, now, span_seconds, cars, master_ids, services, parts):
+        """Buyurtma va uning qatorlarini xotirada tayyorlash (summalar bilan)."""
+        car_id, customer_id = random.choice(cars)
+        created_at = now - timedelta(seconds=random.randint(0, span_seconds))
+        age_days = (now - created_at).days
+
+        service_items = []
+        for service_id, base_price in random.sample(services, k=min(len(services), random.randint(1, 4))):
+            discount = random.choice([Decimal("0")] * 4 + [Decimal("5"), Decimal("10")])
+            service_items.append(
+                OrderService(
+                    service_id=service_id,
+                    price=base_price,
+                    discount=discount,
+                    status=ServiceStatus.DONE if age_days > 2 else random.choice(ServiceStatus.values),
+                )
+            )
+        part_items = []
+        for part_id, price in random.sample(parts, k=min(len(parts), random.randint(0, 3))):
+            part_items.append(
+                OrderPart(
+                    part_id=part_id,
+                    price=price,
+                    quantity=random.randint(1, 4),
+                    discount=Decimal("0"),
+                )
+            )
+        total = sum((money(i.line_total) for i in service_items + part_items), Decimal("0"))
+
+        roll = random.random()
+        if age_days > 2 and roll < 0.85:
+            paid = total
+        elif roll < 0.95:
+            paid = money(total * Decimal(random.randint(10, 90)) / 100)
+        else:
+            paid = Decimal("0")
+
+        payments = []
+        if paid > 0:
+            chunks = [paid] if random.random() < 0.8 else [money(paid / 2), paid - money(paid / 2)]
+            for chunk in chunks:
+                payments.append(
+                    OrderPayment(
+                        amount=chunk,
+                        payment_type=random.choice(PaymentType.values),
+                        # Yaqinda ochilgan buyurtmalarda to'lov kelajakka tushmasin
+                        paid_at=min(created_at + timedelta(hours=random.randint(1, 48)), now),
+                    )
+                )
+
+        if paid <= 0:
+            payment_status = PaymentStatus.UNPAID
+            status = random.choice([OrderStatus.NEW, OrderStatus.IN_PROGRESS, OrderStatus.CHECKING])
+        elif paid >= total:
+            payment_status = PaymentStatus.PAID
+            status = OrderStatus.COMPLETED
+        else:
+            payment_status = PaymentStatus.PARTIAL
+            status = random.choice([OrderStatus.IN_PROGRESS, OrderStatus.CHECKING])
+
+        order = Order(
+            customer_id=customer_id,
+            car_id=car_id,
+            master_id=random.choice(master_ids) if master_ids else None,
+            description="",
+            status=status,
+            payment_status=payment_status,
+            payment_type=payments[0].payment_type if payments else "",
+            total_amount=total,
+            paid_amount=paid,
+            created_at=created_at,
+            completed_at=max(p.paid_at for p in payments) if status == OrderStatus.COMPLETED else None,
+        )
+        photo_count = random.choice([0, 0, 1, 2])
+        return order, (service_items, part_items, payments, photo_count)
+
@@ -0,0 +1,46 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.replicas import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the primary SQLite database into the replica file (SQLITE_REPLICA_PATH) "
+        "for local read-replica testing; --every N repeats the copy to simulate replication lag"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, default=0, help="Repeat every N seconds")
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError("No replica database configured (SQLITE_REPLICA_PATH).")
+        primary, replica = connections["default"], connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("Only SQLite files can be synced; PostgreSQL uses streaming replication.")
+
+        while True:
+            started = time.monotonic()
+            # backup() - primary ga yozuvlar davom etsa ham izchil nusxa
+            source = sqlite3.connect(primary.settings_dict["NAME"])
+            target = sqlite3.connect(replica.settings_dict["NAME"])
+            try:
+                source.backup(target)
+            finally:
+                source.close()
+                target.close()
+            replica.close()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"✓ {primary.settings_dict['NAME']} → {replica.settings_dict['NAME']} "
+                    f"in {(time.monotonic() - started) * 1000:.0f}ms"
+                )
+            )
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:55
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# apps.search dagi normalizatsiyaning shu migratsiya paytidagi nusxasi:
+# keyinchalik apps.search o'zgarsa ham migratsiya natijasi o'zgarmaydi
+_NON_DIGIT = re.compile(r"\D+")
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+_SPACES = re.compile(r"\s+")
+_APOSTROPHES = str.maketrans({"‘": "'", "’": "'", "ʻ": "'", "ʼ": "'", "`": "'"})
+
+BATCH_SIZE = 1000
+
+
+def normalize_phone(value):
+    return _NON_DIGIT.sub("", value or "")
+
+
+def normalize_plate(value):
+    return _NON_ALNUM.sub("", (value or "").upper())
+
+
+def fold_text(*parts):
+    text = " ".join(p for p in parts if p)
+    text = unicodedata.normalize("NFKD", text.translate(_APOSTROPHES))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", text.casefold()).strip()
+
+
+def populate_search_index(apps, schema_editor):
+    SearchIndex = apps.get_model("apps", "SearchIndex")
+    Customer = apps.get_model("apps", "Customer")
+    Car = apps.get_model("apps", "Car")
+    Order = apps.get_model("apps", "Order")
+
+    def customer_fields(c):
+        return {
+            "phone_digits": normalize_phone(c.phone),
+            "name": fold_text(c.full_name, c.telegram_username),
+        }
+
+    def car_fields(car):
+        return {
+            "plate": normalize_plate(car.plate_number),
+            "vehicle": fold_text(car.brand, car.model),
+        }
+
+    def rows():
+        for c in Customer.objects.iterator(chunk_size=BATCH_SIZE):
+            yield SearchIndex(kind="customer", customer=c, **customer_fields(c))
+        cars = Car.objects.select_related("customer")
+        for car in cars.iterator(chunk_size=BATCH_SIZE):
+            yield SearchIndex(
+                kind="car",
+                customer_id=car.customer_id,
+                car=car,
+                **customer_fields(car.customer),
+                **car_fields(car),
+            )
+        orders = Order.objects.select_related("customer", "car").order_by()
+        for o in orders.iterator(chunk_size=BATCH_SIZE):
+            yield SearchIndex(
+                kind="order",
+                customer_id=o.customer_id,
+                car_id=o.car_id,
+                order=o,
+                **customer_fields(o.customer),
+                **car_fields(o.car),
+            )
+
+    # Butun jadval xotirada to'planmaydi - BATCH_SIZE qatordan yoziladi
+    batch = []
+    for row in rows():
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            SearchIndex.objects.bulk_create(batch)
+            batch = []
+    SearchIndex.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0005_alter_orderpart_discount_alter_orderservice_discount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('customer', 'Customer'), ('car', 'Car'), ('order', 'Order')], max_length=16, verbose_name='Kind')),
+                ('phone_digits', models.CharField(blank=True, max_length=20, verbose_name='Phone digits')),
+                ('plate', models.CharField(blank=True, max_length=20, verbose_name='Normalized plate')),
+                ('name', models.CharField(blank=True, max_length=520, verbose_name='Folded name')),
+                ('vehicle', models.CharField(blank=True, max_length=210, verbose_name='Folded vehicle')),
+                ('car', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='apps.car')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='apps.customer')),
+                ('order', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_entry', to='apps.order')),
+            ],
+            options={
+                'verbose_name': 'Search index entry',
+                'verbose_name_plural': 'Search index entries',
+                'indexes': [models.Index(fields=['kind', 'phone_digits'], name='apps_search_kind_882356_idx'), models.Index(fields=['kind', 'plate'], name='apps_search_kind_c39433_idx')],
+            },
+        ),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:57
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_paid_amount(apps, schema_editor):
+    Order = apps.get_model("apps", "Order")
+    OrderPayment = apps.get_model("apps", "OrderPayment")
+    totals = (
+        OrderPayment.objects.order_by()
+        .values("order_id")
+        .annotate(total=Sum("amount"))
+    )
+    for row in totals.iterator():
+        Order.objects.filter(pk=row["order_id"]).update(paid_amount=row["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0006_searchindex'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Paid amount'),
+        ),
+        migrations.RunPython(backfill_paid_amount, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    OrderPayment = apps.get_model("apps", "OrderPayment")
+    DailyRevenueRollup = apps.get_model("apps", "DailyRevenueRollup")
+    groups = (
+        OrderPayment.objects.order_by()
+        .annotate(day=TruncDate("paid_at"))
+        .values("day", "payment_type", "order__status", "order__master_id")
+        .annotate(amount=Sum("amount"), count=Count("id"))
+    )
+    DailyRevenueRollup.objects.bulk_create(
+        [
+            DailyRevenueRollup(
+                day=g["day"],
+                payment_type=g["payment_type"],
+                status=g["order__status"],
+                master_id=g["order__master_id"],
+                amount=g["amount"],
+                payments_count=g["count"],
+            )
+            for g in groups
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0007_order_paid_amount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True, verbose_name='Day')),
+                ('payment_type', models.CharField(choices=[('cash', 'Naqd'), ('card', 'Karta'), ('transfer', 'Perevod')], max_length=32, verbose_name='Payment type')),
+                ('status', models.CharField(choices=[('new', 'New'), ('in_progress', 'Jarayonda'), ('checking', 'Tekshirilmoqda'), ('completed', 'Yakunlangan')], max_length=32, verbose_name='Status')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Amount')),
+                ('payments_count', models.IntegerField(default=0, verbose_name='Payments count')),
+                ('master', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='apps.master')),
+            ],
+            options={
+                'verbose_name': 'Daily revenue rollup',
+                'verbose_name_plural': 'Daily revenue rollups',
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_opening_balances(apps, schema_editor):
+    # Joriy qoldiq jurnalning boshlang'ich yozuvi bo'ladi
+    Part = apps.get_model("apps", "Part")
+    StockMovement = apps.get_model("apps", "StockMovement")
+    movements = [
+        StockMovement(part_id=pk, kind="opening", quantity=stock, note="Migration")
+        for pk, stock in Part.objects.filter(stock_quantity__gt=0).values_list(
+            "pk", "stock_quantity"
+        )
+    ]
+    StockMovement.objects.bulk_create(movements, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0009_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('opening', "Boshlang'ich qoldiq"), ('adjustment', 'Tuzatish'), ('reserve', 'Buyurtmaga band qilindi'), ('release', 'Buyurtmadan qaytarildi')], max_length=16, verbose_name='Kind')),
+                ('quantity', models.IntegerField(verbose_name='Quantity')),
+                ('note', models.CharField(blank=True, max_length=255, verbose_name='Note')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='apps.order')),
+                ('order_part', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='apps.orderpart')),
+                ('part', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movements', to='apps.part')),
+            ],
+            options={
+                'verbose_name': 'Stock movement',
+                'verbose_name_plural': 'Stock movements',
+                'indexes': [models.Index(fields=['part', 'created_at'], name='apps_stockm_part_id_370267_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_opening_balances, migrations.RunPython.noop),
+    ]
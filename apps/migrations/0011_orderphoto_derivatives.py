@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0010_stockmovement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderphoto',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Height'),
+        ),
+        migrations.AddField(
+            model_name='orderphoto',
+            name='medium',
+            field=models.ImageField(blank=True, upload_to='orders/photos/medium/', verbose_name='Medium size'),
+        ),
+        migrations.AddField(
+            model_name='orderphoto',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Kutilmoqda'), ('ready', 'Tayyor'), ('failed', 'Xato')], default='pending', max_length=16, verbose_name='Processing status'),
+        ),
+        migrations.AddField(
+            model_name='orderphoto',
+            name='thumbnail',
+            field=models.ImageField(blank=True, upload_to='orders/photos/thumbs/', verbose_name='Thumbnail'),
+        ),
+        migrations.AddField(
+            model_name='orderphoto',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Width'),
+        ),
+    ]
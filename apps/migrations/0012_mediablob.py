@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:19
+
+import apps.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0011_orderphoto_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Name')),
+                ('size', models.BigIntegerField(default=0, verbose_name='Size')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='Reference count')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'verbose_name': 'Media blob',
+                'verbose_name_plural': 'Media blobs',
+            },
+        ),
+        migrations.AlterField(
+            model_name='orderphoto',
+            name='image',
+            field=models.ImageField(storage=apps.storage.photo_storage, upload_to='orders/photos/'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0012_mediablob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='lines_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='payments_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
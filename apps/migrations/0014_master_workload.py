@@ -0,0 +1,84 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def populate_workload(apps, schema_editor):
+    Order = apps.get_model("apps", "Order")
+    OrderService = apps.get_model("apps", "OrderService")
+    MasterWorkload = apps.get_model("apps", "MasterWorkload")
+    MasterDailyThroughput = apps.get_model("apps", "MasterDailyThroughput")
+    # Aniq yakunlanish vaqti yo'q - oxirgi o'zgarish vaqti olinadi
+    Order.objects.filter(status="completed").update(completed_at=F("updated_at"))
+
+    rows = [
+        MasterWorkload(master_id=g["master_id"], metric="orders", status=g["status"], count=g["n"])
+        for g in Order.objects.order_by().values("master_id", "status").annotate(n=Count("id"))
+    ]
+    rows += [
+        MasterWorkload(
+            master_id=g["order__master_id"], metric="services", status=g["status"], count=g["n"]
+        )
+        for g in OrderService.objects.order_by()
+        .values("order__master_id", "status")
+        .annotate(n=Count("id"))
+    ]
+    MasterWorkload.objects.bulk_create(rows, batch_size=1000)
+    MasterDailyThroughput.objects.bulk_create(
+        [
+            MasterDailyThroughput(day=g["day"], master_id=g["master_id"], completed_orders=g["n"])
+            for g in Order.objects.filter(completed_at__isnull=False)
+            .order_by()
+            .annotate(day=TruncDate("completed_at"))
+            .values("day", "master_id")
+            .annotate(n=Count("id"))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0013_order_receipt_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Completed at'),
+        ),
+        migrations.CreateModel(
+            name='MasterDailyThroughput',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True, verbose_name='Day')),
+                ('completed_orders', models.IntegerField(default=0, verbose_name='Completed orders')),
+                ('master', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='apps.master')),
+            ],
+            options={
+                'verbose_name': 'Master daily throughput',
+                'verbose_name_plural': 'Master daily throughput',
+            },
+        ),
+        migrations.CreateModel(
+            name='MasterWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('orders', 'Buyurtmalar'), ('services', 'Xizmatlar')], max_length=16, verbose_name='Metric')),
+                ('status', models.CharField(max_length=32, verbose_name='Status')),
+                ('count', models.IntegerField(default=0, verbose_name='Count')),
+                ('master', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='apps.master')),
+            ],
+            options={
+                'verbose_name': 'Master workload',
+                'verbose_name_plural': 'Master workload',
+                'indexes': [models.Index(fields=['master', 'metric', 'status'], name='apps_master_master__af3644_idx')],
+            },
+        ),
+        migrations.RunPython(populate_workload, migrations.RunPython.noop),
+    ]
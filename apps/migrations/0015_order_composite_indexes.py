@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0014_master_workload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='car',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='apps.car'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='customer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to='apps.customer'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='master',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='apps.master'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='status',
+            field=models.CharField(choices=[('new', 'New'), ('in_progress', 'Jarayonda'), ('checking', 'Tekshirilmoqda'), ('completed', 'Yakunlangan')], default='new', max_length=32, verbose_name='Status'),
+        ),
+        migrations.AlterField(
+            model_name='orderservice',
+            name='order',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='service_items', to='apps.order'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at'], name='apps_order_status_dd50b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='apps_order_created_0f1702_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer', 'created_at'], name='apps_order_custome_f2f33c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['car', 'created_at'], name='apps_order_car_id_c727f2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['master', 'status'], name='apps_order_master__6f8787_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderservice',
+            index=models.Index(fields=['order', 'status'], name='apps_orders_order_i_3b24de_idx'),
+        ),
+    ]
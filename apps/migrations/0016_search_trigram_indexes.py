@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+# SearchIndex dagi ``__contains`` (LIKE '%...%') qidiruvlari uchun
+TRIGRAM_COLUMNS = ("name", "vehicle", "phone_digits", "plate")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Faqat PostgreSQL: SQLite da LIKE '%...%' uchun mos indeks turi yo'q
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS apps_searchindex_{column}_trgm "
+            f'ON apps_searchindex USING gin ("{column}" gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS apps_searchindex_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0015_order_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
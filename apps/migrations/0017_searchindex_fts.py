@@ -0,0 +1,66 @@
+from django.db import migrations
+
+
+# SQLite: SearchIndex ning qidiriladigan ustunlari uchun tashqi kontentli FTS5
+# jadvali. trigram tokenizer LIKE '%...%' (``__contains``) ni indeks bilan
+# bajarishga imkon beradi; jadval triggerlar orqali sinxron saqlanadi
+# (bulk_create va QuerySet.update ham hisobga olinadi).
+FTS_TABLE = "apps_searchindex_fts"
+FTS_COLUMNS = ("name", "vehicle", "phone_digits", "plate")
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    columns = ", ".join(FTS_COLUMNS)
+    new = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, "
+        f"content='apps_searchindex', content_rowid='id', tokenize='trigram')"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON apps_searchindex BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON apps_searchindex BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); END"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON apps_searchindex BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new}); END"
+    )
+    # Mavjud qatorlar
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0016_search_trigram_indexes'),
+    ]
+
+    operations = [
+        # LIKE '%...%' bu indekslardan foydalana olmaydi - faqat yozishni sekinlashtiradi
+        migrations.RemoveIndex(
+            model_name='searchindex',
+            name='apps_search_kind_882356_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='searchindex',
+            name='apps_search_kind_c39433_idx',
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
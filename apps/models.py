@@ -1,11 +1,24 @@
 from typing import Any
-from decimal import Decimal
-from django.db import models
-from django.db.models import Sum
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Round
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
 
+from .db import write_atomic
+from .storage import photo_storage
+
+
+CENT = Decimal("0.01")
+
+
+def money(value) -> Decimal:
+    """Summani tiyingacha yaxlitlash (qator summalari shu ko'rinishda saqlanadi)."""
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
 
 class Role(models.TextChoices):
     ADMIN = "admin", _("Admin")
@@ -137,6 +150,67 @@ class Part(models.Model):
     def __str__(self) -> str:
         return f"{self.name} ({self.article})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "stock_quantity" not in instance.get_deferred_fields():
+            instance._saved_stock = instance.stock_quantity
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Mavjud zapchast qoldig'i to'g'ridan-to'g'ri yozilmaydi: farq
+        # ``apps.stock`` orqali qulf ostida tuzatish harakati sifatida qo'llanadi
+        if (
+            self.pk
+            and not self._state.adding
+            and hasattr(self, "_saved_stock")
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "stock_quantity"
+            ]
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+
+class CatalogVersion(models.Model):
+    """
+    Xizmat/zapchast katalogining versiya hisoblagichi (yagona qator).
+
+    ``Service`` yoki ``Part`` saqlanganda/o'chirilganda oshiriladi;
+    katalog API ETag/Last-Modified shu qiymatdan olinadi.
+    """
+
+    version = models.PositiveBigIntegerField(_("Version"), default=1)
+    updated_at = models.DateTimeField(_("Updated at"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Catalog version")
+        verbose_name_plural = _("Catalog versions")
+
+    def __str__(self) -> str:
+        return f"v{self.version}"
+
+    @classmethod
+    def current(cls) -> "CatalogVersion":
+        obj, _created = cls.objects.get_or_create(pk=1)
+        return obj
+
+    @classmethod
+    async def acurrent(cls) -> "CatalogVersion":
+        obj, _created = await cls.objects.aget_or_create(pk=1)
+        return obj
+
+    @classmethod
+    def bump(cls) -> None:
+        updated = cls.objects.filter(pk=1).update(
+            version=F("version") + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            cls.objects.get_or_create(pk=1)
+
 
 class OrderStatus(models.TextChoices):
     NEW = "new", _("New")
@@ -163,12 +237,56 @@ class PaymentType(models.TextChoices):
     TRANSFER = "transfer", _("Perevod")
 
 
+class OrderQuerySet(models.QuerySet):
+    def with_totals(self):
+        """
+        Xizmatlar, zapchastlar, to'lovlar va qoldiq summalarini SQL da hisoblash.
+
+        ``OrderService.line_total`` / ``OrderPart.line_total`` dagi chegirma
+        formulasi qator bo'yicha tiyingacha yaxlitlanib qo'llanadi, shuning
+        uchun natija ``Order.services_total`` / ``parts_total`` bilan bir xil.
+        Annotatsiyalar: ``services_sum``, ``parts_sum``, ``paid_sum``,
+        ``remaining_sum``.
+        """
+        money_field = models.DecimalField(max_digits=14, decimal_places=2)
+        zero = Value(Decimal("0"), output_field=money_field)
+
+        def discounted(base):
+            # base * (100 - discount) * 0.01 - SQLite da butun sonli bo'lishdan qochish
+            return Round(
+                base
+                * (Value(Decimal("100")) - Coalesce(F("discount"), Value(Decimal("0"))))
+                * Value(Decimal("0.01")),
+                2,
+                output_field=money_field,
+            )
+
+        def order_sum(model, expression):
+            rows = (
+                model.objects.filter(order=OuterRef("pk"))
+                .order_by()
+                .values("order")
+                .annotate(total=Sum(expression, output_field=money_field))
+                .values("total")
+            )
+            return Coalesce(Subquery(rows, output_field=money_field), zero)
+
+        return self.annotate(
+            services_sum=order_sum(OrderService, discounted(F("price"))),
+            parts_sum=order_sum(OrderPart, discounted(F("price") * F("quantity"))),
+            paid_sum=order_sum(OrderPayment, F("amount")),
+        ).annotate(
+            remaining_sum=F("services_sum") + F("parts_sum") - F("paid_sum"),
+        )
+
+
 class Order(models.Model):
+    # Bitta ustunli indekslar o'rniga Meta.indexes dagi kompozit indekslar
     customer = models.ForeignKey(
-        Customer, on_delete=models.CASCADE, related_name="orders"
+        Customer, on_delete=models.CASCADE, related_name="orders", db_index=False
     )
     car = models.ForeignKey(
-        Car, on_delete=models.CASCADE, related_name="orders"
+        Car, on_delete=models.CASCADE, related_name="orders", db_index=False
     )
     master = models.ForeignKey(
         Master,
@@ -176,6 +294,7 @@ class Order(models.Model):
         related_name="orders",
         null=True,
         blank=True,
+        db_index=False,
     )
     description = models.TextField(_("Problem description"), blank=True)
     status = models.CharField(
@@ -183,7 +302,6 @@ class Order(models.Model):
         max_length=32,
         choices=OrderStatus.choices,
         default=OrderStatus.NEW,
-        db_index=True,
     )
     payment_status = models.CharField(
         _("Payment status"),
@@ -203,44 +321,148 @@ class Order(models.Model):
         decimal_places=2,
         default=0,
     )
+    paid_amount = models.DecimalField(
+        _("Paid amount"),
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+    )
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
+    completed_at = models.DateTimeField(_("Completed at"), null=True, blank=True, editable=False)
+    # Chek keshi kaliti uchun (apps.receipts): qatorlar/to'lovlar o'zgarganda oshadi
+    lines_version = models.PositiveIntegerField(default=0, editable=False)
+    payments_version = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = OrderQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Order")
         verbose_name_plural = _("Orders")
         ordering = ["-created_at"]
+        # check_query_plans buyrug'i asosiy so'rovlar shularni ishlatishini tekshiradi
+        indexes = [
+            # ro'yxat: status + sana oralig'i, -created_at bo'yicha
+            models.Index(fields=["status", "created_at"]),
+            # ro'yxat/hisobotlar: keyset (created_at, id) va sana oraliqlari
+            models.Index(fields=["created_at", "id"]),
+            # mijoz va mashina tarixi
+            models.Index(fields=["customer", "created_at"]),
+            models.Index(fields=["car", "created_at"]),
+            # usta yuklamasi
+            models.Index(fields=["master", "status"]),
+        ]
 
     def __str__(self) -> str:
         return f"Order #{self.id} - {self.car}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Rollup (status x usta) o'zgarishini aniqlash uchun
+        deferred = instance.get_deferred_fields()
+        if not {"status", "master_id"} & deferred:
+            instance._saved_rollup_key = (instance.status, instance.master_id)
+        # Usta yuklamasi (apps.workload) uchun
+        if not {"status", "master_id", "completed_at"} & deferred:
+            instance._saved_workload_key = (
+                instance.status,
+                instance.master_id,
+                instance.completed_at,
+            )
+        # Jonli panel hodisalari (apps.events) uchun
+        event_fields = {"status", "payment_status", "total_amount", "paid_amount", "master_id"}
+        if not event_fields & deferred:
+            instance._saved_event_key = (
+                instance.status,
+                instance.payment_status,
+                instance.total_amount,
+                instance.paid_amount,
+                instance.master_id,
+            )
+        return instance
+
+    def save(self, *args, **kwargs):
+        # completed_at statusga ergashadi (update_fields da status bo'lsa ham)
+        completed = self.status == OrderStatus.COMPLETED
+        if completed != (self.completed_at is not None):
+            self.completed_at = timezone.now() if completed else None
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "completed_at" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "completed_at"]
+        return super().save(*args, **kwargs)
+
     @property
     def services_total(self):
-        return sum(item.line_total for item in self.service_items.all())
+        if hasattr(self, "services_sum"):
+            return self.services_sum
+        return sum(
+            (money(item.line_total) for item in self.service_items.all()),
+            Decimal("0"),
+        )
 
     @property
     def parts_total(self):
-        return sum(item.line_total for item in self.part_items.all())
+        if hasattr(self, "parts_sum"):
+            return self.parts_sum
+        return sum(
+            (money(item.line_total) for item in self.part_items.all()),
+            Decimal("0"),
+        )
 
     def recalculate_total(self, save: bool = True):
-        self.total_amount = self.services_total + self.parts_total
+        """
+        ``total_amount`` va ``paid_amount`` ni qatorlardan to'liq qayta hisoblash.
+        Odatda kerak emas - qatorlar o'zgarganda ``apply_totals_delta`` ishlaydi.
+        """
+        totals = (
+            Order.objects.with_totals()
+            .values("services_sum", "parts_sum", "paid_sum")
+            .get(pk=self.pk)
+        )
+        self.total_amount = totals["services_sum"] + totals["parts_sum"]
+        self.paid_amount = totals["paid_sum"]
         if save:
-            self.save(update_fields=["total_amount"])
+            self.save(update_fields=["total_amount", "paid_amount"])
         return self.total_amount
 
     @property
     def paid_total(self):
-        return (
-            self.payments.aggregate(total=Sum("amount"))["total"]
-            or Decimal("0")
-        )
+        return self.paid_amount
 
     @property
     def remaining_amount(self):
-        return self.total_amount - self.paid_total
+        return self.total_amount - self.paid_amount
+
+    @classmethod
+    def apply_totals_delta(
+        cls,
+        order_id: int,
+        total_delta=Decimal("0"),
+        paid_delta=Decimal("0"),
+        version_field: str | None = None,
+    ):
+        """
+        Qator yoki to'lov o'zgarganda summalarni farq bo'yicha yangilash.
+
+        Buyurtma qatori qulflanadi (``select_for_update``), summalar va
+        to'lov holati bitta tranzaksiyada saqlanadi. ``version_field``
+        berilsa (``lines_version``/``payments_version``) u ham oshiriladi.
+        """
+        update_fields = ["total_amount", "paid_amount", "payment_status", "status"]
+        with write_atomic():
+            order = cls.objects.select_for_update().get(pk=order_id)
+            order.total_amount += total_delta
+            order.paid_amount += paid_delta
+            order.update_payment_state(save=False)
+            if version_field:
+                setattr(order, version_field, getattr(order, version_field) + 1)
+                update_fields.append(version_field)
+            order.save(update_fields=update_fields)
+        return order
 
     def update_payment_state(self, save: bool = True):
-        paid = self.paid_total
+        paid = self.paid_amount
         total = self.total_amount
         # To'lov miqdorini umumiy summa bilan solishtirish
         status_changed = False
@@ -263,18 +485,98 @@ class Order(models.Model):
         
         # Agar order "completed" bo'lsa, barcha xizmatlarni ham "done" qilish
         if self.status == OrderStatus.COMPLETED:
-            self.service_items.filter(status__in=[ServiceStatus.IN_PROGRESS, ServiceStatus.CHECKING]).update(
-                status=ServiceStatus.DONE
-            )
+            pending = self.service_items.filter(status__in=[ServiceStatus.IN_PROGRESS, ServiceStatus.CHECKING])
+            moved = list(pending.values_list("pk", "status"))
+            if moved:
+                pending.update(status=ServiceStatus.DONE)
+                # update() signal chaqirmaydi - usta yuklamasi va jonli panel shu yerda
+                from . import events, workload
+
+                workload.services_moved(
+                    self.master_id, [status for _pk, status in moved], ServiceStatus.DONE
+                )
+                events.services_moved(self.pk, [pk for pk, _status in moved], ServiceStatus.DONE)
         
         if save:
             self.save(update_fields=["payment_status", "status"])
         return paid
 
 
-class OrderService(models.Model):
+class OrderTotalsMixin:
+    """
+    Buyurtma summalarini qator o'zgarganda farq bo'yicha yangilash.
+
+    Bazadan o'qilgan qiymat ``from_db`` da eslab qolinadi, ``save``/``delete``
+    da faqat farq ``Order.apply_totals_delta`` orqali qo'llanadi.
+    ``totals_target`` - ``"total"`` (qatorlar) yoki ``"paid"`` (to'lovlar),
+    ``amount_attr`` - summaga qo'shiladigan atribut (maydon yoki property).
+    """
+
+    totals_target = "total"
+    totals_fields: tuple = ()
+    version_field = "lines_version"
+    amount_attr = "line_total"
+
+    def tracked_amount(self) -> Decimal:
+        return money(getattr(self, self.amount_attr))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not set(instance.totals_fields) & instance.get_deferred_fields():
+            instance._saved_amount = instance.tracked_amount()
+            instance._saved_order_id = instance.order_id
+        return instance
+
+    def _saved_state(self):
+        if not self.pk:
+            return None, Decimal("0")
+        if not hasattr(self, "_saved_amount"):
+            old = type(self).objects.filter(pk=self.pk).first()
+            if old is None:
+                return None, Decimal("0")
+            return old.order_id, old.tracked_amount()
+        return self._saved_order_id, self._saved_amount
+
+    def _apply_delta(self, order_id, delta):
+        if order_id is None:
+            return
+        if not delta:
+            # Summa o'zgarmasa ham chekdagi qator o'zgargan bo'lishi mumkin
+            Order.objects.filter(pk=order_id).update(
+                **{self.version_field: F(self.version_field) + 1}
+            )
+            return
+        Order.apply_totals_delta(
+            order_id,
+            **{f"{self.totals_target}_delta": delta},
+            version_field=self.version_field,
+        )
+
+    def save(self, *args, **kwargs):
+        with write_atomic():
+            old_order_id, old_amount = self._saved_state()
+            result = super().save(*args, **kwargs)
+            new_amount = self.tracked_amount()
+            if old_order_id is not None and old_order_id != self.order_id:
+                self._apply_delta(old_order_id, -old_amount)
+                old_amount = Decimal("0")
+            self._apply_delta(self.order_id, new_amount - old_amount)
+        self._saved_amount = new_amount
+        self._saved_order_id = self.order_id
+        return result
+
+    def delete(self, *args, **kwargs):
+        with write_atomic():
+            old_order_id, old_amount = self._saved_state()
+            result = super().delete(*args, **kwargs)
+            self._apply_delta(old_order_id, -old_amount)
+        return result
+
+
+class OrderService(OrderTotalsMixin, models.Model):
     order = models.ForeignKey(
-        Order, on_delete=models.CASCADE, related_name="service_items"
+        Order, on_delete=models.CASCADE, related_name="service_items", db_index=False
     )
     service = models.ForeignKey(Service, on_delete=models.PROTECT)
     quantity = models.PositiveIntegerField(default=1)
@@ -294,9 +596,25 @@ class OrderService(models.Model):
     class Meta:
         verbose_name = _("Order service")
         verbose_name_plural = _("Order services")
+        indexes = [
+            # update_payment_state: buyurtma xizmatlari status bo'yicha
+            models.Index(fields=["order", "status"]),
+        ]
+
     def __str__(self) -> str:
         return f"{self.service} x{self.quantity}"
 
+    totals_fields = ("order_id", "price", "discount")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not {"order_id", "status"} & instance.get_deferred_fields():
+            # Usta yuklamasi (apps.workload) uchun saqlangan holat
+            instance._saved_workload_key = (instance.order_id, instance.status)
+            instance._saved_event_status = instance.status
+        return instance
+
     @property
     def line_total(self):
         # Xizmatlar uchun quantity yo'q, faqat price va discount
@@ -306,7 +624,7 @@ class OrderService(models.Model):
         return total
 
 
-class OrderPart(models.Model):
+class OrderPart(OrderTotalsMixin, models.Model):
     order = models.ForeignKey(
         Order, on_delete=models.CASCADE, related_name="part_items"
     )
@@ -326,6 +644,8 @@ class OrderPart(models.Model):
     def __str__(self) -> str:
         return f"{self.part} x{self.quantity}"
 
+    totals_fields = ("order_id", "price", "quantity", "discount")
+
     @property
     def line_total(self):
         total = self.price * self.quantity
@@ -333,33 +653,49 @@ class OrderPart(models.Model):
             total = total * (1 - self.discount / 100)
         return total
 
-    def save(self, *args, **kwargs):
-        # Skladni oddiy tarzda boshqarish:
-        # yangi yozuvda quantity miqdoriga kamaytirish,
-        # mavjud yozuv tahrirlanganda farqni hisoblash mumkin.
-        if self.pk:
-            old = OrderPart.objects.get(pk=self.pk)
-            diff = self.quantity - old.quantity
-        else:
-            diff = self.quantity
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not {"order_id", "part_id", "quantity"} & instance.get_deferred_fields():
+            # Ombor harakatlari (apps.stock) uchun saqlangan holat
+            instance._saved_stock_key = (
+                instance.order_id,
+                instance.part_id,
+                instance.quantity,
+            )
+        return instance
 
-        result = super().save(*args, **kwargs)
 
-        if diff:
-            self.part.stock_quantity = models.F("stock_quantity") - diff
-            self.part.save(update_fields=["stock_quantity"])
-        return result
+class PhotoStatus(models.TextChoices):
+    PENDING = "pending", _("Kutilmoqda")
+    READY = "ready", _("Tayyor")
+    FAILED = "failed", _("Xato")
 
 
 class OrderPhoto(models.Model):
     order = models.ForeignKey(
         Order, on_delete=models.CASCADE, related_name="photos"
     )
-    image = models.ImageField(upload_to="orders/photos/")
+    image = models.ImageField(upload_to="orders/photos/", storage=photo_storage)
     is_before = models.BooleanField(
         _("Is 'before' photo"), default=True
     )
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # apps.photos fon oqimida to'ldiradi
+    thumbnail = models.ImageField(
+        _("Thumbnail"), upload_to="orders/photos/thumbs/", blank=True
+    )
+    medium = models.ImageField(
+        _("Medium size"), upload_to="orders/photos/medium/", blank=True
+    )
+    width = models.PositiveIntegerField(_("Width"), null=True, blank=True)
+    height = models.PositiveIntegerField(_("Height"), null=True, blank=True)
+    processing_status = models.CharField(
+        _("Processing status"),
+        max_length=16,
+        choices=PhotoStatus.choices,
+        default=PhotoStatus.PENDING,
+    )
 
     class Meta:
         verbose_name = _("Order photo")
@@ -369,8 +705,25 @@ class OrderPhoto(models.Model):
         label = _("Before") if self.is_before else _("After")
         return f"{label} photo for order #{self.order_id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "image" not in instance.get_deferred_fields():
+            instance._saved_image = instance.image.name
+        return instance
+
+    # Asl rasmda EXIF (GPS, kamera) saqlanadi - sahifalarda faqat tozalangan
+    # nusxalar; ular tayyor bo'lmaguncha bo'sh satr (shablon o'rniga belgi chiqaradi)
+    @property
+    def preview_url(self) -> str:
+        return self.thumbnail.url if self.thumbnail else ""
+
+    @property
+    def display_url(self) -> str:
+        return self.medium.url if self.medium else ""
+
 
-class OrderPayment(models.Model):
+class OrderPayment(OrderTotalsMixin, models.Model):
     order = models.ForeignKey(
         Order, on_delete=models.CASCADE, related_name="payments"
     )
@@ -390,17 +743,235 @@ class OrderPayment(models.Model):
         verbose_name_plural = _("Order payments")
         ordering = ["paid_at"]
 
+    # To'lovdan keyin buyurtma holati ham apply_totals_delta da yangilanadi
+    totals_target = "paid"
+    totals_fields = ("order_id", "amount")
+    version_field = "payments_version"
+    amount_attr = "amount"
+
     def __str__(self) -> str:
         return f"{self.order_id} - {self.amount}"
 
-    def save(self, *args, **kwargs):
-        result = super().save(*args, **kwargs)
-        # To'lovdan keyin buyurtma holatini yangilab qo'yamiz
-        self.order.update_payment_state(save=True)
-        return result
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if not {"paid_at", "payment_type", "amount"} & instance.get_deferred_fields():
+            instance._saved_rollup_key = (
+                instance.paid_at,
+                instance.payment_type,
+                instance.amount,
+            )
+        return instance
+
+
+class SearchKind(models.TextChoices):
+    CUSTOMER = "customer", _("Customer")
+    CAR = "car", _("Car")
+    ORDER = "order", _("Order")
+
+
+class SearchIndex(models.Model):
+    """
+    Qidiruv uchun denormalizatsiya qilingan jadval.
+
+    Har bir mijoz, mashina va buyurtma uchun bitta qator: telefon
+    raqamining faqat raqamlari, normallashtirilgan davlat raqami va
+    kichik harflarga o'tkazilgan ism/telegram hamda brand/model.
+    Qatorlar ``apps.signals`` orqali sinxron saqlanadi.
+
+    ``__contains`` qidiruvlari uchun: PostgreSQL da pg_trgm GIN indekslari
+    (0016), SQLite da triggerlar bilan yangilanadigan FTS5 trigram jadvali
+    (0017). SQLite da jadvalni qayta yaratadigan migratsiyadan keyin
+    triggerlarni ham qayta yaratish kerak.
+    """
+
+    kind = models.CharField(_("Kind"), max_length=16, choices=SearchKind.choices)
+    customer = models.ForeignKey(
+        Customer, on_delete=models.CASCADE, related_name="search_entries"
+    )
+    car = models.ForeignKey(
+        Car,
+        on_delete=models.CASCADE,
+        related_name="search_entries",
+        null=True,
+        blank=True,
+    )
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="search_entry",
+        null=True,
+        blank=True,
+    )
+    phone_digits = models.CharField(_("Phone digits"), max_length=20, blank=True)
+    plate = models.CharField(_("Normalized plate"), max_length=20, blank=True)
+    name = models.CharField(_("Folded name"), max_length=520, blank=True)
+    vehicle = models.CharField(_("Folded vehicle"), max_length=210, blank=True)
+
+    class Meta:
+        verbose_name = _("Search index entry")
+        verbose_name_plural = _("Search index entries")
+
+    def __str__(self) -> str:
+        return f"{self.kind}: {self.phone_digits} {self.plate}".strip()
+
+
+class DailyRevenueRollup(models.Model):
+    """
+    Kunlik tushum: kun x to'lov turi x buyurtma statusi x usta.
+
+    ``apps.rollups`` orqali to'lovlar va buyurtma statusi o'zgarganda
+    yangilanadi; ``rebuild_revenue_rollups`` buyrug'i qaytadan quradi.
+    """
+
+    day = models.DateField(_("Day"), db_index=True)
+    payment_type = models.CharField(
+        _("Payment type"), max_length=32, choices=PaymentType.choices
+    )
+    status = models.CharField(
+        _("Status"), max_length=32, choices=OrderStatus.choices
+    )
+    master = models.ForeignKey(
+        Master,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    amount = models.DecimalField(
+        _("Amount"), max_digits=16, decimal_places=2, default=0
+    )
+    payments_count = models.IntegerField(_("Payments count"), default=0)
+
+    class Meta:
+        verbose_name = _("Daily revenue rollup")
+        verbose_name_plural = _("Daily revenue rollups")
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.payment_type} {self.status}: {self.amount}"
+
+
+class WorkloadMetric(models.TextChoices):
+    ORDERS = "orders", _("Buyurtmalar")
+    SERVICES = "services", _("Xizmatlar")
+
+
+class MasterWorkload(models.Model):
+    """
+    Usta bo'yicha joriy yuklama: buyurtmalar soni (``OrderStatus``) va
+    xizmatlar soni (``ServiceStatus``). ``master=None`` - biriktirilmaganlar.
+
+    ``apps.workload`` orqali buyurtma/xizmat o'zgarganda yangilanadi;
+    ``rebuild_workload`` buyrug'i qaytadan quradi.
+    """
+
+    master = models.ForeignKey(
+        Master,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    metric = models.CharField(_("Metric"), max_length=16, choices=WorkloadMetric.choices)
+    status = models.CharField(_("Status"), max_length=32)
+    count = models.IntegerField(_("Count"), default=0)
+
+    class Meta:
+        verbose_name = _("Master workload")
+        verbose_name_plural = _("Master workload")
+        indexes = [models.Index(fields=["master", "metric", "status"])]
+
+    def __str__(self) -> str:
+        return f"{self.master_id} {self.metric}/{self.status}: {self.count}"
+
+
+class MasterDailyThroughput(models.Model):
+    """Kunlik yakunlangan buyurtmalar soni: kun x usta (``completed_at`` bo'yicha)."""
+
+    day = models.DateField(_("Day"), db_index=True)
+    master = models.ForeignKey(
+        Master,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    completed_orders = models.IntegerField(_("Completed orders"), default=0)
+
+    class Meta:
+        verbose_name = _("Master daily throughput")
+        verbose_name_plural = _("Master daily throughput")
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.master_id}: {self.completed_orders}"
+
+
+class StockMovementKind(models.TextChoices):
+    OPENING = "opening", _("Boshlang'ich qoldiq")
+    ADJUSTMENT = "adjustment", _("Tuzatish")
+    RESERVE = "reserve", _("Buyurtmaga band qilindi")
+    RELEASE = "release", _("Buyurtmadan qaytarildi")
+
+
+class StockMovement(models.Model):
+    """
+    Ombor harakatlari jurnali (faqat qo'shiladi, o'zgartirilmaydi).
+
+    ``quantity`` ishorali: chiqim manfiy, kirim musbat. ``Part.stock_quantity``
+    shu jurnal yig'indisiga teng saqlanadi (``apps.stock``);
+    ``rebuild_stock_balances`` buyrug'i qoldiqlarni jurnaldan qayta hisoblaydi.
+    """
+
+    part = models.ForeignKey(
+        Part, on_delete=models.PROTECT, related_name="movements"
+    )
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.SET_NULL,
+        related_name="stock_movements",
+        null=True,
+        blank=True,
+    )
+    order_part = models.ForeignKey(
+        OrderPart,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    kind = models.CharField(
+        _("Kind"), max_length=16, choices=StockMovementKind.choices
+    )
+    quantity = models.IntegerField(_("Quantity"))
+    note = models.CharField(_("Note"), max_length=255, blank=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Stock movement")
+        verbose_name_plural = _("Stock movements")
+        indexes = [
+            models.Index(fields=["part", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.part_id}: {self.quantity:+d} ({self.kind})"
+
+
+class MediaBlob(models.Model):
+    """
+    Mazmun bo'yicha saqlangan fayl (``ContentAddressedStorage``) va unga
+    havolalar soni. Oxirgi havola o'chirilganda fayl ham o'chiriladi (``apps.photos``).
+    """
+
+    name = models.CharField(_("Name"), max_length=255, unique=True)
+    size = models.BigIntegerField(_("Size"), default=0)
+    ref_count = models.PositiveIntegerField(_("Reference count"), default=0)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Media blob")
+        verbose_name_plural = _("Media blobs")
+
+    def __str__(self) -> str:
+        return f"{self.name} x{self.ref_count}"
 
-    def delete(self, *args, **kwargs):
-        order = self.order
-        result = super().delete(*args, **kwargs)
-        order.update_payment_state(save=True)
-        return result
@@ -0,0 +1,138 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+CURSOR_PARAM = "cursor"
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    has_next: bool = False
+    has_previous: bool = False
+    next_url: str = ""
+    previous_url: str = ""
+    per_page: int = 50
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Keyset (seek) pagination: OFFSET va COUNT(*) ishlatilmaydi.
+
+    Sahifa oxirgi ko'rilgan yozuvning kalit qiymatlaridan keyingi
+    ``per_page + 1`` qatorni o'qiydi. Kursor - kalit qiymatlari va
+    yo'nalishdan iborat base64 JSON, URL'dagi boshqa filtrlar saqlanadi.
+    """
+
+    def __init__(self, queryset, per_page: int = 50, ordering=("-created_at", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.model = queryset.model
+
+    @staticmethod
+    def _field_name(order_field: str) -> str:
+        return order_field.lstrip("-")
+
+    def _reversed_ordering(self):
+        return tuple(
+            f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering
+        )
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        # value_to_string mikrosekundlarni saqlaydi (DjangoJSONEncoder kesadi)
+        values = [
+            self.model._meta.get_field(self._field_name(f)).value_to_string(obj)
+            for f in self.ordering
+        ]
+        payload = json.dumps({"v": values, "d": direction})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str):
+        """Noto'g'ri kursor bo'lsa ``None`` qaytaradi (birinchi sahifa)."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            raw_values = data["v"]
+            direction = data["d"]
+            if direction not in ("next", "prev") or len(raw_values) != len(self.ordering):
+                return None
+            values = [
+                self.model._meta.get_field(self._field_name(f)).to_python(v)
+                for f, v in zip(self.ordering, raw_values)
+            ]
+        except (ValueError, KeyError, TypeError, json.JSONDecodeError, ValidationError):
+            return None
+        if any(value is None for value in values):
+            return None
+        return values, direction
+
+    def _seek_filter(self, values, ordering) -> Q:
+        # (a, b) > (x, y) ni indeksga mos ravishda ochib yozish:
+        # a > x OR (a = x AND b > y)
+        condition = Q()
+        for i, order_field in enumerate(ordering):
+            name = self._field_name(order_field)
+            lookup = "lt" if order_field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": values[i]})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                step &= Q(**{self._field_name(prev_field): prev_value})
+            condition |= step
+        return condition
+
+    def _build_url(self, request, cursor: str) -> str:
+        params = request.GET.copy()
+        params[CURSOR_PARAM] = cursor
+        return f"?{params.urlencode()}"
+
+    def page(self, request) -> KeysetPage:
+        decoded = None
+        raw_cursor = request.GET.get(CURSOR_PARAM, "").strip()
+        if raw_cursor:
+            decoded = self.decode_cursor(raw_cursor)
+
+        if decoded and decoded[1] == "prev":
+            ordering = self._reversed_ordering()
+        else:
+            ordering = self.ordering
+
+        qs = self.queryset.order_by(*ordering)
+        if decoded:
+            qs = qs.filter(self._seek_filter(decoded[0], ordering))
+
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if decoded and decoded[1] == "prev":
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, decoded is not None
+
+        page = KeysetPage(object_list=rows, per_page=self.per_page)
+        if rows:
+            page.has_next = has_next
+            page.has_previous = has_previous
+            if has_next:
+                page.next_url = self._build_url(
+                    request, self.encode_cursor(rows[-1], "next")
+                )
+            if has_previous:
+                page.previous_url = self._build_url(
+                    request, self.encode_cursor(rows[0], "prev")
+                )
+        return page
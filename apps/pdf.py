@@ -0,0 +1,74 @@
+import zlib
+
+
+# Kirill -> lotin (o'zbek imlosi); standart PDF shriftlari faqat WinAnsi ni biladi
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "j", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh", "ъ": "'",
+    "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o'", "қ": "q",
+    "ғ": "g'", "ҳ": "h",
+}
+_TRANSLATE = str.maketrans(
+    {
+        **_CYRILLIC,
+        **{k.upper(): v.capitalize() for k, v in _CYRILLIC.items()},
+        "ʻ": "'", "ʼ": "'", "‘": "'", "’": "'",
+    }
+)
+
+# Courier: har bir belgi 0.6 em - ustunlarni belgilar soni bilan tekislash mumkin
+CHAR_WIDTH = 0.6
+
+
+def _encode(text: str) -> bytes:
+    raw = text.translate(_TRANSLATE).encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def monospace_pdf(lines, columns: int = 42, font_size: float = 8.0, margin: float = 12.0) -> bytes:
+    """
+    Bir sahifali, chek lentasi ko'rinishidagi PDF (Courier shrifti).
+
+    ``lines`` - ``(matn, qalin)`` juftliklari; sahifa kengligi ``columns``
+    belgiga, balandligi qatorlar soniga moslanadi. Tashqi kutubxona kerak emas.
+    """
+    leading = font_size * 1.35
+    width = columns * font_size * CHAR_WIDTH + 2 * margin
+    height = len(lines) * leading + 2 * margin
+
+    ops = [b"BT", b"%.2f TL" % leading, b"%.2f %.2f Td" % (margin, height - margin - font_size)]
+    current = None
+    for text, bold in lines:
+        font = b"/F2" if bold else b"/F1"
+        if font != current:
+            ops.append(b"%s %.1f Tf" % (font, font_size))
+            current = font
+        ops.append(b"(" + _encode(text) + b") Tj T*")
+    ops.append(b"ET")
+    stream = zlib.compress(b"\n".join(ops))
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+        b"/Resources << /Font << /F1 5 0 R /F2 6 0 R >> >> /Contents 4 0 R >>" % (width, height),
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
@@ -0,0 +1,186 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import MediaBlob, OrderPhoto, PhotoStatus
+
+
+logger = logging.getLogger(__name__)
+
+# maydon -> uzun tomonning maksimal o'lchami (px)
+DERIVATIVE_SIZES = {"thumbnail": 320, "medium": 1280}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "PHOTO_WORKERS", 2),
+                thread_name_prefix="photo",
+            )
+    return _executor
+
+
+def output_format() -> tuple[str, str]:
+    """(Pillow format, kengaytma): WebP qo'llab-quvvatlansa WebP, aks holda JPEG."""
+    wanted = getattr(settings, "PHOTO_DERIVATIVE_FORMAT", "WEBP").upper()
+    if wanted == "WEBP" and features.check("webp"):
+        return "WEBP", "webp"
+    return "JPEG", "jpg"
+
+
+def _encode(image: Image.Image, size: int, fmt: str) -> ContentFile:
+    copy = image.copy()
+    copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    if fmt == "JPEG" and copy.mode not in ("RGB", "L"):
+        copy = copy.convert("RGB")
+    buffer = BytesIO()
+    # exif= berilmaydi - metama'lumotlar (GPS, kamera) nusxaga o'tmaydi
+    copy.save(buffer, format=fmt, quality=82, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def process_photo(photo_id: int) -> bool:
+    """
+    Asl rasmdan kichik va o'rta nusxalarni yaratish, o'lchamlarni yozish.
+
+    Orientatsiya EXIF bo'yicha to'g'rilanadi, nusxalarda EXIF saqlanmaydi.
+    Model ``update()`` bilan yangilanadi - signallar qayta ishga tushmaydi.
+    """
+    photo = OrderPhoto.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.image:
+        return False
+    fmt, ext = output_format()
+    stem = Path(photo.image.name).stem
+    # Nomlar blob xeshidan - bir xil rasmli fotolar nusxalarni ham bo'lishadi
+    names = {
+        field: OrderPhoto._meta.get_field(field).generate_filename(
+            photo, f"{stem}_{size}.{ext}"
+        )
+        for field, size in DERIVATIVE_SIZES.items()
+    }
+    storage = photo.thumbnail.storage
+    try:
+        with photo.image.open("rb") as fh, Image.open(fh) as original:
+            image = ImageOps.exif_transpose(original)
+            width, height = image.size
+            for field, name in names.items():
+                if not storage.exists(name):
+                    names[field] = storage.save(
+                        name, _encode(image, DERIVATIVE_SIZES[field], fmt)
+                    )
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning("Photo %s could not be processed", photo_id, exc_info=True)
+        OrderPhoto.objects.filter(pk=photo_id).update(processing_status=PhotoStatus.FAILED)
+        return False
+
+    # Shu orada rasm almashtirilgan bo'lsa eski nusxalar yozilmaydi
+    return bool(
+        OrderPhoto.objects.filter(pk=photo_id, image=photo.image.name).update(
+            width=width,
+            height=height,
+            processing_status=PhotoStatus.READY,
+            **names,
+        )
+    )
+
+
+def _run(photo_id: int) -> None:
+    try:
+        process_photo(photo_id)
+    except Exception:
+        logger.exception("Photo %s processing crashed", photo_id)
+    finally:
+        # Oqimning o'z ulanishi - ochiq qolmasligi uchun
+        connections.close_all()
+
+
+def schedule(photo_id: int) -> None:
+    """Tranzaksiya tasdiqlangach fon oqimlar hovuzida qayta ishlash (broker kerak emas)."""
+    if getattr(settings, "PHOTO_PROCESSING_SYNC", False):
+        transaction.on_commit(lambda: process_photo(photo_id))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, photo_id))
+
+
+def acquire(name: str, storage) -> None:
+    """Blob havolalar sonini oshirish (birinchi havolada yozuv yaratiladi)."""
+    if not name:
+        return
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name).only("pk").first()
+        if blob is None:
+            size = storage.size(name) if storage.exists(name) else 0
+            MediaBlob.objects.create(name=name, size=size, ref_count=1)
+        else:
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+
+def release(name: str, storage, extra_files=()) -> None:
+    """
+    Havolalar sonini kamaytirish; oxirgi havola bo'lsa blob (va ``extra_files``,
+    masalan kichik nusxalar) tranzaksiya tasdiqlangach o'chiriladi.
+    """
+    if not name:
+        return
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+        if blob is None:
+            # Hisobga olinmagan fayl (migratsiyadan oldingi) - tegmaymiz
+            return
+        if blob.ref_count > 1:
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+            return
+        blob.delete()
+
+    def delete_files():
+        # Shu orada xuddi shu mazmun qayta yuklangan bo'lsa o'chirmaymiz
+        if MediaBlob.objects.filter(name=name).exists():
+            return
+        storage.delete(name)
+        for file_name in extra_files:
+            if file_name:
+                default_storage.delete(file_name)
+
+    transaction.on_commit(delete_files)
+
+
+def _derivative_names(photo) -> list:
+    return [getattr(photo, field).name for field in DERIVATIVE_SIZES]
+
+
+def photo_saved(photo, created: bool) -> None:
+    old_image = None if created else getattr(photo, "_saved_image", photo.image.name)
+    if created or photo.image.name != old_image:
+        storage = photo.image.storage
+        acquire(photo.image.name, storage)
+        if not created:
+            release(old_image, storage, extra_files=_derivative_names(photo))
+            # Eski nusxalar o'chiriladi - maydonlar qayta ishlash tugaguncha bo'sh
+            cleared = {field: "" for field in DERIVATIVE_SIZES}
+            OrderPhoto.objects.filter(pk=photo.pk).update(
+                processing_status=PhotoStatus.PENDING, width=None, height=None, **cleared
+            )
+            for field in DERIVATIVE_SIZES:
+                setattr(photo, field, "")
+            photo.width = photo.height = None
+            photo.processing_status = PhotoStatus.PENDING
+        schedule(photo.pk)
+    photo._saved_image = photo.image.name
+
+
+def photo_deleted(photo) -> None:
+    release(photo.image.name, photo.image.storage, extra_files=_derivative_names(photo))
@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import (
+    Order,
+    OrderPayment,
+    OrderService,
+    OrderStatus,
+    SearchKind,
+    ServiceStatus,
+)
+from .reports import created_between
+from .rollups import resolve_period
+from .search import matching_ids, search_filter
+
+
+def hot_queries():
+    """(nomi, queryset) - ko'rinishlar va hisobotlardagi asosiy so'rovlar."""
+    today = timezone.localdate()
+    sample = (
+        Order.objects.order_by("-created_at", "-id")
+        .values("pk", "created_at", "customer_id", "car_id", "master_id")
+        .first()
+    )
+    if sample is None:
+        return []
+    month_first, month_last = resolve_period("month", today)
+    newest = ("-created_at", "-id")
+    queries = [
+        ("order_list", Order.objects.order_by(*newest)[:51]),
+        (
+            "order_list_next_page",
+            Order.objects.filter(
+                Q(created_at__lt=sample["created_at"])
+                | Q(created_at=sample["created_at"], id__lt=sample["pk"])
+            ).order_by(*newest)[:51],
+        ),
+        (
+            "order_list_status_dates",
+            Order.objects.filter(
+                status=OrderStatus.IN_PROGRESS,
+                **created_between(today - timedelta(days=30), today),
+            ).order_by(*newest)[:51],
+        ),
+        ("daily_report", Order.objects.filter(**created_between(today, today))),
+        ("monthly_report", Order.objects.filter(**created_between(month_first, month_last))),
+        (
+            "customer_orders",
+            Order.objects.filter(customer_id=sample["customer_id"]).order_by(*newest)[:51],
+        ),
+        ("car_orders", Order.objects.filter(car_id=sample["car_id"]).order_by(*newest)[:51]),
+        (
+            "master_open_orders",
+            Order.objects.filter(master_id=sample["master_id"])
+            .exclude(status=OrderStatus.COMPLETED)
+            .order_by()
+            .values("status")
+            .annotate(n=Count("id")),
+        ),
+        (
+            "order_services_pending",
+            OrderService.objects.filter(
+                order_id=sample["pk"],
+                status__in=[ServiceStatus.IN_PROGRESS, ServiceStatus.CHECKING],
+            ),
+        ),
+        (
+            "order_payments_sum",
+            OrderPayment.objects.filter(order_id=sample["pk"])
+            .values("order_id")
+            .annotate(total=Sum("amount")),
+        ),
+    ]
+    # Qidiruv: PostgreSQL da trigram indekslar (0016), SQLite da FTS5 (0017)
+    queries += [
+        (
+            f"search_{name}",
+            # Topilgan kam sonli qatorni saralash muammo emas - indeks tekshiriladi
+            Order.objects.filter(
+                pk__in=matching_ids(SearchKind.ORDER, search_filter(**params))
+            ).order_by(),
+        )
+        for name, params in (
+            ("query", {"query": "ali"}),
+            ("phone", {"phone": "90123"}),
+            ("plate", {"plate": "01A123"}),
+        )
+    ]
+    return queries
+
+
+def plan_problems(plan: str) -> list:
+    """Reja satrlaridan indekssiz to'liq skan va alohida saralashni topish."""
+    problems = []
+    for line in plan.splitlines():
+        text = line.strip()
+        if connection.vendor == "sqlite":
+            if "VIRTUAL TABLE INDEX" in text and ":M" in text:
+                continue  # FTS5 MATCH
+            if (text.startswith("SCAN") or " SCAN " in text) and "USING" not in text:
+                problems.append(text)
+            elif "USE TEMP B-TREE FOR ORDER BY" in text:
+                problems.append(text)
+        elif connection.vendor == "postgresql" and "Seq Scan" in text:
+            problems.append(text)
+    return problems
+
+
+def explain_hot_queries() -> list:
+    """
+    ``hot_queries`` ning har biri uchun ``(nomi, reja, muammolar)``.
+
+    ``check_query_plans`` buyrug'i va testlar shu funksiyani ishlatadi.
+    """
+    results = []
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Kichik jadvallarda ham indeks ishlatila olinishini tekshirish
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, queryset in hot_queries():
+            plan = queryset.explain()
+            results.append((name, plan, plan_problems(plan)))
+    return results
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import textwrap
+from pathlib import Path
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from . import catalog
+from .models import Order
+from .pdf import monospace_pdf
+
+
+# Chekdagi buyurtma/mijoz/mashina maydonlari - kalit ham shulardan
+HEADER_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "lines_version",
+    "payments_version",
+    "total_amount",
+    "payment_status",
+    "payment_type",
+    "customer__full_name",
+    "customer__phone",
+    "car__plate_number",
+    "car__brand",
+    "car__model",
+)
+PDF_COLUMNS = 42
+
+
+def cache_dir(order_id: int) -> Path:
+    return Path(settings.RECEIPT_CACHE_DIR) / str(order_id)
+
+
+def receipt_order(pk: int) -> Order:
+    return get_object_or_404(
+        Order.objects.select_related("customer", "car").only(*HEADER_FIELDS), pk=pk
+    )
+
+
+def request_receipt_order(request, pk: int) -> Order:
+    """Bitta so'rov ichida buyurtmani bir marta o'qish (ETag va javob uchun)."""
+    if getattr(request, "_receipt_order", None) is None or request._receipt_order.pk != pk:
+        request._receipt_order = receipt_order(pk)
+    return request._receipt_order
+
+
+def receipt_key(order: Order) -> str:
+    """
+    Chek versiyasi: ``updated_at``, qator/to'lov versiyalari, chekda
+    ko'rinadigan sarlavha maydonlari va katalog versiyasi (xizmat/zapchast
+    nomlari katalogdan). Ular o'zgarsa kalit ham o'zgaradi.
+    """
+    parts = [catalog.current_version()]
+    for field in HEADER_FIELDS:
+        obj = order
+        for attr in field.split("__"):
+            obj = getattr(obj, attr)
+        parts.append(str(obj))
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:20]
+
+
+def _lines(order: Order):
+    services = list(order.service_items.select_related("service").order_by("pk"))
+    parts = list(order.part_items.select_related("part").order_by("pk"))
+    return services, parts
+
+
+def _cached(order: Order, ext: str, build) -> bytes:
+    """
+    Diskdagi ``<order_id>/<kalit>.<ext>`` faylini o'qish yoki yaratish.
+
+    Fayl vaqtinchalik nom bilan yozilib ``os.replace`` qilinadi (parallel
+    so'rovlar yarim faylni o'qimaydi); shu buyurtmaning eski versiyalari o'chiriladi.
+    """
+    directory = cache_dir(order.pk)
+    path = directory / f"{receipt_key(order)}.{ext}"
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        pass
+    content = build(order)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(content)
+    os.replace(tmp_path, path)
+    for stale in directory.glob(f"*.{ext}"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return content
+
+
+def _build_html(order: Order) -> bytes:
+    services, parts = _lines(order)
+    html = render_to_string(
+        "partials/receipt.jinja",
+        {"order": order, "services": services, "parts": parts},
+    )
+    return html.encode()
+
+
+def _amount(value) -> str:
+    return f"{value:.0f}"
+
+
+def _item_lines(name: str, detail: str, total) -> list:
+    lines = [(line, False) for line in textwrap.wrap(name, PDF_COLUMNS) or ["-"]]
+    total = _amount(total)
+    lines.append((f"  {detail}".ljust(PDF_COLUMNS - len(total)) + total, False))
+    return lines
+
+
+def _discount(item) -> str:
+    return f" -{item.discount:.2f}%" if item.discount else ""
+
+
+def _build_pdf(order: Order) -> bytes:
+    services, parts = _lines(order)
+    rule = ("-" * PDF_COLUMNS, False)
+    created = timezone.localtime(order.created_at).strftime("%Y-%m-%d %H:%M")
+    lines = [
+        ("Avto Servis Chek".center(PDF_COLUMNS), True),
+        (f"Buyurtma #{order.pk}".center(PDF_COLUMNS), False),
+        (f"Sana: {created}".center(PDF_COLUMNS), False),
+        rule,
+        (f"Mijoz: {order.customer.full_name}", False),
+        (f"Tel: {order.customer.phone}", False),
+        (f"Mashina: {order.car.plate_number}", False),
+        (f"{order.car.brand} {order.car.model}", False),
+        rule,
+        ("Xizmatlar", True),
+    ]
+    for item in services:
+        lines += _item_lines(item.service.name, f"{_amount(item.price)}{_discount(item)}", item.line_total)
+    if not services:
+        lines.append(("Xizmatlar qo'shilmagan", False))
+    lines += [rule, ("Ehtiyot qismlar", True)]
+    for item in parts:
+        detail = f"{item.quantity} x {_amount(item.price)}{_discount(item)}"
+        lines += _item_lines(item.part.name, detail, item.line_total)
+    if not parts:
+        lines.append(("Ehtiyot qismlar qo'shilmagan", False))
+    total = f"{_amount(order.total_amount)} so'm"
+    lines += [
+        rule,
+        ("Umumiy summa:".ljust(PDF_COLUMNS - len(total)) + total, True),
+        (f"To'lov holati: {order.get_payment_status_display()}", False),
+    ]
+    if order.payment_type:
+        lines.append((f"Turi: {order.get_payment_type_display()}", False))
+    return monospace_pdf(lines, columns=PDF_COLUMNS)
+
+
+def receipt_html(order: Order):
+    """Chek tanasi (HTML fragment) - buyurtma versiyasi bo'yicha keshlangan."""
+    return mark_safe(_cached(order, "html", _build_html).decode())
+
+
+def receipt_pdf(order: Order) -> bytes:
+    return _cached(order, "pdf", _build_pdf)
+
+
+def purge(order_id: int) -> None:
+    shutil.rmtree(cache_dir(order_id), ignore_errors=True)
@@ -0,0 +1,148 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+from .instrumentation import untracked
+from .models import Order
+
+
+logger = logging.getLogger(__name__)
+
+# Joriy so'rov o'qishlari uchun baza (None - odatdagi primary)
+_read_alias: ContextVar = ContextVar("read_alias", default=None)
+
+# Jarayon bo'yicha: oxirgi tekshiruv vaqti va replika yaroqliligi
+_health_memo = {"checked": 0.0, "healthy": False}
+
+SESSION_KEY = "_db_primary_until"
+
+
+def replica_alias() -> str | None:
+    alias = getattr(settings, "REPLICA_DATABASE", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+def replica_lag(alias: str) -> float:
+    """
+    Replikaning orqada qolishi (soniya).
+
+    PostgreSQL standby da replay vaqtidan; boshqa hollarda (SQLite fayllari,
+    ikki lokal baza) eng yangi buyurtmaning ``created_at`` qiymatlari
+    solishtiriladi (indeksdan o'qiladi).
+    """
+    if connections[alias].vendor == "postgresql":
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+            )
+            lag = cursor.fetchone()[0]
+        # NULL - server standby emas
+        if lag is not None:
+            return float(lag)
+    newest = Order.objects.order_by("-created_at").values_list("created_at", flat=True)
+    primary = newest.using("default").first()
+    replica = newest.using(alias).first()
+    if primary is None:
+        return 0.0
+    if replica is None:
+        return float("inf")
+    return max((primary - replica).total_seconds(), 0.0)
+
+
+def replica_healthy(alias: str) -> bool:
+    """``REPLICA_LAG_CHECK_INTERVAL`` soniyada bir marta tekshiriladi."""
+    now = time.monotonic()
+    interval = getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 2.0)
+    if now - _health_memo["checked"] < interval:
+        return _health_memo["healthy"]
+    try:
+        with untracked():
+            lag = replica_lag(alias)
+        healthy = lag <= getattr(settings, "REPLICA_MAX_LAG", 5.0)
+        if not healthy:
+            logger.warning("Replica %s lags %.1fs, reading from primary", alias, lag)
+    except DatabaseError:
+        logger.warning("Replica %s is unavailable, reading from primary", alias, exc_info=True)
+        healthy = False
+    _health_memo.update(checked=now, healthy=healthy)
+    return healthy
+
+
+def pin_primary(request) -> None:
+    """Yozuvdan keyin shu sessiya o'qishlari bir muddat primary dan (o'z yozuvini ko'rishi uchun)."""
+    if replica_alias() is None:
+        return
+    request.session[SESSION_KEY] = time.time() + getattr(settings, "REPLICA_STICKY_SECONDS", 15)
+
+
+def _pinned(request) -> bool:
+    session = getattr(request, "session", None)
+    return bool(session) and session.get(SESSION_KEY, 0) > time.time()
+
+
+def _stream_on(content, alias):
+    # Streaming javob ko'rinishdan keyin o'qiladi - har bir bo'lakda alias qayta o'rnatiladi
+    iterator = iter(content)
+    while True:
+        token = _read_alias.set(alias)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _read_alias.reset(token)
+        yield chunk
+
+
+def read_replica(view):
+    """
+    Faqat o'qiydigan ko'rinishlar uchun: GET/HEAD so'rovlaridagi ``apps``
+    modellari o'qishlari replikaga yuboriladi. Replika sozlanmagan, orqada
+    qolgan yoki sessiya yaqinda yozgan bo'lsa - primary.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if (
+            alias is None
+            or request.method not in ("GET", "HEAD")
+            or _pinned(request)
+            or not replica_healthy(alias)
+        ):
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+        if getattr(response, "streaming", False):
+            response.streaming_content = _stream_on(response.streaming_content, alias)
+        return response
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """``read_replica`` ichidagi ``apps`` o'qishlari - replika, qolgani - ``default``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is not None and model._meta.app_label == "apps":
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replika sxemani primary dan oladi (replikatsiya yoki sync_replica)
+        return db != replica_alias()
@@ -0,0 +1,257 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DailyRevenueRollup, Order, OrderPayment
+
+
+def _bump(day, payment_type, status, master_id, amount, count) -> None:
+    if not amount and not count:
+        return
+    key = {
+        "day": day,
+        "payment_type": payment_type,
+        "status": status,
+        "master_id": master_id,
+    }
+    with transaction.atomic():
+        row = (
+            DailyRevenueRollup.objects.select_for_update()
+            .filter(**key)
+            .only("pk")
+            .first()
+        )
+        if row is None:
+            DailyRevenueRollup.objects.create(
+                amount=amount, payments_count=count, **key
+            )
+        else:
+            # master=None bo'lgan bir nechta qator bo'lishi mumkin, shuning uchun pk bo'yicha
+            DailyRevenueRollup.objects.filter(pk=row.pk).update(
+                amount=F("amount") + amount,
+                payments_count=F("payments_count") + count,
+            )
+
+
+def _bump_many(status, master_id, deltas) -> None:
+    """
+    Bir buyurtmaning ``{(kun, to'lov turi): [summa, soni]}`` farqlarini
+    qo'llash: mavjud qatorlar bitta so'rovda qulflanib o'qiladi, keyin bitta
+    ``bulk_create`` va bitta ``bulk_update`` (``_bump`` dagi har kalit uchun
+    alohida o'qish/yozish o'rniga).
+    """
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if not deltas:
+        return
+    with transaction.atomic():
+        rows = {}
+        existing = DailyRevenueRollup.objects.select_for_update().filter(
+            day__in={day for day, _type in deltas},
+            payment_type__in={payment_type for _day, payment_type in deltas},
+            status=status,
+            master_id=master_id,
+        )
+        for row in existing.order_by("pk"):
+            rows.setdefault((row.day, row.payment_type), row)
+        created, changed = [], []
+        for (day, payment_type), (amount, count) in deltas.items():
+            row = rows.get((day, payment_type))
+            if row is None:
+                created.append(
+                    DailyRevenueRollup(
+                        day=day,
+                        payment_type=payment_type,
+                        status=status,
+                        master_id=master_id,
+                        amount=amount,
+                        payments_count=count,
+                    )
+                )
+            else:
+                row.amount += amount
+                row.payments_count += count
+                changed.append(row)
+        DailyRevenueRollup.objects.bulk_create(created)
+        DailyRevenueRollup.objects.bulk_update(changed, ["amount", "payments_count"])
+
+
+def _order_key(order_id):
+    return (
+        Order.objects.filter(pk=order_id).values_list("status", "master_id").first()
+    )
+
+
+def payment_saved(payment, created: bool) -> None:
+    """To'lov yaratilgan/o'zgarganda eski ulushni ayirib, yangisini qo'shish."""
+    order_key = _order_key(payment.order_id)
+    if order_key is None:
+        return
+    status, master_id = order_key
+    old = None if created else getattr(payment, "_saved_rollup_key", None)
+    if old is None and not created:
+        old = (
+            OrderPayment.objects.filter(pk=payment.pk)
+            .values_list("paid_at", "payment_type", "amount")
+            .first()
+        )
+    with transaction.atomic():
+        if old is not None:
+            old_paid_at, old_type, old_amount = old
+            _bump(
+                timezone.localdate(old_paid_at),
+                old_type,
+                status,
+                master_id,
+                -old_amount,
+                -1,
+            )
+        _bump(
+            timezone.localdate(payment.paid_at),
+            payment.payment_type,
+            status,
+            master_id,
+            Decimal(payment.amount),
+            1,
+        )
+    payment._saved_rollup_key = (payment.paid_at, payment.payment_type, payment.amount)
+
+
+def payments_saved(order_id, new=(), changed=()) -> None:
+    """
+    ``payment_saved`` ning bulk varianti (``submission.save_order``): bir
+    buyurtma to'lovlarining farqlari kun va to'lov turi bo'yicha yig'ilib,
+    ``_bump_many`` bilan bitta o'tishda qo'llanadi. ``changed`` dagi eski
+    qiymatlar ``from_db`` snapshotidan olinadi.
+    """
+    if not new and not changed:
+        return
+    order_key = _order_key(order_id)
+    if order_key is None:
+        return
+    status, master_id = order_key
+    deltas = defaultdict(lambda: [Decimal("0"), 0])
+
+    def add(paid_at, payment_type, amount, count):
+        delta = deltas[(timezone.localdate(paid_at), payment_type)]
+        delta[0] += amount
+        delta[1] += count
+
+    for payment in changed:
+        old = getattr(payment, "_saved_rollup_key", None)
+        if old is not None:
+            old_paid_at, old_type, old_amount = old
+            add(old_paid_at, old_type, -old_amount, -1)
+    for payment in (*new, *changed):
+        add(payment.paid_at, payment.payment_type, Decimal(payment.amount), 1)
+    _bump_many(status, master_id, deltas)
+    for payment in (*new, *changed):
+        payment._saved_rollup_key = (payment.paid_at, payment.payment_type, payment.amount)
+
+
+def payment_deleted(payment) -> None:
+    order_key = _order_key(payment.order_id)
+    if order_key is None:
+        return
+    status, master_id = order_key
+    paid_at, payment_type, amount = getattr(
+        payment,
+        "_saved_rollup_key",
+        (payment.paid_at, payment.payment_type, payment.amount),
+    )
+    _bump(
+        timezone.localdate(paid_at),
+        payment_type,
+        status,
+        master_id,
+        -amount,
+        -1,
+    )
+
+
+def order_moved(order, old_status, old_master_id) -> None:
+    """Buyurtma statusi yoki ustasi o'zgarsa, uning to'lovlarini ko'chirish."""
+    groups = (
+        order.payments.order_by()
+        .annotate(day=TruncDate("paid_at"))
+        .values("day", "payment_type")
+        .annotate(amount=Sum("amount"), count=Count("id"))
+    )
+    with transaction.atomic():
+        for g in groups:
+            _bump(g["day"], g["payment_type"], old_status, old_master_id, -g["amount"], -g["count"])
+            _bump(g["day"], g["payment_type"], order.status, order.master_id, g["amount"], g["count"])
+
+
+def rebuild_rollups() -> int:
+    """Rollup jadvalini to'lovlardan qaytadan qurish."""
+    groups = (
+        OrderPayment.objects.order_by()
+        .annotate(day=TruncDate("paid_at"))
+        .values("day", "payment_type", "order__status", "order__master_id")
+        .annotate(amount=Sum("amount"), count=Count("id"))
+    )
+    with transaction.atomic():
+        DailyRevenueRollup.objects.all().delete()
+        rows = [
+            DailyRevenueRollup(
+                day=g["day"],
+                payment_type=g["payment_type"],
+                status=g["order__status"],
+                master_id=g["order__master_id"],
+                amount=g["amount"],
+                payments_count=g["count"],
+            )
+            for g in groups.iterator()
+        ]
+        DailyRevenueRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def resolve_period(period: str, anchor: date):
+    """``week``/``month``/``quarter``/``year`` uchun (boshi, oxiri) sanalari."""
+    if period == "week":
+        start = anchor - timedelta(days=anchor.weekday())
+        return start, start + timedelta(days=6)
+    if period == "month":
+        start = anchor.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+    if period == "quarter":
+        first_month = 3 * ((anchor.month - 1) // 3) + 1
+        start = anchor.replace(month=first_month, day=1)
+        end_month = first_month + 2
+        next_start = (
+            date(anchor.year + 1, 1, 1)
+            if end_month == 12
+            else date(anchor.year, end_month + 1, 1)
+        )
+        return start, next_start - timedelta(days=1)
+    if period == "year":
+        return date(anchor.year, 1, 1), date(anchor.year, 12, 31)
+    return anchor, anchor
+
+
+REPORT_GROUPS = {
+    "day": "day",
+    "payment_type": "payment_type",
+    "status": "status",
+    "master": "master_id",
+}
+
+
+def revenue_summary(date_from: date, date_to: date, group_by: str = "day"):
+    """Rollup qatorlarini yig'ish: orderlar jadvali skanerlanmaydi."""
+    column = REPORT_GROUPS.get(group_by, "day")
+    rows = (
+        DailyRevenueRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        .values(column)
+        .annotate(amount=Sum("amount"), count=Sum("payments_count"))
+        .filter(count__gt=0)
+        .order_by(column)
+    )
+    return column, list(rows)
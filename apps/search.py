@@ -0,0 +1,225 @@
+import re
+import unicodedata
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Car, Customer, Order, SearchIndex, SearchKind
+
+
+_NON_DIGIT = re.compile(r"\D+")
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+_SPACES = re.compile(r"\s+")
+# O‘zbekcha apostrof variantlari (o‘, g‘, ʼ) bitta belgiga keltiriladi
+_APOSTROPHES = str.maketrans({"‘": "'", "’": "'", "ʻ": "'", "ʼ": "'", "`": "'"})
+
+# SQLite: SearchIndex ustidagi FTS5 trigram jadvali (migratsiya 0017)
+FTS_TABLE = "apps_searchindex_fts"
+# trigram tokenizer 3 belgidan qisqa qiymatlarni indeks bo'yicha topa olmaydi
+FTS_MIN_LENGTH = 3
+
+
+def normalize_phone(value) -> str:
+    return _NON_DIGIT.sub("", value or "")
+
+
+def normalize_plate(value) -> str:
+    return _NON_ALNUM.sub("", (value or "").upper())
+
+
+def fold_text(*parts) -> str:
+    text = " ".join(p for p in parts if p)
+    text = unicodedata.normalize("NFKD", text.translate(_APOSTROPHES))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", text.casefold()).strip()
+
+
+def _customer_fields(customer) -> dict:
+    return {
+        "phone_digits": normalize_phone(customer.phone),
+        "name": fold_text(customer.full_name, customer.telegram_username),
+    }
+
+
+def _car_fields(car) -> dict:
+    return {
+        "plate": normalize_plate(car.plate_number),
+        "vehicle": fold_text(car.brand, car.model),
+    }
+
+
+def index_customer(customer) -> None:
+    """Mijoz va unga tegishli barcha qatorlarning telefon/ismini yangilash."""
+    fields = _customer_fields(customer)
+    with transaction.atomic():
+        SearchIndex.objects.update_or_create(
+            kind=SearchKind.CUSTOMER,
+            customer=customer,
+            defaults=fields,
+        )
+        SearchIndex.objects.filter(customer=customer).exclude(
+            kind=SearchKind.CUSTOMER
+        ).update(**fields)
+
+
+def index_car(car) -> None:
+    """Mashina qatorini va shu mashinadagi buyurtmalar qatorlarini yangilash."""
+    fields = _car_fields(car)
+    with transaction.atomic():
+        SearchIndex.objects.update_or_create(
+            kind=SearchKind.CAR,
+            car=car,
+            defaults={
+                "customer_id": car.customer_id,
+                **_customer_fields(car.customer),
+                **fields,
+            },
+        )
+        SearchIndex.objects.filter(car=car, kind=SearchKind.ORDER).update(**fields)
+
+
+def index_order(order) -> None:
+    SearchIndex.objects.update_or_create(
+        kind=SearchKind.ORDER,
+        order=order,
+        defaults={
+            "customer_id": order.customer_id,
+            "car_id": order.car_id,
+            **_customer_fields(order.customer),
+            **_car_fields(order.car),
+        },
+    )
+
+
+def search_filter(
+    query: str = "",
+    phone: str = "",
+    plate: str = "",
+    vehicle: bool = False,
+) -> Q:
+    """
+    ``SearchIndex`` uchun filtr.
+
+    ``query`` - telefon, raqam yoki ism bo'yicha (OR), ``phone`` va
+    ``plate`` - alohida maydonlar bo'yicha (AND). ``vehicle=True`` bo'lsa
+    ``query`` brand/model bo'yicha ham qidiradi.
+    """
+    groups = []
+    if query:
+        any_of = [("name", fold_text(query))]
+        digits = normalize_phone(query)
+        if digits:
+            any_of.append(("phone_digits", digits))
+        plate_query = normalize_plate(query)
+        if plate_query:
+            any_of.append(("plate", plate_query))
+        if vehicle:
+            any_of.append(("vehicle", fold_text(query)))
+        groups.append(any_of)
+    if phone:
+        groups.append([("phone_digits", normalize_phone(phone))])
+    if plate:
+        groups.append([("plate", normalize_plate(plate))])
+    return _contains_filter(groups)
+
+
+def _fts_phrase(field: str, value: str) -> str:
+    return '%s : "%s"' % (field, value.replace('"', '""'))
+
+
+def _contains_filter(groups) -> Q:
+    """
+    ``groups`` - AND bilan bog'langan ``(maydon, qiymat)`` OR-guruhlari,
+    har biri "maydon qiymatni o'z ichiga oladi".
+
+    PostgreSQL da ``__contains`` (pg_trgm indekslari), SQLite da bitta FTS5
+    MATCH so'rovi (rowid bo'yicha). SQLite da qiymatlardan biri
+    ``FTS_MIN_LENGTH`` dan qisqa bo'lsa - oddiy ``__contains`` (to'liq skan).
+    """
+    if (
+        groups
+        and connection.vendor == "sqlite"
+        and all(len(value) >= FTS_MIN_LENGTH for group in groups for _, value in group)
+    ):
+        expression = " AND ".join(
+            "(%s)" % " OR ".join(_fts_phrase(field, value) for field, value in group)
+            for group in groups
+        )
+        return Q(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+            )
+        )
+    condition = Q()
+    for group in groups:
+        any_of = Q()
+        for field, value in group:
+            any_of |= Q(**{f"{field}__contains": value})
+        condition &= any_of
+    return condition
+
+
+def matching_ids(kind: str, condition: Q):
+    """Tanlangan turdagi obyektlar id lari uchun subquery."""
+    column = {
+        SearchKind.CUSTOMER: "customer_id",
+        SearchKind.CAR: "car_id",
+        SearchKind.ORDER: "order_id",
+    }[kind]
+    return SearchIndex.objects.filter(condition, kind=kind).values(column)
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    """Butun indeksni qaytadan qurish. Yaratilgan qatorlar sonini qaytaradi."""
+    created = 0
+    with transaction.atomic():
+        SearchIndex.objects.all().delete()
+        batch = []
+
+        def flush():
+            nonlocal created
+            SearchIndex.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            batch.clear()
+
+        for customer in Customer.objects.iterator(chunk_size=batch_size):
+            batch.append(
+                SearchIndex(
+                    kind=SearchKind.CUSTOMER,
+                    customer=customer,
+                    **_customer_fields(customer),
+                )
+            )
+            if len(batch) >= batch_size:
+                flush()
+        cars = Car.objects.select_related("customer")
+        for car in cars.iterator(chunk_size=batch_size):
+            batch.append(
+                SearchIndex(
+                    kind=SearchKind.CAR,
+                    customer_id=car.customer_id,
+                    car=car,
+                    **_customer_fields(car.customer),
+                    **_car_fields(car),
+                )
+            )
+            if len(batch) >= batch_size:
+                flush()
+        orders = Order.objects.select_related("customer", "car").order_by()
+        for order in orders.iterator(chunk_size=batch_size):
+            batch.append(
+                SearchIndex(
+                    kind=SearchKind.ORDER,
+                    customer_id=order.customer_id,
+                    car_id=order.car_id,
+                    order=order,
+                    **_customer_fields(order.customer),
+                    **_car_fields(order.car),
+                )
+            )
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    return created
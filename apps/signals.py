@@ -0,0 +1,168 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    Car,
+    Customer,
+    Order,
+    OrderPart,
+    OrderPayment,
+    OrderPhoto,
+    OrderService,
+    Part,
+    Service,
+)
+from . import (
+    catalog,
+    events,
+    instrumentation,
+    photos,
+    receipts,
+    rollups,
+    search,
+    stock,
+    workload,
+)
+
+
+@receiver(post_save, sender=Customer)
+def customer_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_customer(instance)
+
+
+@receiver(post_save, sender=Car)
+def car_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_car(instance)
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # total/payment_status kabi yangilanishlarda indeks o'zgarmaydi
+    if not created and update_fields and not {"customer", "car"} & set(update_fields):
+        return
+    search.index_order(instance)
+
+
+@receiver(post_save, sender=Order)
+def order_rollup_moved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not {"status", "master", "master_id"} & set(update_fields):
+        return
+    new_key = (instance.status, instance.master_id)
+    old_key = getattr(instance, "_saved_rollup_key", None)
+    if not created and old_key is not None and old_key != new_key:
+        rollups.order_moved(instance, *old_key)
+    instance._saved_rollup_key = new_key
+
+
+@receiver(post_save, sender=Order)
+def order_workload_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not {"status", "master", "master_id", "completed_at"} & set(update_fields):
+        return
+    workload.order_saved(instance, created)
+
+
+@receiver(post_save, sender=Order)
+def order_event(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields and not {
+        "status", "payment_status", "total_amount", "paid_amount", "master", "master_id"
+    } & set(update_fields):
+        return
+    events.order_saved(instance, created)
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    workload.order_deleted(instance)
+    order_id = instance.pk
+    transaction.on_commit(lambda: receipts.purge(order_id))
+
+
+@receiver(post_save, sender=OrderService)
+def order_service_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    workload.service_saved(instance, created)
+
+
+@receiver(post_save, sender=OrderService)
+def order_service_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    events.service_saved(instance, created)
+
+
+@receiver(post_delete, sender=OrderService)
+def order_service_deleted(sender, instance, **kwargs):
+    workload.service_deleted(instance)
+
+
+@receiver(post_save, sender=OrderPayment)
+def payment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    rollups.payment_saved(instance, created)
+
+
+@receiver(post_delete, sender=OrderPayment)
+def payment_deleted(sender, instance, **kwargs):
+    rollups.payment_deleted(instance)
+
+
+@receiver(post_save, sender=OrderPart)
+def order_part_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    stock.order_part_saved(instance, created)
+
+
+@receiver(post_delete, sender=OrderPart)
+def order_part_deleted(sender, instance, **kwargs):
+    stock.order_part_deleted(instance)
+
+
+@receiver(post_save, sender=OrderPhoto)
+def order_photo_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    photos.photo_saved(instance, created)
+
+
+@receiver(post_delete, sender=OrderPhoto)
+def order_photo_deleted(sender, instance, **kwargs):
+    photos.photo_deleted(instance)
+
+
+@receiver(post_save, sender=Part)
+def part_stock_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    stock.part_saved(instance, created)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Part)
+@receiver(post_delete, sender=Part)
+def catalog_changed(sender, raw=False, **kwargs):
+    if raw:
+        return
+    catalog.bump_version()
+
+
+@receiver(connection_created)
+def track_connection_queries(sender, connection, **kwargs):
+    instrumentation.track_queries(connection)
@@ -0,0 +1,207 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .catalog import bump_version
+from .db import write_atomic
+from .models import OrderPart, Part, StockMovement, StockMovementKind
+
+
+# Faol ``batch()`` ichida yig'ilayotgan harakatlar (aks holda None)
+_pending: ContextVar = ContextVar("stock_pending", default=None)
+
+
+class InsufficientStock(Exception):
+    def __init__(self, part, requested: int, available: int):
+        self.part = part
+        self.requested = requested
+        self.available = available
+        super().__init__(
+            f"{part}: omborda yetarli emas (mavjud: {available}, kerak: {requested})"
+        )
+
+
+def apply_movements(movements) -> None:
+    """
+    Harakatlarni jurnalga yozib, qoldiqlarni bitta tranzaksiyada yangilash.
+
+    Zapchast qatorlari ``select_for_update`` bilan pk tartibida qulflanadi
+    (parallel tahrirlarda deadlock bo'lmasligi uchun), qoldiq manfiy bo'lsa
+    ``InsufficientStock`` ko'tariladi va hech narsa yozilmaydi. Katalog
+    versiyasi oshmaydi - katalog API qoldiqni ``catalog.stock_state`` bo'yicha
+    versiyalaydi.
+    """
+    movements = [m for m in movements if m.quantity]
+    if not movements:
+        return
+    deltas = defaultdict(int)
+    for movement in movements:
+        deltas[movement.part_id] += movement.quantity
+
+    with write_atomic():
+        parts = {
+            part.pk: part
+            for part in Part.objects.select_for_update()
+            .filter(pk__in=deltas)
+            .order_by("pk")
+            .only("pk", "name", "article", "stock_quantity")
+        }
+        for part_id, delta in deltas.items():
+            part = parts[part_id]
+            if part.stock_quantity + delta < 0:
+                raise InsufficientStock(part, -delta, part.stock_quantity)
+
+        StockMovement.objects.bulk_create(movements)
+        changed = {part_id: delta for part_id, delta in deltas.items() if delta}
+        if changed:
+            # Barcha qoldiqlar bitta UPDATE ... CASE bilan
+            Part.objects.filter(pk__in=changed).update(
+                stock_quantity=F("stock_quantity")
+                + Case(
+                    *(When(pk=part_id, then=Value(delta)) for part_id, delta in changed.items()),
+                    output_field=IntegerField(),
+                )
+            )
+
+
+def _submit(movements) -> None:
+    pending = _pending.get()
+    if pending is not None:
+        pending.extend(movements)
+    else:
+        apply_movements(movements)
+
+
+@contextmanager
+def batch():
+    """
+    Bitta buyurtma saqlanishidagi barcha harakatlarni yig'ib, oxirida bitta
+    tranzaksiyada qo'llash. Ichma-ich chaqirilsa tashqi ``batch`` ishlatiladi.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+    pending = []
+    token = _pending.set(pending)
+    try:
+        with write_atomic():
+            yield
+            apply_movements(pending)
+    finally:
+        _pending.reset(token)
+
+
+def order_part_saved(item, created: bool) -> None:
+    """Qator yaratilganda band qilish, miqdor yoki zapchast o'zgarganda farqni qo'llash."""
+    old = None if created else getattr(item, "_saved_stock_key", None)
+    if old is None and not created:
+        old = (
+            OrderPart.objects.filter(pk=item.pk)
+            .values_list("order_id", "part_id", "quantity")
+            .first()
+        )
+    movements = []
+    old_part_id, old_quantity = (old[1], old[2]) if old else (None, 0)
+    if old_part_id is not None and old_part_id != item.part_id:
+        movements.append(
+            StockMovement(
+                part_id=old_part_id,
+                order_id=item.order_id,
+                order_part_id=item.pk,
+                kind=StockMovementKind.RELEASE,
+                quantity=old_quantity,
+            )
+        )
+        old_quantity = 0
+    diff = item.quantity - old_quantity
+    if diff:
+        movements.append(
+            StockMovement(
+                part_id=item.part_id,
+                order_id=item.order_id,
+                order_part_id=item.pk,
+                kind=StockMovementKind.RESERVE if diff > 0 else StockMovementKind.RELEASE,
+                quantity=-diff,
+            )
+        )
+    _submit(movements)
+    item._saved_stock_key = (item.order_id, item.part_id, item.quantity)
+
+
+def order_part_deleted(item) -> None:
+    old = getattr(item, "_saved_stock_key", None)
+    order_id, part_id, quantity = old or (item.order_id, item.part_id, item.quantity)
+    # Buyurtma ham o'chirilayotgan bo'lishi mumkin, shuning uchun FK emas, izoh
+    _submit(
+        [
+            StockMovement(
+                part_id=part_id,
+                kind=StockMovementKind.RELEASE,
+                quantity=quantity,
+                note=f"Order #{order_id}",
+            )
+        ]
+    )
+
+
+def part_saved(part, created: bool) -> None:
+    """Yangi zapchast - boshlang'ich qoldiq, tahrirda - farq bo'yicha tuzatish."""
+    if created:
+        if part.stock_quantity:
+            # Qoldiq allaqachon yozilgan, faqat jurnalga qayd qilinadi
+            StockMovement.objects.create(
+                part=part, kind=StockMovementKind.OPENING, quantity=part.stock_quantity
+            )
+        part._saved_stock = part.stock_quantity
+        return
+    saved = getattr(part, "_saved_stock", None)
+    if saved is None or part.stock_quantity == saved:
+        return
+    # Part.save qoldiqni yozmagan
+    apply_movements(
+        [
+            StockMovement(
+                part_id=part.pk,
+                kind=StockMovementKind.ADJUSTMENT,
+                quantity=part.stock_quantity - saved,
+            )
+        ]
+    )
+    part.stock_quantity = (
+        Part.objects.filter(pk=part.pk).values_list("stock_quantity", flat=True).get()
+    )
+    part._saved_stock = part.stock_quantity
+
+
+def ledger_balances():
+    """Jurnal bo'yicha qoldiq subquery'si (``Part`` uchun)."""
+    return Coalesce(
+        Subquery(
+            StockMovement.objects.filter(part=OuterRef("pk"))
+            .values("part")
+            .annotate(total=Sum("quantity"))
+            .values("total")[:1],
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def rebuild_balances() -> int:
+    """Jurnaldan farq qiladigan qoldiqlarni tuzatish; tuzatilgan zapchastlar soni."""
+    with write_atomic():
+        drifted = list(
+            Part.objects.select_for_update()
+            .annotate(ledger=ledger_balances())
+            .exclude(stock_quantity=F("ledger"))
+            .values_list("pk", "ledger")
+        )
+        for part_id, ledger in drifted:
+            Part.objects.filter(pk=part_id).update(stock_quantity=max(ledger, 0))
+        if drifted:
+            transaction.on_commit(bump_version)
+    return len(drifted)
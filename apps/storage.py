@@ -0,0 +1,53 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Fayl mazmuni bo'yicha saqlash: ``<upload_to>/ab/cd/<sha256><ext>``.
+
+    Yuklash bo'laklab o'qilib, shu paytning o'zida xeshlanadi va vaqtinchalik
+    faylga yoziladi; shu xeshli fayl allaqachon bo'lsa, yangisi tashlanadi.
+    Asl fayl nomi faqat kengaytma uchun ishlatiladi.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Yakuniy nom _save da xeshdan olinadi
+        return name
+
+    def _save(self, name, content):
+        directory = posixpath.dirname(name)
+        ext = posixpath.splitext(name)[1].lower()
+        incoming = self.path(posixpath.join(directory, ".incoming"))
+        os.makedirs(incoming, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+            hexdigest = digest.hexdigest()
+            final = posixpath.join(directory, hexdigest[:2], hexdigest[2:4], hexdigest + ext)
+            full_path = self.path(final)
+            if os.path.exists(full_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(tmp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return final
+
+
+def photo_storage():
+    return ContentAddressedStorage()
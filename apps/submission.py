@@ -0,0 +1,222 @@
+from dataclasses import dataclass
+
+from django.db.models import F
+
+from . import events, rollups, stock, workload
+from .forms import (
+    OrderForm,
+    OrderPartFormSet,
+    OrderPaymentFormSet,
+    OrderPhotoFormSet,
+    OrderServiceFormSet,
+)
+from .db import write_atomic
+from .models import Order, OrderPart, OrderPayment, OrderService
+
+
+# bulk_update da yangilanadigan maydonlar (formalardagi maydonlar bilan bir xil)
+SERVICE_FIELDS = ["service", "status", "price", "discount"]
+PART_FIELDS = ["part", "quantity", "price", "discount"]
+PAYMENT_FIELDS = ["amount", "payment_type", "note"]
+
+
+def _collect(formset, order, is_filled):
+    """
+    Formsetdan yangi, o'zgargan va o'chiriladigan obyektlarni ajratish.
+
+    ``save(commit=False)`` bazaga yozmaydi; bo'sh qo'shimcha qatorlar
+    ``is_filled`` bo'yicha tashlanadi.
+    """
+    formset.instance = order
+    formset.save(commit=False)
+    new = [obj for obj in formset.new_objects if is_filled(obj)]
+    changed = [obj for obj, _fields in formset.changed_objects]
+    deleted = [obj.pk for obj in formset.deleted_objects if obj.pk]
+    return new, changed, deleted
+
+
+def _persist(model, fields, new, changed, deleted) -> None:
+    if deleted:
+        # post_delete signallari (ombor, rollup) shu yerda ishlaydi
+        model.objects.filter(pk__in=deleted).delete()
+    if new:
+        model.objects.bulk_create(new)
+    if changed:
+        model.objects.bulk_update(changed, fields)
+
+
+def finalize_totals(order_id: int, version_fields=()) -> Order:
+    """
+    Summalar va to'lov holatini bitta o'qish va bitta UPDATE bilan hisoblash.
+
+    ``version_fields`` - shu UPDATE da oshiriladigan chek versiyalari.
+    """
+    order = Order.objects.select_for_update().with_totals().get(pk=order_id)
+    order.total_amount = order.services_sum + order.parts_sum
+    order.paid_amount = order.paid_sum
+    order.update_payment_state(save=False)
+    for field in version_fields:
+        setattr(order, field, getattr(order, field) + 1)
+    order.save(
+        update_fields=["total_amount", "paid_amount", "payment_status", "status", *version_fields]
+    )
+    return order
+
+
+def rebuild_totals() -> int:
+    """
+    Qatorlar va to'lovlardan farq qiladigan buyurtma summalarini (va to'lov
+    holatini) ``finalize_totals`` bilan tuzatish; tuzatilgan buyurtmalar soni.
+    """
+    drifted = list(
+        Order.objects.with_totals()
+        .exclude(
+            total_amount=F("services_sum") + F("parts_sum"),
+            paid_amount=F("paid_sum"),
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for order_id in drifted:
+        with write_atomic():
+            finalize_totals(order_id)
+    return len(drifted)
+
+
+def save_order(form, service_formset, part_formset, photo_formset, payment_formset) -> Order:
+    """
+    Tekshirilgan buyurtma formasi va formsetlarini saqlash.
+
+    Qatorlar ``bulk_create``/``bulk_update`` bilan yoziladi (qator bo'yicha
+    ``save()`` va summa farqlari o'rniga), ombor harakatlari bitta
+    ``stock.batch()`` da qo'llanadi, summalar oxirida bir marta hisoblanadi.
+    Hammasi bitta tranzaksiyada; ``stock.InsufficientStock`` da orqaga qaytadi.
+    """
+    with stock.batch():
+        order = form.save()
+
+        services = _collect(service_formset, order, lambda obj: obj.service_id)
+        parts = _collect(part_formset, order, lambda obj: obj.part_id)
+        payments = _collect(payment_formset, order, lambda obj: obj.amount is not None)
+
+        _persist(OrderService, SERVICE_FIELDS, *services)
+        new_services, changed_services, _deleted = services
+        workload.services_saved(order.master_id, new_services, changed_services)
+        events.services_saved(new_services, changed_services)
+
+        _persist(OrderPart, PART_FIELDS, *parts)
+        new_parts, changed_parts, _deleted = parts
+        for item in new_parts:
+            stock.order_part_saved(item, created=True)
+        for item in changed_parts:
+            stock.order_part_saved(item, created=False)
+
+        # Rollup to'lovlar yozilgandan keyin, buyurtma statusi o'zgarishidan oldin
+        _persist(OrderPayment, PAYMENT_FIELDS, *payments)
+        new_payments, changed_payments, _deleted = payments
+        rollups.payments_saved(order.pk, new_payments, changed_payments)
+
+        photo_formset.instance = order
+        photo_formset.save()
+
+        # bulk_* signal/save() chaqirmaydi - chek versiyalari shu yerda oshadi
+        version_fields = []
+        if any(any(group) for group in (*services, *parts)):
+            version_fields.append("lines_version")
+        if any(payments):
+            version_fields.append("payments_version")
+        return finalize_totals(order.pk, version_fields)
+
+
+@dataclass
+class OrderFormError:
+    """Bitta xato: bo'lim (``None`` - asosiy forma), qator raqami, maydon va matn."""
+
+    section: str | None
+    row: int | None
+    field: str | None
+    label: str
+    message: str
+
+    def __str__(self) -> str:
+        where = ""
+        if self.section:
+            where = self.section if self.row is None else f"{self.section} #{self.row}"
+        text = f"{self.label}: {self.message}" if self.label else self.message
+        if where:
+            return f"{where} - {text}" if self.label else f"{where}: {text}"
+        return text
+
+
+class OrderEditor:
+    """
+    Buyurtma yaratish/tahrirlash: ``OrderForm`` + to'rtta qator formseti.
+
+    Bo'sh qo'shimcha qatorlar formsetlarda bir marta aniqlanadi
+    (``BaseOrderLineFormSet``), har bir forma bir marta tekshiriladi,
+    xatolar ``OrderFormError`` ro'yxati sifatida qaytadi.
+    """
+
+    # (kontekst nomi, prefix, formset, xabarlardagi nom)
+    SECTIONS = (
+        ("service_formset", "services", OrderServiceFormSet, "Xizmat"),
+        ("part_formset", "parts", OrderPartFormSet, "Ehtiyot qism"),
+        ("photo_formset", "photos", OrderPhotoFormSet, "Foto"),
+        ("payment_formset", "payments", OrderPaymentFormSet, "To'lov"),
+    )
+
+    def __init__(self, data=None, files=None, instance=None, initial=None):
+        self.instance = instance
+        self.form = OrderForm(data, instance=instance, initial=initial)
+        self.formsets = {
+            name: formset_class(data, files, instance=instance, prefix=prefix)
+            for name, prefix, formset_class, _label in self.SECTIONS
+        }
+        self.extra_errors = []
+
+    def is_valid(self) -> bool:
+        # Hammasini tekshirish (birinchi xatoda to'xtamaslik) - barcha xatolar ko'rinsin
+        results = [self.form.is_valid()]
+        results.extend(formset.is_valid() for formset in self.formsets.values())
+        return all(results)
+
+    @staticmethod
+    def _form_errors(form, section, row):
+        for field, errors in form.errors.items():
+            if field in form.fields:
+                label = str(form.fields[field].label or field)
+            else:
+                # __all__ - umumiy xatolar
+                field, label = None, ""
+            for message in errors:
+                yield OrderFormError(section, row, field, label, message)
+
+    @property
+    def errors(self) -> list:
+        errors = list(self._form_errors(self.form, None, None))
+        for name, _prefix, _formset_class, section in self.SECTIONS:
+            formset = self.formsets[name]
+            if not formset.is_bound:
+                continue
+            for message in formset.non_form_errors():
+                errors.append(OrderFormError(section, None, None, "", message))
+            for index, form in enumerate(formset.forms):
+                errors.extend(self._form_errors(form, section, index + 1))
+        return errors + self.extra_errors
+
+    def save(self):
+        """Saqlash; omborda yetarli zapchast bo'lmasa ``None`` (xato ``errors`` da)."""
+        try:
+            return save_order(self.form, *self.formsets.values())
+        except stock.InsufficientStock as exc:
+            self.extra_errors.append(
+                OrderFormError("Ehtiyot qism", None, "quantity", "", str(exc))
+            )
+            return None
+
+    def context(self) -> dict:
+        context = {"form": self.form, **self.formsets}
+        if self.instance is not None and self.instance.pk:
+            context["order"] = self.instance
+        return context
+
@@ -1,3 +1,549 @@
-from django.test import TestCase
+import base64
+import json
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from .instrumentation import QueryBudgetExceeded
+from .models import (
+    Car,
+    Customer,
+    DailyRevenueRollup,
+    Master,
+    MediaBlob,
+    MasterDailyThroughput,
+    MasterWorkload,
+    Order,
+    OrderPart,
+    OrderPayment,
+    OrderPhoto,
+    OrderService,
+    OrderStatus,
+    Part,
+    PaymentStatus,
+    PaymentType,
+    PhotoStatus,
+    SearchKind,
+    Service,
+    ServiceStatus,
+)
+from .query_plans import explain_hot_queries
+from .search import matching_ids, search_filter
+from .rollups import rebuild_rollups
+from .stock import rebuild_balances
+from .submission import rebuild_totals
+from .workload import rebuild_workload
+
+
+def make_order(**fields) -> Order:
+    customer = Customer.objects.create(full_name="Ali Valiyev", phone="+998901234567")
+    car = Car.objects.create(
+        customer=customer, brand="Chevrolet", model="Malibu", plate_number="01A123BC"
+    )
+    return Order.objects.create(customer=customer, car=car, **fields)
+
+
+def cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+class KeysetCursorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+        cls.order = make_order()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        car = self.order.car
+        urls = [
+            reverse("apps:order_list"),
+            reverse("apps:car_list"),
+            reverse("apps:car_history", args=[car.pk]),
+            reverse("apps:customer_detail", args=[car.customer_id]),
+        ]
+        bad = [
+            cursor({"v": ["abc", "1"], "d": "next"}),
+            cursor({"v": [None, None], "d": "next"}),
+            cursor({"v": ["2025-01-01T00:00:00", "1"], "d": "sideways"}),
+            "not-base64!",
+        ]
+        for url in urls:
+            for value in bad:
+                with self.subTest(url=url, cursor=value):
+                    response = self.client.get(url, {"cursor": value})
+                    self.assertEqual(response.status_code, 200)
+
+
+class ReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+
+    def test_monthly_report_with_invalid_period_falls_back_to_current_month(self):
+        self.client.force_login(self.user)
+        today = date.today()
+        expected = f"monthly_report_{today.year}_{today.month}.csv"
+        for params in ({"month": 13}, {"month": 0}, {"month": "abc"}, {"year": 0}, {"year": 99999}):
+            with self.subTest(**params):
+                response = self.client.get(reverse("apps:monthly_report_csv"), params)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn(expected, response["Content-Disposition"])
+
+@override_settings(PERF_BUDGET_STRICT=True, RECEIPT_CACHE_DIR=tempfile.mkdtemp())
+class QueryBudgetTests(TestCase):
+    """``VIEW_BUDGETS`` dagi har bir ko'rinish o'z so'rovlar limitida."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+        cls.master = Master.objects.create(full_name="Usta Karim")
+        cls.service = Service.objects.create(name="Moy almashtirish", base_price=Decimal("150000"))
+        cls.part = Part.objects.create(
+            name="Moy filtri", article="MF-1", price=Decimal("40000"), stock_quantity=50
+        )
+        # Bir nechta buyurtma va qator - N+1 bo'lsa limitdan oshadi
+        cls.orders = []
+        for _ in range(3):
+            order = make_order(master=cls.master)
+            for _ in range(2):
+                OrderService.objects.create(order=order, service=cls.service, price=Decimal("150000"))
+                OrderPart.objects.create(order=order, part=cls.part, quantity=1, price=Decimal("40000"))
+            OrderPayment.objects.create(
+                order=order, amount=Decimal("50000"), payment_type=PaymentType.CASH
+            )
+            cls.orders.append(order)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def urls(self) -> dict:
+        order = self.orders[0]
+        return {
+            "apps:order_list": reverse("apps:order_list"),
+            "apps:order_detail": reverse("apps:order_detail", args=[order.pk]),
+            "apps:order_receipt": reverse("apps:order_receipt", args=[order.pk]),
+            "apps:order_receipt_pdf": reverse("apps:order_receipt_pdf", args=[order.pk]),
+            "apps:order_create": reverse("apps:order_create"),
+            "apps:order_update": reverse("apps:order_update", args=[order.pk]),
+            "apps:customer_list": reverse("apps:customer_list"),
+            "apps:customer_detail": reverse("apps:customer_detail", args=[order.customer_id]),
+            "apps:car_list": reverse("apps:car_list"),
+            "apps:car_history": reverse("apps:car_history", args=[order.car_id]),
+            "apps:service_list": reverse("apps:service_list"),
+            "apps:part_list": reverse("apps:part_list"),
+            "apps:api_catalog": reverse("apps:api_catalog"),
+            "apps:master_workload": reverse("apps:master_workload"),
+            "apps:api_master_workload": reverse("apps:api_master_workload"),
+            "apps:api_service_price": reverse("apps:api_service_price", args=[self.service.pk]),
+            "apps:api_part_price": reverse("apps:api_part_price", args=[self.part.pk]),
+            "apps:api_order_search": reverse("apps:api_order_search") + "?q=01A",
+            "apps:api_live_search": reverse("apps:api_live_search") + "?q=ali",
+            "apps:order_events": reverse("apps:order_events"),
+        }
+
+    def test_budgeted_views_stay_within_budget(self):
+        urls = self.urls()
+        budgeted = {name.split()[-1] for name in settings.VIEW_BUDGETS}
+        self.assertEqual(budgeted, set(urls), "VIEW_BUDGETS va test URL lari mos emas")
+        for name, url in urls.items():
+            with self.subTest(view=name):
+                # Ikkinchi so'rov - keshlar to'lgan holat ham tekshiriladi
+                for _ in range(2):
+                    response = self.client.get(url)
+                    self.assertLess(response.status_code, 400)
+
+    def test_order_list_reads_stored_totals(self):
+        self.client.get(reverse("apps:order_list"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("apps:order_list"))
+        self.assertContains(response, 'data-field="remaining"')
+        for query in queries.captured_queries:
+            for table in ("apps_orderservice", "apps_orderpart", "apps_orderpayment"):
+                self.assertNotIn(table, query["sql"])
+
+    @override_settings(VIEW_BUDGETS={"apps:order_list": {"queries": 1}})
+    def test_exceeding_budget_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse("apps:order_list"))
+
+
+class QueryPlanTests(TestCase):
+    """Asosiy so'rovlar (ro'yxat, hisobotlar, tarix) indeks bilan bajariladi."""
+
+    @classmethod
+    def setUpTestData(cls):
+        master = Master.objects.create(full_name="Usta Karim")
+        for _ in range(3):
+            make_order(master=master)
+
+    def test_hot_queries_use_an_index(self):
+        results = explain_hot_queries()
+        self.assertTrue(results)
+        for name, plan, problems in results:
+            with self.subTest(query=name):
+                self.assertEqual(problems, [], plan)
+
+
+class SearchIndexTests(TestCase):
+    """Qidiruv SQLite va PostgreSQL da bir xil natija beradi (registr, formatlar)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.order = make_order()
+
+    def search(self, **params):
+        return set(
+            Order.objects.filter(
+                pk__in=matching_ids(SearchKind.ORDER, search_filter(**params))
+            ).values_list("pk", flat=True)
+        )
+
+    def test_search_ignores_case_and_formatting(self):
+        for params in (
+            {"query": "ALI valiyev"},
+            {"query": "90 123"},
+            {"query": "01a 123"},
+            {"phone": "+998 (90) 123"},
+            {"plate": "01 a 123 bc"},
+        ):
+            with self.subTest(**params):
+                self.assertEqual(self.search(**params), {self.order.pk})
+        self.assertEqual(self.search(query="Karimov"), set())
+
+    @skipUnless(connection.vendor == "postgresql", "pg_trgm indekslari faqat PostgreSQL da")
+    def test_trigram_indexes_exist(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'apps_searchindex'"
+            )
+            indexes = {row[0] for row in cursor.fetchall()}
+        for column in ("name", "vehicle", "phone_digits", "plate"):
+            self.assertIn(f"apps_searchindex_{column}_trgm", indexes)
+
+
+def jpeg_with_gps(color) -> SimpleUploadedFile:
+    exif = Image.Exif()
+    exif[0x8825] = {1: "N", 2: (41.0, 18.0, 0.0)}  # GPSInfo
+    buffer = BytesIO()
+    Image.new("RGB", (1600, 1200), color).save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile("photo.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), PHOTO_PROCESSING_SYNC=True)
+class OrderPhotoTests(TestCase):
+    """Sahifada faqat EXIF siz nusxalar; rasm almashganda eski nusxalar tozalanadi."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+        cls.order = make_order()
+
+    def upload(self, color) -> OrderPhoto:
+        with self.captureOnCommitCallbacks(execute=True):
+            photo = OrderPhoto.objects.create(order=self.order, image=jpeg_with_gps(color))
+        return OrderPhoto.objects.get(pk=photo.pk)
+
+    def test_detail_links_to_stripped_medium_rendition(self):
+        photo = self.upload("red")
+        self.assertEqual(photo.processing_status, PhotoStatus.READY)
+        with photo.medium.open("rb") as fh, Image.open(fh) as medium:
+            self.assertFalse(medium.getexif())
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("apps:order_detail", args=[self.order.pk]))
+        self.assertContains(response, f'href="{photo.medium.url}"')
+        self.assertNotContains(response, photo.image.url)
+
+    def test_replaced_image_clears_derivatives_until_reprocessed(self):
+        photo = self.upload("red")
+        old_medium = photo.medium.name
+        photo.image = jpeg_with_gps("blue")
+        with self.captureOnCommitCallbacks() as callbacks:
+            photo.save()
+        stored = OrderPhoto.objects.get(pk=photo.pk)
+        self.assertEqual(stored.processing_status, PhotoStatus.PENDING)
+        self.assertEqual((stored.thumbnail.name, stored.medium.name), ("", ""))
+        self.assertEqual(stored.preview_url, "")
+
+        for callback in callbacks:
+            callback()
+        stored = OrderPhoto.objects.get(pk=photo.pk)
+        self.assertEqual(stored.processing_status, PhotoStatus.READY)
+        self.assertNotEqual(stored.medium.name, old_medium)
+
+    def test_dedupe_reconciles_blobs_in_place(self):
+        photo = self.upload("red")
+        self.upload("red")
+        blob = MediaBlob.objects.get(name=photo.image.name)
+        self.assertEqual(blob.ref_count, 2)
+        MediaBlob.objects.filter(pk=blob.pk).update(ref_count=5)
+        MediaBlob.objects.create(name="orders/photos/ab/cd/orphan.jpg", ref_count=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("dedupe_photos", stdout=StringIO())
+        # Yozuv o'chirilib qayta yaratilmaydi - faqat soni tuzatiladi
+        self.assertEqual(MediaBlob.objects.get().pk, blob.pk)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+
+
+def _snapshot(queryset, *fields):
+    # Inkremental yangilanishda nolga tushgan qatorlar qolishi mumkin - ular hisobga olinmaydi
+    return sorted((row for row in queryset.values_list(*fields) if row[-1]), key=str)
+
+
+class IncrementalTotalsTests(TestCase):
+    """
+    Qator/to'lov o'zgarishlari farq bo'yicha qo'llanadigan summalar, ombor
+    qoldiqlari, rollup va usta yuklamasi to'liq qayta hisoblash bilan bir xil.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", password="x")
+        cls.masters = [Master.objects.create(full_name=f"Usta {i}") for i in range(2)]
+        cls.services = [
+            Service.objects.create(name=f"Xizmat {i}", base_price=Decimal("100000") + i)
+            for i in range(3)
+        ]
+        cls.parts = [
+            Part.objects.create(
+                name=f"Zapchast {i}", article=f"Z-{i}", price=Decimal("25000.50"), stock_quantity=100
+            )
+            for i in range(3)
+        ]
+
+    def assertConsistent(self):
+        for order in Order.objects.with_totals():
+            with self.subTest(order=order.pk):
+                self.assertEqual(order.total_amount, order.services_sum + order.parts_sum)
+                self.assertEqual(order.paid_amount, order.paid_sum)
+
+        self.assertEqual(rebuild_totals(), 0)
+        self.assertEqual(rebuild_balances(), 0)
+        rollups = ("day", "payment_type", "status", "master_id", "amount")
+        workload = ("master_id", "metric", "status", "count")
+        throughput = ("day", "master_id", "completed_orders")
+        before = (
+            _snapshot(DailyRevenueRollup.objects, *rollups),
+            _snapshot(MasterWorkload.objects, *workload),
+            _snapshot(MasterDailyThroughput.objects, *throughput),
+        )
+        rebuild_rollups()
+        rebuild_workload()
+        after = (
+            _snapshot(DailyRevenueRollup.objects, *rollups),
+            _snapshot(MasterWorkload.objects, *workload),
+            _snapshot(MasterDailyThroughput.objects, *throughput),
+        )
+        self.assertEqual(before, after)
+
+    def test_line_and_payment_saves_match_full_rebuild(self):
+        order = make_order(master=self.masters[0])
+        other = make_order(master=self.masters[1])
+        service = OrderService.objects.create(
+            order=order, service=self.services[0], price=Decimal("100000"), discount=Decimal("12.5")
+        )
+        OrderService.objects.create(order=order, service=self.services[1], price=Decimal("100001"))
+        part = OrderPart.objects.create(
+            order=order, part=self.parts[0], quantity=3, price=Decimal("25000.50")
+        )
+        OrderPart.objects.create(order=other, part=self.parts[1], quantity=1, price=Decimal("25000.50"))
+        self.assertConsistent()
+
+        # Tahrirlash, boshqa buyurtmaga ko'chirish, o'chirish
+        service.price = Decimal("90000")
+        service.discount = Decimal("33.33")
+        service.save()
+        part.quantity = 5
+        part.part = self.parts[2]
+        part.save()
+        part.order = other
+        part.save()
+        OrderService.objects.filter(order=order).last().delete()
+        self.assertConsistent()
+
+        # Qisman to'lov, to'lovni tahrirlash va o'chirish
+        payment = OrderPayment.objects.create(
+            order=order, amount=Decimal("1000"), payment_type=PaymentType.CASH
+        )
+        payment.amount = Decimal("2500")
+        payment.payment_type = PaymentType.CARD
+        payment.save()
+        OrderPayment.objects.create(order=order, amount=Decimal("10"), payment_type=PaymentType.CASH)
+        payment.delete()
+        order.refresh_from_db()
+        self.assertEqual(order.payment_status, PaymentStatus.PARTIAL)
+        self.assertConsistent()
+
+        # To'liq to'lov: buyurtma yakunlanadi, xizmatlar "done" bo'ladi
+        order.refresh_from_db()
+        OrderPayment.objects.create(
+            order=order, amount=order.remaining_amount, payment_type=PaymentType.CASH
+        )
+        order.refresh_from_db()
+        self.assertEqual(order.status, OrderStatus.COMPLETED)
+        self.assertFalse(order.service_items.exclude(status=ServiceStatus.DONE).exists())
+        self.assertConsistent()
+
+        # Usta almashishi va buyurtmani o'chirish (ko'rinishlardagidek yangi o'qilgan obyekt)
+        other = Order.objects.get(pk=other.pk)
+        other.master = self.masters[0]
+        other.save()
+        Order.objects.get(pk=order.pk).delete()
+        self.assertConsistent()
+
+    def test_order_form_saves_match_full_rebuild(self):
+        self.client.force_login(self.user)
+        customer_order = make_order()
+        data = {
+            "customer": customer_order.customer_id,
+            "car": customer_order.car_id,
+            "master": self.masters[0].pk,
+            "description": "",
+            "status": OrderStatus.NEW,
+            "payment_status": PaymentStatus.UNPAID,
+            "payment_type": "",
+            "services-TOTAL_FORMS": 2,
+            "services-INITIAL_FORMS": 0,
+            "parts-TOTAL_FORMS": 2,
+            "parts-INITIAL_FORMS": 0,
+            "photos-TOTAL_FORMS": 0,
+            "photos-INITIAL_FORMS": 0,
+            "payments-TOTAL_FORMS": 1,
+            "payments-INITIAL_FORMS": 0,
+            "payments-0-amount": "5000.00",
+            "payments-0-payment_type": PaymentType.CASH,
+            "payments-0-note": "",
+        }
+        for i, service in enumerate(self.services[:2]):
+            data.update(
+                {
+                    f"services-{i}-service": service.pk,
+                    f"services-{i}-status": ServiceStatus.IN_PROGRESS,
+                    f"services-{i}-price": service.base_price,
+                    f"services-{i}-discount": "10",
+                }
+            )
+        for i, part in enumerate(self.parts[:2]):
+            data.update(
+                {
+                    f"parts-{i}-part": part.pk,
+                    f"parts-{i}-quantity": 2,
+                    f"parts-{i}-price": part.price,
+                    f"parts-{i}-discount": "0",
+                }
+            )
+        response = self.client.post(reverse("apps:order_create"), data)
+        self.assertEqual(response.status_code, 302)
+        order = Order.objects.latest("pk")
+        self.assertEqual(Part.objects.get(pk=self.parts[0].pk).stock_quantity, 98)
+        self.assertConsistent()
+
+        # Tahrirlash: zapchast o'chiriladi, miqdor va chegirma o'zgaradi, to'lov qo'shiladi
+        services = list(order.service_items.order_by("pk"))
+        parts = list(order.part_items.order_by("pk"))
+        payment = order.payments.get()
+        data.update(
+            {
+                "master": self.masters[1].pk,
+                "services-INITIAL_FORMS": 2,
+                "parts-INITIAL_FORMS": 2,
+                "payments-TOTAL_FORMS": 2,
+                "payments-INITIAL_FORMS": 1,
+                "payments-0-id": payment.pk,
+                "payments-0-amount": "7000.00",
+                "payments-1-amount": "100.00",
+                "payments-1-payment_type": PaymentType.CARD,
+                "payments-1-note": "",
+                "services-0-discount": "0",
+                "parts-0-DELETE": "on",
+                "parts-1-quantity": 4,
+            }
+        )
+        for i, item in enumerate(services):
+            data[f"services-{i}-id"] = item.pk
+        for i, item in enumerate(parts):
+            data[f"parts-{i}-id"] = item.pk
+        response = self.client.post(reverse("apps:order_update", args=[order.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Part.objects.get(pk=self.parts[0].pk).stock_quantity, 100)
+        self.assertEqual(Part.objects.get(pk=self.parts[1].pk).stock_quantity, 96)
+        self.assertConsistent()
+
+    def test_payment_rollups_cost_does_not_grow_with_payments(self):
+        self.client.force_login(self.user)
+        customer_order = make_order()
+
+        def create_order(payments):
+            data = {
+                "customer": customer_order.customer_id,
+                "car": customer_order.car_id,
+                "master": self.masters[0].pk,
+                "description": "",
+                "status": OrderStatus.NEW,
+                "payment_status": PaymentStatus.UNPAID,
+                "payment_type": "",
+                "services-TOTAL_FORMS": 1,
+                "services-INITIAL_FORMS": 0,
+                "services-0-service": self.services[0].pk,
+                "services-0-status": ServiceStatus.IN_PROGRESS,
+                "services-0-price": "100000",
+                "services-0-discount": "0",
+                "parts-TOTAL_FORMS": 0,
+                "parts-INITIAL_FORMS": 0,
+                "photos-TOTAL_FORMS": 0,
+                "photos-INITIAL_FORMS": 0,
+                "payments-TOTAL_FORMS": payments,
+                "payments-INITIAL_FORMS": 0,
+            }
+            for i in range(payments):
+                data[f"payments-{i}-amount"] = "10.00"
+                data[f"payments-{i}-payment_type"] = (PaymentType.CASH, PaymentType.CARD)[i % 2]
+                data[f"payments-{i}-note"] = ""
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(reverse("apps:order_create"), data)
+            self.assertEqual(response.status_code, 302)
+            return len(queries)
+
+        create_order(2)  # Birinchi so'rovdagi bir martalik o'qishlar
+        self.assertEqual(create_order(2), create_order(6))
+        self.assertConsistent()
+
+    def test_rebuild_totals_repairs_bulk_deletes(self):
+        order = make_order()
+        OrderService.objects.create(order=order, service=self.services[0], price=Decimal("100000"))
+        OrderPayment.objects.create(order=order, amount=Decimal("100000"), payment_type=PaymentType.CASH)
+        # QuerySet.delete() OrderTotalsMixin.delete ni chetlab o'tadi
+        OrderPayment.objects.filter(order=order).delete()
+        order.refresh_from_db()
+        self.assertEqual(order.paid_amount, Decimal("100000"))
+
+        self.assertEqual(rebuild_totals(), 1)
+        order.refresh_from_db()
+        self.assertEqual(order.paid_amount, Decimal("0"))
+        self.assertEqual(order.payment_status, PaymentStatus.UNPAID)
+        self.assertConsistent()
+
+    def test_line_admins_have_no_bulk_delete(self):
+        request = RequestFactory().get("/admin/")
+        request.user = self.user
+        for model in (OrderService, OrderPart, OrderPayment):
+            with self.subTest(model=model.__name__):
+                actions = admin.site.get_model_admin(model).get_actions(request)
+                self.assertNotIn("delete_selected", actions)
@@ -6,19 +6,33 @@ from .views.orders import (
     order_create,
     order_update,
     order_receipt,
+    order_receipt_pdf,
     daily_report_csv,
     monthly_report_csv,
     api_service_price,
     api_part_price,
+    api_catalog,
+    api_order_search,
 )
 from .views.customers import (
     customer_list,
     customer_create,
     customer_update,
     customer_detail,
+    api_customer_search,
 )
-from .views.cars import car_list, car_create, car_update, car_history
-from .views.masters import master_list, master_create, master_update, master_workload
+from .views.cars import car_list, car_create, car_update, car_history, api_car_search
+from .views.masters import (
+    master_list,
+    master_create,
+    master_update,
+    master_workload,
+    api_master_workload,
+)
+from .views.events import order_events
+from .views.metrics import perf_stats
+from .views.reports import revenue_report
+from .views.search import api_live_search
 from .views.services import (
     service_list,
     service_create,
@@ -36,6 +50,8 @@ urlpatterns = [
     path("order/new/", order_create, name="order_create"),
     path("order/<int:pk>/edit/", order_update, name="order_update"),
     path("order/<int:pk>/receipt/", order_receipt, name="order_receipt"),
+    path("order/<int:pk>/receipt.pdf", order_receipt_pdf, name="order_receipt_pdf"),
+    path("orders/events/", order_events, name="order_events"),
     path("customers/", customer_list, name="customer_list"),
     path("customer/new/", customer_create, name="customer_create"),
     path("customer/<int:pk>/edit/", customer_update, name="customer_update"),
@@ -56,6 +72,14 @@ urlpatterns = [
     path("parts/<int:pk>/edit/", part_update, name="part_update"),
     path("reports/daily.csv", daily_report_csv, name="daily_report_csv"),
     path("reports/monthly.csv", monthly_report_csv, name="monthly_report_csv"),
+    path("reports/revenue/", revenue_report, name="revenue_report"),
     path("api/service/<int:service_id>/price/", api_service_price, name="api_service_price"),
     path("api/part/<int:part_id>/price/", api_part_price, name="api_part_price"),
+    path("api/catalog/", api_catalog, name="api_catalog"),
+    path("api/masters/workload/", api_master_workload, name="api_master_workload"),
+    path("debug/perf/", perf_stats, name="perf_stats"),
+    path("api/customers/search/", api_customer_search, name="api_customer_search"),
+    path("api/cars/search/", api_car_search, name="api_car_search"),
+    path("api/orders/search/", api_order_search, name="api_order_search"),
+    path("api/search/", api_live_search, name="api_live_search"),
 ]
\ No newline at end of file
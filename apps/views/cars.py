@@ -1,26 +1,28 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from ..forms import CarForm
-from ..models import Car
+from ..models import Car, SearchKind
+from ..pagination import KeysetPaginator
+from ..replicas import read_replica
+from ..search import matching_ids, search_filter
 
 
 @login_required
 def car_list(request):
     """Mashinalar ro'yxati: raqam, brand/model, mijoz bo'yicha qidiruv."""
-    qs = Car.objects.select_related("customer").all().order_by("plate_number")
+    qs = Car.objects.select_related("customer").all()
     q = request.GET.get("q")
     if q:
         qs = qs.filter(
-            Q(plate_number__icontains=q)
-            | Q(brand__icontains=q)
-            | Q(model__icontains=q)
-            | Q(customer__full_name__icontains=q)
-            | Q(customer__phone__icontains=q)
+            pk__in=matching_ids(SearchKind.CAR, search_filter(query=q, vehicle=True))
         )
-    context = {"cars": qs, "q": q or ""}
+    page = KeysetPaginator(qs, per_page=50, ordering=("plate_number", "id")).page(
+        request
+    )
+    context = {"cars": page.object_list, "page": page, "q": q or ""}
     return render(request, "cars/car_list.jinja", context)
 
 
@@ -64,13 +66,29 @@ def car_update(request, pk: int):
 
 
 @login_required
+@read_replica
 def car_history(request, pk: int):
-    car = get_object_or_404(Car, pk=pk)
+    car = get_object_or_404(Car.objects.select_related("customer"), pk=pk)
     orders = car.orders.select_related("customer", "master").all()
+    page = KeysetPaginator(orders, per_page=50).page(request)
     return render(
         request,
         "cars/car_history.jinja",
-        {"car": car, "orders": orders},
+        {"car": car, "orders": page.object_list, "page": page},
     )
 
 
+@login_required
+def api_car_search(request):
+    """Autocomplete uchun mashinalarni qidirish; ``customer`` berilsa shu mijozniki."""
+    q = request.GET.get("q", "").strip()
+    customer_id = request.GET.get("customer", "").strip()
+    qs = Car.objects.order_by("plate_number")
+    if customer_id.isdigit():
+        qs = qs.filter(customer_id=int(customer_id))
+    if q:
+        qs = qs.filter(
+            pk__in=matching_ids(SearchKind.CAR, search_filter(query=q, vehicle=True))
+        )
+    results = [{"id": car.pk, "text": str(car)} for car in qs[:20]]
+    return JsonResponse({"results": results})
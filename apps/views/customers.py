@@ -1,10 +1,13 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from ..forms import CustomerForm
-from ..models import Customer
+from ..models import Customer, SearchKind
+from ..pagination import KeysetPaginator
+from ..replicas import read_replica
+from ..search import matching_ids, search_filter
 
 
 @login_required
@@ -14,9 +17,7 @@ def customer_list(request):
     q = request.GET.get("q")
     if q:
         qs = qs.filter(
-            Q(full_name__icontains=q)
-            | Q(phone__icontains=q)
-            | Q(telegram_username__icontains=q)
+            pk__in=matching_ids(SearchKind.CUSTOMER, search_filter(query=q))
         )
     context = {"customers": qs, "q": q or ""}
     return render(request, "customers/customer_list.jinja", context)
@@ -58,13 +59,26 @@ def customer_update(request, pk: int):
 
 
 @login_required
+@read_replica
 def customer_detail(request, pk: int):
     customer = get_object_or_404(Customer, pk=pk)
     orders = customer.orders.select_related("car").all()
+    page = KeysetPaginator(orders, per_page=50).page(request)
     return render(
         request,
         "customers/customer_detail.jinja",
-        {"customer": customer, "orders": orders},
+        {"customer": customer, "orders": page.object_list, "page": page},
     )
 
 
+@login_required
+def api_customer_search(request):
+    """Autocomplete uchun mijozlarni qidirish (ism, telefon, telegram)."""
+    q = request.GET.get("q", "").strip()
+    qs = Customer.objects.order_by("full_name")
+    if q:
+        qs = qs.filter(
+            pk__in=matching_ids(SearchKind.CUSTOMER, search_filter(query=q))
+        )
+    results = [{"id": c.pk, "text": str(c)} for c in qs[:20]]
+    return JsonResponse({"results": results})
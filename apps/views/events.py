@@ -0,0 +1,60 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+
+from ..events import TooManySubscribers, get_broker
+
+
+def _format(event: dict) -> str:
+    lines = []
+    if "id" in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _stream(subscription):
+    heartbeat = getattr(settings, "ORDER_EVENTS_HEARTBEAT", 15)
+    try:
+        # Uzilsa brauzer 3 soniyadan keyin Last-Event-ID bilan qayta ulanadi
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscription.get(heartbeat)
+            except TimeoutError:
+                # Proksilar ulanishni yopmasligi va uzilish aniqlanishi uchun
+                yield ": ping\n\n"
+                continue
+            yield _format(event)
+    finally:
+        get_broker().unsubscribe(subscription)
+
+
+@login_required
+async def order_events(request):
+    """
+    Buyurtmalar o'zgarishlari oqimi (Server-Sent Events): yangi buyurtma,
+    status, to'lov va xizmat holati. Hodisalar saqlash paytida yuboriladi
+    (``apps.events``) - ochiq ekranlar bazaga so'rov yubormaydi.
+
+    Faqat ASGI da ishlaydi (``config.asgi``); WSGI da 204 - brauzer qayta
+    ulanmaydi va sahifa oddiy ro'yxat bo'lib qoladi.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    last_id = request.headers.get("Last-Event-ID", "")
+    try:
+        subscription = get_broker().subscribe(int(last_id) if last_id.isdigit() else None)
+    except TooManySubscribers:
+        response = HttpResponse("Too many live clients", status=503, content_type="text/plain")
+        response["Retry-After"] = "30"
+        return response
+    response = StreamingHttpResponse(_stream(subscription), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # nginx javobni buferlamasligi uchun
+    response["X-Accel-Buffering"] = "no"
+    return response
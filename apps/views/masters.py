@@ -1,10 +1,12 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from ..forms import MasterForm
-from ..models import Master
+from ..models import Master, OrderStatus, ServiceStatus
+from ..replicas import read_replica
+from ..workload import workload_snapshot
 
 
 @login_required
@@ -48,16 +50,82 @@ def master_update(request, pk: int):
     )
 
 
+WORKLOAD_WINDOWS = (1, 7, 30)
+
+
+def _window(request) -> int:
+    try:
+        days = int(request.GET.get("days", 7))
+    except ValueError:
+        days = 7
+    return min(max(days, 1), 365)
+
+
+def _least_loaded(masters, loads):
+    """Yangi ish uchun tavsiya: ochiq buyurtma, keyin faol xizmatlar eng kam usta."""
+    if not masters:
+        return None
+    return min(
+        masters,
+        key=lambda m: (loads[m.pk]["open_orders"], loads[m.pk]["active_services"], m.full_name),
+    )
+
+
 @login_required
+@read_replica
 def master_workload(request):
     """
-    Har bir usta bo'yicha buyurtmalar soni.
+    Ustalar yuklamasi: ochiq buyurtmalar va xizmatlar status bo'yicha,
+    tanlangan davrdagi yakunlangan buyurtmalar va tushum.
+
+    Hisoblagich jadvallaridan o'qiladi (``apps.workload``) - buyurtmalar
+    jadvali skanerlanmaydi.
     """
-    masters = Master.objects.annotate(total_orders=Count("orders")).all()
+    days = _window(request)
+    masters = list(Master.objects.order_by("full_name"))
+    loads = workload_snapshot([m.pk for m in masters], days)
+    for master in masters:
+        master.load = loads[master.pk]
+        master.order_counts = [master.load["orders"][s] for s, _label in OrderStatus.choices]
+        master.service_counts = [master.load["services"][s] for s, _label in ServiceStatus.choices]
+    unassigned = loads[None]
+    unassigned["order_counts"] = [unassigned["orders"][s] for s, _label in OrderStatus.choices]
+    unassigned["service_counts"] = [unassigned["services"][s] for s, _label in ServiceStatus.choices]
     return render(
         request,
         "masters/master_workload.jinja",
-        {"masters": masters},
+        {
+            "masters": masters,
+            "unassigned": unassigned,
+            "suggested": _least_loaded(masters, loads),
+            "days": days,
+            "windows": WORKLOAD_WINDOWS,
+            "order_statuses": OrderStatus.choices,
+            "service_statuses": ServiceStatus.choices,
+        },
     )
 
 
+def _load_payload(load) -> dict:
+    return {**load, "revenue": str(load["revenue"])}
+
+
+@login_required
+@read_replica
+def api_master_workload(request):
+    """Dispetcherlik uchun JSON: ``?days=N`` - unumdorlik davri (standart 7 kun)."""
+    days = _window(request)
+    masters = list(Master.objects.order_by("full_name").only("pk", "full_name"))
+    loads = workload_snapshot([m.pk for m in masters], days)
+    suggested = _least_loaded(masters, loads)
+    return JsonResponse(
+        {
+            "days": days,
+            "masters": [
+                {"id": m.pk, "name": m.full_name, **_load_payload(loads[m.pk])}
+                for m in masters
+            ],
+            "unassigned": _load_payload(loads[None]),
+            "suggested_master": suggested.pk if suggested else None,
+        }
+    )
@@ -0,0 +1,12 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+
+from ..instrumentation import stats
+
+
+@login_required
+def perf_stats(request):
+    """URL nomi bo'yicha latency/SQL p50/p95/p99 (faqat staff uchun)."""
+    if not request.user.is_staff:
+        return JsonResponse({"error": "forbidden"}, status=403)
+    return JsonResponse({"views": stats.summary()})
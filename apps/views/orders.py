@@ -1,44 +1,53 @@
-from datetime import datetime, date
-import csv
+from datetime import datetime, date, timedelta
+import hashlib
 
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Sum
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-
-from ..forms import (
-    OrderForm,
-    OrderServiceFormSet,
-    OrderPartFormSet,
-    OrderPhotoFormSet,
-    OrderPaymentFormSet,
+from django.urls import reverse
+from django.views.decorators.http import condition
+
+from ..catalog import (
+    aget_catalog,
+    catalog_payload,
+    parse_ids,
+    request_catalog_version,
+    request_stock_state,
+    version_key,
 )
-from ..models import Order, Service, Part, PaymentStatus
-
-
-@login_required
-def order_list(request):
+from ..fragments import detail_keys, set_row_keys
+from ..models import Order, Service, Part, PaymentStatus, SearchKind
+from ..pagination import KeysetPaginator
+from ..replicas import pin_primary, read_replica
+from ..receipts import receipt_html, receipt_key, receipt_pdf, request_receipt_order
+from ..reports import created_between, day_start, stream_order_report
+from ..rollups import resolve_period
+from ..search import matching_ids, search_filter
+from ..submission import OrderEditor
+
+
+def filter_orders(orders, params):
     """
-    Buyurtmalar ro'yxati:
-    - Telefon, mashina raqami, sana va status bo'yicha qidiruv/filtr
-    - Har bir buyurtma uchun rangli status
+    Buyurtmalar ro'yxati filtrlari: telefon, raqam, tezkor qidiruv, status va
+    sana oralig'i. ``(queryset, filtr qiymatlari)`` qaytaradi.
     """
-
-    orders = Order.objects.select_related("customer", "car", "master").order_by("-created_at")
-
-    phone = request.GET.get("phone", "").strip()
-    plate = request.GET.get("plate", "").strip()
-    status = request.GET.get("status", "").strip()
-    date_from = request.GET.get("date_from", "").strip()
-    date_to = request.GET.get("date_to", "").strip()
-    query = request.GET.get("q", "").strip()
-
-    if phone:
-        orders = orders.filter(customer__phone__icontains=phone)
-
-    if plate:
-        orders = orders.filter(car__plate_number__icontains=plate)
+    phone = params.get("phone", "").strip()
+    plate = params.get("plate", "").strip()
+    status = params.get("status", "").strip()
+    date_from = params.get("date_from", "").strip()
+    date_to = params.get("date_to", "").strip()
+    query = params.get("q", "").strip()
+
+    if phone or plate or query:
+        # Telefon/raqam/ism qidiruvi join'siz, SearchIndex jadvali orqali
+        orders = orders.filter(
+            pk__in=matching_ids(
+                SearchKind.ORDER,
+                search_filter(query=query, phone=phone, plate=plate),
+            )
+        )
 
     if status:
         orders = orders.filter(status=status)
@@ -46,38 +55,87 @@ def order_list(request):
     if date_from:
         try:
             df = datetime.strptime(date_from, "%Y-%m-%d").date()
-            orders = orders.filter(created_at__date__gte=df)
+            orders = orders.filter(created_at__gte=day_start(df))
         except ValueError:
             pass
 
     if date_to:
         try:
             dt = datetime.strptime(date_to, "%Y-%m-%d").date()
-            orders = orders.filter(created_at__date__lte=dt)
+            orders = orders.filter(created_at__lt=day_start(dt + timedelta(days=1)))
         except ValueError:
             pass
 
-    if query:
-        orders = orders.filter(
-            Q(customer__phone__icontains=query)
-            | Q(car__plate_number__icontains=query)
-            | Q(customer__full_name__icontains=query)
-        )
+    filters = {
+        "phone": phone,
+        "plate": plate,
+        "status": status,
+        "date_from": date_from,
+        "date_to": date_to,
+        "q": query,
+    }
+    return orders, filters
+
+
+def order_result(order) -> dict:
+    """Qidiruv natijasi uchun buyurtma (``customer`` va ``car`` oldindan yuklangan)."""
+    return {
+        "id": order.pk,
+        "url": reverse("apps:order_detail", args=[order.pk]),
+        "customer": order.customer.full_name,
+        "phone": order.customer.phone,
+        "plate": order.car.plate_number,
+        "status": order.get_status_display(),
+        "total": str(order.total_amount),
+        "created_at": order.created_at.isoformat(),
+    }
+
+
+@login_required
+@read_replica
+def order_list(request):
+    """
+    Buyurtmalar ro'yxati:
+    - Telefon, mashina raqami, sana va status bo'yicha qidiruv/filtr
+    - Har bir buyurtma uchun rangli status
+    - Keyset pagination (created_at, id) - filtrlar kursor URL'da saqlanadi
+    """
+
+    # Summalar Order da saqlanadi (qoldiq - ``remaining_amount``): qator
+    # bo'yicha subquery yo'q, keshdagi sahifa ham qo'shimcha SQL qilmaydi
+    orders, filters = filter_orders(
+        Order.objects.select_related("customer", "car", "master"),
+        request.GET,
+    )
+
+    page = KeysetPaginator(orders, per_page=50).page(request)
 
     context = {
-        "orders": orders,
-        "filter": {
-            "phone": phone,
-            "plate": plate,
-            "status": status,
-            "date_from": date_from,
-            "date_to": date_to,
-            "q": query,
-        },
+        # Qatorlar fragment keshidan (apps.fragments) - o'zgarmaganlari qayta chizilmaydi
+        "orders": set_row_keys(page.object_list),
+        "page": page,
+        "filter": filters,
     }
     return render(request, "orders/order_list.jinja", context)
 
 
+@login_required
+async def api_order_search(request):
+    """
+    Buyurtmalar qidiruvi (JSON): ``order_list`` filtrlari, eng yangi 20 ta.
+
+    Async ko'rinish - ASGI serverda so'rov oqim band qilmaydi.
+    """
+    orders, _filters = filter_orders(
+        Order.objects.select_related("customer", "car"), request.GET
+    )
+    results = [
+        order_result(order)
+        async for order in orders.order_by("-created_at", "-id")[:20]
+    ]
+    return JsonResponse({"results": results})
+
+
 @login_required
 def order_detail(request, pk: int):
     """
@@ -88,24 +146,18 @@ def order_detail(request, pk: int):
     - Oldin/Keyin fotolar
     """
     order = get_object_or_404(
-        Order.objects.select_related("customer", "car", "master").prefetch_related(
-            "service_items__service",
-            "part_items__part",
-            "photos",
-            "payments",
-        ),
+        Order.objects.select_related("customer", "car", "master")
+        .with_totals()
+        .prefetch_related("photos", "payments"),
         pk=pk,
     )
-    # Umumiy summani qayta hisoblash va to'lov holatini yangilash
-    order.recalculate_total(save=True)
-    order.update_payment_state(save=True)
-    # Ma'lumotlarni yangilash uchun qayta yuklash
-    order.refresh_from_db()
-
-    services = order.service_items.all()
-    parts = order.part_items.all()
-    photos_before = order.photos.filter(is_before=True)
-    photos_after = order.photos.filter(is_before=False)
+    # Summalar qatorlar/to'lovlar o'zgarganda saqlanadi - bu yerda faqat o'qish.
+    # Qatorlar lazy: jadvallar fragment keshida bo'lsa so'rov bajarilmaydi
+    services = order.service_items.select_related("service")
+    parts = order.part_items.select_related("part")
+    photos = order.photos.all()
+    photos_before = [p for p in photos if p.is_before]
+    photos_after = [p for p in photos if not p.is_before]
 
     context = {
         "order": order,
@@ -114,6 +166,7 @@ def order_detail(request, pk: int):
         "photos_before": photos_before,
         "photos_after": photos_after,
         "payments": order.payments.all(),
+        "fragment_keys": detail_keys(order),
     }
     return render(request, "orders/order_detail.jinja", context)
 
@@ -121,124 +174,14 @@ def order_detail(request, pk: int):
 @login_required
 def order_create(request):
     if request.method == "POST":
-        form = OrderForm(request.POST)
-        service_formset = OrderServiceFormSet(request.POST, prefix="services")
-        part_formset = OrderPartFormSet(request.POST, prefix="parts")
-        photo_formset = OrderPhotoFormSet(
-            request.POST, request.FILES, prefix="photos"
-        )
-        payment_formset = OrderPaymentFormSet(
-            request.POST, prefix="payments"
-        )
-        
-        # Bo'sh formlarni o'tkazib yuborish - faqat to'ldirilgan formlarni validate qilish
-        # Service formset uchun bo'sh formlarni o'tkazib yuborish
-        for service_form in service_formset.forms:
-            if service_form in service_formset.deleted_forms:
-                continue
-            service_value = service_form.data.get(service_form.add_prefix('service'), '')
-            if not service_value or service_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in service_form.fields:
-                    service_form.fields[field_name].required = False
-        
-        # Part formset uchun bo'sh formlarni o'tkazib yuborish
-        for part_form in part_formset.forms:
-            if part_form in part_formset.deleted_forms:
-                continue
-            part_value = part_form.data.get(part_form.add_prefix('part'), '')
-            if not part_value or part_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in part_form.fields:
-                    part_form.fields[field_name].required = False
-        
-        # Validation tekshiruvi
-        form_valid = form.is_valid()
-        service_formset_valid = service_formset.is_valid()
-        part_formset_valid = part_formset.is_valid()
-        photo_formset_valid = photo_formset.is_valid()
-        payment_formset_valid = payment_formset.is_valid()
-        
-        if (
-            form_valid
-            and service_formset_valid
-            and part_formset_valid
-            and photo_formset_valid
-            and payment_formset_valid
-        ):
-            order = form.save()
-            service_formset.instance = order
-            part_formset.instance = order
-            photo_formset.instance = order
-            payment_formset.instance = order
-            
-            # Faqat to'ldirilgan formlarni saqlash
-            service_formset.save(commit=False)
-            for service_form in service_formset.forms:
-                if service_form in service_formset.deleted_forms:
-                    if service_form.instance.pk:
-                        service_form.instance.delete()
-                elif service_form.cleaned_data.get('service'):
-                    service_form.save()
-            
-            part_formset.save(commit=False)
-            for part_form in part_formset.forms:
-                if part_form in part_formset.deleted_forms:
-                    if part_form.instance.pk:
-                        part_form.instance.delete()
-                elif part_form.cleaned_data.get('part'):
-                    part_form.save()
-            
-            photo_formset.save()
-            payment_formset.save()
-            order.recalculate_total(save=True)
-            order.update_payment_state(save=True)
+        editor = OrderEditor(request.POST, request.FILES)
+        order = editor.save() if editor.is_valid() else None
+        if order is not None:
+            pin_primary(request)
             messages.success(request, f"Buyurtma #{order.id} yaratildi.")
             return redirect("apps:order_detail", pk=order.pk)
-        else:
-            # Validation xatolarini ko'rsatish
-            if not form_valid:
-                for field, errors in form.errors.items():
-                    for error in errors:
-                        messages.error(request, f"{form.fields[field].label if field in form.fields else field}: {error}")
-            
-            if not service_formset_valid:
-                for idx, service_form in enumerate(service_formset.forms):
-                    if service_form.errors:
-                        for field, errors in service_form.errors.items():
-                            for error in errors:
-                                field_label = service_form.fields[field].label if field in service_form.fields else field
-                                messages.error(request, f"Xizmat #{idx + 1} - {field_label}: {error}")
-                    if service_form.non_field_errors():
-                        for error in service_form.non_field_errors():
-                            messages.error(request, f"Xizmat #{idx + 1}: {error}")
-            
-            if not part_formset_valid:
-                for idx, part_form in enumerate(part_formset.forms):
-                    if part_form.errors:
-                        for field, errors in part_form.errors.items():
-                            for error in errors:
-                                field_label = part_form.fields[field].label if field in part_form.fields else field
-                                messages.error(request, f"Ehtiyot qism #{idx + 1} - {field_label}: {error}")
-                    if part_form.non_field_errors():
-                        for error in part_form.non_field_errors():
-                            messages.error(request, f"Ehtiyot qism #{idx + 1}: {error}")
-            
-            if not photo_formset_valid:
-                for idx, photo_form in enumerate(photo_formset.forms):
-                    if photo_form.errors:
-                        for field, errors in photo_form.errors.items():
-                            for error in errors:
-                                field_label = photo_form.fields[field].label if field in photo_form.fields else field
-                                messages.error(request, f"Foto #{idx + 1} - {field_label}: {error}")
-            
-            if not payment_formset_valid:
-                for idx, payment_form in enumerate(payment_formset.forms):
-                    if payment_form.errors:
-                        for field, errors in payment_form.errors.items():
-                            for error in errors:
-                                field_label = payment_form.fields[field].label if field in payment_form.fields else field
-                                messages.error(request, f"To'lov #{idx + 1} - {field_label}: {error}")
+        for error in editor.errors:
+            messages.error(request, str(error))
     else:
         initial = {}
         customer_id = request.GET.get("customer")
@@ -247,20 +190,9 @@ def order_create(request):
             initial["customer"] = customer_id
         if car_id:
             initial["car"] = car_id
-        form = OrderForm(initial=initial)
-        service_formset = OrderServiceFormSet(prefix="services")
-        part_formset = OrderPartFormSet(prefix="parts")
-        photo_formset = OrderPhotoFormSet(prefix="photos")
-        payment_formset = OrderPaymentFormSet(prefix="payments")
+        editor = OrderEditor(initial=initial)
 
-    context = {
-        "form": form,
-        "service_formset": service_formset,
-        "part_formset": part_formset,
-        "photo_formset": photo_formset,
-        "payment_formset": payment_formset,
-    }
-    return render(request, "orders/order_form.jinja", context)
+    return render(request, "orders/order_form.jinja", editor.context())
 
 
 @login_required
@@ -273,140 +205,62 @@ def order_update(request, pk: int):
         return redirect("apps:order_detail", pk=order.pk)
     
     if request.method == "POST":
-        form = OrderForm(request.POST, instance=order)
-        service_formset = OrderServiceFormSet(
-            request.POST, instance=order, prefix="services"
-        )
-        part_formset = OrderPartFormSet(
-            request.POST, instance=order, prefix="parts"
-        )
-        photo_formset = OrderPhotoFormSet(
-            request.POST, request.FILES, instance=order, prefix="photos"
-        )
-        payment_formset = OrderPaymentFormSet(
-            request.POST, instance=order, prefix="payments"
-        )
-        
-        # Bo'sh formlarni o'tkazib yuborish - faqat to'ldirilgan formlarni validate qilish
-        # Service formset uchun bo'sh formlarni o'tkazib yuborish
-        for service_form in service_formset.forms:
-            if service_form in service_formset.deleted_forms:
-                continue
-            service_value = service_form.data.get(service_form.add_prefix('service'), '')
-            if not service_value or service_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in service_form.fields:
-                    service_form.fields[field_name].required = False
-        
-        # Part formset uchun bo'sh formlarni o'tkazib yuborish
-        for part_form in part_formset.forms:
-            if part_form in part_formset.deleted_forms:
-                continue
-            part_value = part_form.data.get(part_form.add_prefix('part'), '')
-            if not part_value or part_value == '':
-                # Bo'sh form - required fieldlarni o'chirish
-                for field_name in part_form.fields:
-                    part_form.fields[field_name].required = False
-        
-        # Validation tekshiruvi
-        form_valid = form.is_valid()
-        service_formset_valid = service_formset.is_valid()
-        part_formset_valid = part_formset.is_valid()
-        photo_formset_valid = photo_formset.is_valid()
-        payment_formset_valid = payment_formset.is_valid()
-        
-        if (
-            form_valid
-            and service_formset_valid
-            and part_formset_valid
-            and photo_formset_valid
-            and payment_formset_valid
-        ):
-            form.save()
-            service_formset.save()
-            part_formset.save()
-            photo_formset.save()
-            payment_formset.save()
-            order.recalculate_total(save=True)
-            order.update_payment_state(save=True)
-            messages.success(request, f"Buyurtma #{order.id} yangilandi.")
-            return redirect("apps:order_detail", pk=order.pk)
-        else:
-            # Validation xatolarini ko'rsatish
-            if not form_valid:
-                for field, errors in form.errors.items():
-                    for error in errors:
-                        messages.error(request, f"{form.fields[field].label if field in form.fields else field}: {error}")
-            
-            if not service_formset_valid:
-                for idx, service_form in enumerate(service_formset.forms):
-                    if service_form.errors:
-                        for field, errors in service_form.errors.items():
-                            for error in errors:
-                                field_label = service_form.fields[field].label if field in service_form.fields else field
-                                messages.error(request, f"Xizmat #{idx + 1} - {field_label}: {error}")
-                    if service_form.non_field_errors():
-                        for error in service_form.non_field_errors():
-                            messages.error(request, f"Xizmat #{idx + 1}: {error}")
-            
-            if not part_formset_valid:
-                for idx, part_form in enumerate(part_formset.forms):
-                    if part_form.errors:
-                        for field, errors in part_form.errors.items():
-                            for error in errors:
-                                field_label = part_form.fields[field].label if field in part_form.fields else field
-                                messages.error(request, f"Ehtiyot qism #{idx + 1} - {field_label}: {error}")
-                    if part_form.non_field_errors():
-                        for error in part_form.non_field_errors():
-                            messages.error(request, f"Ehtiyot qism #{idx + 1}: {error}")
-            
-            if not photo_formset_valid:
-                for idx, photo_form in enumerate(photo_formset.forms):
-                    if photo_form.errors:
-                        for field, errors in photo_form.errors.items():
-                            for error in errors:
-                                field_label = photo_form.fields[field].label if field in photo_form.fields else field
-                                messages.error(request, f"Foto #{idx + 1} - {field_label}: {error}")
-            
-            if not payment_formset_valid:
-                for idx, payment_form in enumerate(payment_formset.forms):
-                    if payment_form.errors:
-                        for field, errors in payment_form.errors.items():
-                            for error in errors:
-                                field_label = payment_form.fields[field].label if field in payment_form.fields else field
-                                messages.error(request, f"To'lov #{idx + 1} - {field_label}: {error}")
+        editor = OrderEditor(request.POST, request.FILES, instance=order)
+        saved = editor.save() if editor.is_valid() else None
+        if saved is not None:
+            pin_primary(request)
+            messages.success(request, f"Buyurtma #{saved.id} yangilandi.")
+            return redirect("apps:order_detail", pk=saved.pk)
+        for error in editor.errors:
+            messages.error(request, str(error))
     else:
-        form = OrderForm(instance=order)
-        service_formset = OrderServiceFormSet(instance=order, prefix="services")
-        part_formset = OrderPartFormSet(instance=order, prefix="parts")
-        photo_formset = OrderPhotoFormSet(instance=order, prefix="photos")
-        payment_formset = OrderPaymentFormSet(instance=order, prefix="payments")
+        editor = OrderEditor(instance=order)
 
-    context = {
-        "order": order,
-        "form": form,
-        "service_formset": service_formset,
-        "part_formset": part_formset,
-        "photo_formset": photo_formset,
-        "payment_formset": payment_formset,
-    }
-    return render(request, "orders/order_form.jinja", context)
+    return render(request, "orders/order_form.jinja", editor.context())
+
+
+def _receipt_etag(request, pk: int):
+    if get_messages(request):
+        # Sahifada bir martalik xabarlar bor - 304 ularni yo'qotib qo'yadi
+        return None
+    key = receipt_key(request_receipt_order(request, pk))
+    # Sahifa shabloni (menyu) foydalanuvchiga bog'liq
+    return f"receipt-{key}-{request.user.pk}"
+
+
+def _receipt_pdf_etag(request, pk: int):
+    return f"receipt-{receipt_key(request_receipt_order(request, pk))}"
 
 
 @login_required
+@condition(etag_func=_receipt_etag)
 def order_receipt(request, pk: int):
-    order = get_object_or_404(Order, pk=pk)
-    order.recalculate_total(save=True)
-    services = order.service_items.all()
-    parts = order.part_items.all()
-    return render(
+    """
+    Chek sahifasi. Chek tanasi buyurtma versiyasi bo'yicha diskda keshlanadi
+    (``apps.receipts``), o'zgarmagan chek uchun 304 qaytadi.
+    """
+    order = request_receipt_order(request, pk)
+    response = render(
         request,
         "orders/order_receipt.jinja",
-        {"order": order, "services": services, "parts": parts},
+        {"order": order, "receipt": receipt_html(order)},
     )
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@login_required
+@condition(etag_func=_receipt_pdf_etag)
+def order_receipt_pdf(request, pk: int):
+    order = request_receipt_order(request, pk)
+    response = HttpResponse(receipt_pdf(order), content_type="application/pdf")
+    response["Content-Disposition"] = f'inline; filename="chek-{order.pk}.pdf"'
+    response["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @login_required
+@read_replica
 def daily_report_csv(request):
     """
     Kunlik hisobotni CSV ko'rinishida chiqarish (Excel uchun).
@@ -420,91 +274,75 @@ def daily_report_csv(request):
     else:
         day = date.today()
 
-    orders = Order.objects.filter(created_at__date=day).select_related(
-        "customer", "car"
-    )
-    total = orders.aggregate(total=Sum("total_amount"))["total"] or 0
-
-    response = HttpResponse(content_type="text/csv")
-    response[
-        "Content-Disposition"
-    ] = f'attachment; filename="daily_report_{day.isoformat()}.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(
-        ["ID", "Sana", "Mijoz", "Telefon", "Mashina", "Status", "Umumiy summa"]
-    )
-    for o in orders:
-        writer.writerow(
-            [
-                o.id,
-                o.created_at.strftime("%Y-%m-%d %H:%M"),
-                o.customer.full_name,
-                o.customer.phone,
-                f"{o.car.plate_number} {o.car.brand} {o.car.model}",
-                o.get_status_display(),
-                float(o.total_amount),
-            ]
-        )
-    writer.writerow([])
-    writer.writerow(["Jami", "", "", "", "", "", float(total)])
-    return response
+    orders = Order.objects.filter(**created_between(day, day))
+    return stream_order_report(orders, f"daily_report_{day.isoformat()}.csv")
 
 
 @login_required
+@read_replica
 def monthly_report_csv(request):
     """
     Oylik hisobotni CSV ko'rinishida chiqarish (Excel uchun).
     """
-    year = int(request.GET.get("year", date.today().year))
-    month = int(request.GET.get("month", date.today().month))
-
-    orders = Order.objects.filter(
-        created_at__year=year, created_at__month=month
-    ).select_related("customer", "car")
-    total = orders.aggregate(total=Sum("total_amount"))["total"] or 0
-
-    response = HttpResponse(content_type="text/csv")
-    response[
-        "Content-Disposition"
-    ] = f'attachment; filename="monthly_report_{year}_{month}.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow(
-        ["ID", "Sana", "Mijoz", "Telefon", "Mashina", "Status", "Umumiy summa"]
-    )
-    for o in orders:
-        writer.writerow(
-            [
-                o.id,
-                o.created_at.strftime("%Y-%m-%d %H:%M"),
-                o.customer.full_name,
-                o.customer.phone,
-                f"{o.car.plate_number} {o.car.brand} {o.car.model}",
-                o.get_status_display(),
-                float(o.total_amount),
-            ]
-        )
-    writer.writerow([])
-    writer.writerow(["Jami", "", "", "", "", "", float(total)])
-    return response
+    today = date.today()
+    try:
+        year = int(request.GET.get("year", today.year))
+        month = int(request.GET.get("month", today.month))
+        first, last = resolve_period("month", date(year, month, 1))
+    except (ValueError, OverflowError):
+        # Noto'g'ri yil/oy - joriy oy (daily_report_csv dagidek)
+        year, month = today.year, today.month
+        first, last = resolve_period("month", date(year, month, 1))
+    orders = Order.objects.filter(**created_between(first, last))
+    return stream_order_report(orders, f"monthly_report_{year}_{month}.csv")
 
 
 @login_required
-def api_service_price(request, service_id: int):
+async def api_service_price(request, service_id: int):
     """API endpoint to get service price by ID"""
-    try:
-        service = get_object_or_404(Service, pk=service_id)
-        return JsonResponse({"price": str(service.base_price)})
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+    service = (await aget_catalog())["services_by_id"].get(service_id)
+    if service is None:
+        return JsonResponse({"error": "Service not found"}, status=404)
+    return JsonResponse({"price": str(service["base_price"])})
 
 
 @login_required
-def api_part_price(request, part_id: int):
+async def api_part_price(request, part_id: int):
     """API endpoint to get part price by ID"""
-    try:
-        part = get_object_or_404(Part, pk=part_id)
-        return JsonResponse({"price": str(part.price)})
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
\ No newline at end of file
+    part = (await aget_catalog())["parts_by_id"].get(part_id)
+    if part is None:
+        return JsonResponse({"error": "Part not found"}, status=404)
+    return JsonResponse({"price": str(part["price"])})
+
+
+def _catalog_etag(request):
+    version = version_key(request_catalog_version(request))
+    stock_id, _stock_at = request_stock_state(request)
+    ids = f"{request.GET.get('services', '*')}|{request.GET.get('parts', '*')}"
+    return f"catalog-{version}-s{stock_id}-{hashlib.md5(ids.encode()).hexdigest()[:8]}"
+
+
+def _catalog_last_modified(request):
+    updated_at = request_catalog_version(request).updated_at
+    _stock_id, stock_at = request_stock_state(request)
+    return max(updated_at, stock_at) if stock_at else updated_at
+
+
+@login_required
+@condition(etag_func=_catalog_etag, last_modified_func=_catalog_last_modified)
+def api_catalog(request):
+    """
+    Ko'p xizmat/zapchast narxlarini bitta so'rovda qaytarish.
+
+    ``?services=1,2&parts=3`` - faqat shu ID lar; parametrsiz - butun katalog.
+    ETag/Last-Modified katalog versiyasi va oxirgi ombor harakatidan olinadi
+    (o'zgarmasa 304).
+    """
+    service_ids = parse_ids(request.GET["services"]) if "services" in request.GET else None
+    part_ids = parse_ids(request.GET["parts"]) if "parts" in request.GET else None
+    version = request_catalog_version(request)
+    payload = catalog_payload(service_ids, part_ids, version=version_key(version))
+    payload["version"] = version.version
+    response = JsonResponse(payload)
+    response["Cache-Control"] = "private, no-cache"
+    return response
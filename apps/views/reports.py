@@ -0,0 +1,83 @@
+import csv
+from datetime import date, datetime
+
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse, JsonResponse
+
+from ..models import OrderStatus, PaymentType, money
+from ..rollups import REPORT_GROUPS, resolve_period, revenue_summary
+
+
+def _parse_date(value: str, default: date) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return default
+
+
+@login_required
+def revenue_report(request):
+    """
+    Ixtiyoriy oraliq uchun tushum hisoboti (DailyRevenueRollup dan).
+
+    Parametrlar:
+    - ``period``: ``week`` / ``month`` / ``quarter`` / ``year`` (``date`` atrofida)
+    - yoki ``date_from`` / ``date_to``
+    - ``group_by``: ``day`` / ``payment_type`` / ``status`` / ``master``
+    - ``format``: ``json`` (standart) yoki ``csv``
+    """
+    today = date.today()
+    period = request.GET.get("period", "").strip()
+    if period:
+        anchor = _parse_date(request.GET.get("date"), today)
+        date_from, date_to = resolve_period(period, anchor)
+    else:
+        date_from = _parse_date(request.GET.get("date_from"), today)
+        date_to = _parse_date(request.GET.get("date_to"), date_from)
+    if date_to < date_from:
+        date_from, date_to = date_to, date_from
+
+    group_by = request.GET.get("group_by", "day")
+    if group_by not in REPORT_GROUPS:
+        group_by = "day"
+    column, rows = revenue_summary(date_from, date_to, group_by)
+    labels = {
+        "payment_type": dict(PaymentType.choices),
+        "status": dict(OrderStatus.choices),
+    }.get(column, {})
+
+    total = money(sum((row["amount"] for row in rows), 0))
+    count = sum(row["count"] for row in rows)
+
+    if request.GET.get("format") == "csv":
+        response = HttpResponse(content_type="text/csv")
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="revenue_{date_from.isoformat()}_{date_to.isoformat()}.csv"'
+        writer = csv.writer(response)
+        writer.writerow([group_by, "To'lovlar soni", "Summa"])
+        for row in rows:
+            key = row[column]
+            writer.writerow([labels.get(key, key), row["count"], float(row["amount"])])
+        writer.writerow([])
+        writer.writerow(["Jami", count, float(total)])
+        return response
+
+    return JsonResponse(
+        {
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+            "group_by": group_by,
+            "total": str(total),
+            "count": count,
+            "rows": [
+                {
+                    group_by: str(row[column]) if row[column] is not None else None,
+                    "label": str(labels.get(row[column], row[column])),
+                    "count": row["count"],
+                    "amount": str(money(row["amount"])),
+                }
+                for row in rows
+            ],
+        }
+    )
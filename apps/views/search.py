@@ -0,0 +1,60 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.urls import reverse
+
+from ..models import Car, Customer, Order, SearchKind
+from ..search import matching_ids, search_filter
+from .orders import order_result
+
+
+LIVE_SEARCH_LIMIT = 5
+
+
+@login_required
+async def api_live_search(request):
+    """
+    Tezkor qidiruv (yozish davomida): ``?q=`` bo'yicha mijozlar, mashinalar va
+    buyurtmalar, har biridan eng ko'pi bilan 5 ta. 2 belgidan qisqa so'rov -
+    bo'sh natija.
+    """
+    q = request.GET.get("q", "").strip()
+    results = {"customers": [], "cars": [], "orders": []}
+    if len(q) < 2:
+        return JsonResponse(results)
+
+    customers = Customer.objects.filter(
+        pk__in=matching_ids(SearchKind.CUSTOMER, search_filter(query=q))
+    ).order_by("full_name")[:LIVE_SEARCH_LIMIT]
+    async for customer in customers:
+        results["customers"].append(
+            {
+                "id": customer.pk,
+                "url": reverse("apps:customer_detail", args=[customer.pk]),
+                "text": str(customer),
+            }
+        )
+
+    cars = (
+        Car.objects.filter(
+            pk__in=matching_ids(SearchKind.CAR, search_filter(query=q, vehicle=True))
+        )
+        .select_related("customer")
+        .order_by("plate_number")[:LIVE_SEARCH_LIMIT]
+    )
+    async for car in cars:
+        results["cars"].append(
+            {
+                "id": car.pk,
+                "url": reverse("apps:car_history", args=[car.pk]),
+                "text": f"{car} ({car.customer.full_name})",
+            }
+        )
+
+    orders = (
+        Order.objects.filter(pk__in=matching_ids(SearchKind.ORDER, search_filter(query=q)))
+        .select_related("customer", "car")
+        .order_by("-created_at", "-id")[:LIVE_SEARCH_LIMIT]
+    )
+    async for order in orders:
+        results["orders"].append(order_result(order))
+    return JsonResponse(results)
@@ -2,13 +2,14 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 
+from ..catalog import get_catalog
 from ..forms import ServiceForm, PartForm
 from ..models import Service, Part
 
 
 @login_required
 def service_list(request):
-    services = Service.objects.all().order_by("name")
+    services = get_catalog()["services"]
     return render(request, "services/service_list.jinja", {"services": services})
 
 
@@ -49,7 +50,7 @@ def service_update(request, pk: int):
 
 @login_required
 def part_list(request):
-    parts = Part.objects.all().order_by("name")
+    parts = get_catalog()["parts"]
     return render(request, "services/part_list.jinja", {"parts": parts})
 
 
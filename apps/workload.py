@@ -0,0 +1,246 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    DailyRevenueRollup,
+    MasterDailyThroughput,
+    MasterWorkload,
+    Order,
+    OrderService,
+    OrderStatus,
+    ServiceStatus,
+    WorkloadMetric,
+)
+
+
+def _bump(master_id, metric: str, status: str, delta: int) -> None:
+    if not delta:
+        return
+    key = {"master_id": master_id, "metric": metric, "status": status}
+    with transaction.atomic():
+        row = MasterWorkload.objects.select_for_update().filter(**key).only("pk").first()
+        if row is None:
+            MasterWorkload.objects.create(count=delta, **key)
+        else:
+            # master=None bo'lgan bir nechta qator bo'lishi mumkin, shuning uchun pk bo'yicha
+            MasterWorkload.objects.filter(pk=row.pk).update(count=F("count") + delta)
+
+
+def _bump_completed(completed_at, master_id, delta: int) -> None:
+    if completed_at is None or not delta:
+        return
+    key = {"day": timezone.localdate(completed_at), "master_id": master_id}
+    with transaction.atomic():
+        row = MasterDailyThroughput.objects.select_for_update().filter(**key).only("pk").first()
+        if row is None:
+            MasterDailyThroughput.objects.create(completed_orders=delta, **key)
+        else:
+            MasterDailyThroughput.objects.filter(pk=row.pk).update(
+                completed_orders=F("completed_orders") + delta
+            )
+
+
+def _order_services(order_id) -> Counter:
+    return Counter(
+        dict(
+            OrderService.objects.filter(order_id=order_id)
+            .order_by()
+            .values("status")
+            .annotate(n=Count("id"))
+            .values_list("status", "n")
+        )
+    )
+
+
+def order_saved(order, created: bool) -> None:
+    """Buyurtma yaratilganda/statusi yoki ustasi o'zgarganda hisoblagichlarni ko'chirish."""
+    new = (order.status, order.master_id, order.completed_at)
+    old = None if created else getattr(order, "_saved_workload_key", None)
+    if not created and old is None:
+        old = (
+            Order.objects.filter(pk=order.pk)
+            .values_list("status", "master_id", "completed_at")
+            .first()
+        )
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            old_status, old_master_id, old_completed_at = old
+            _bump(old_master_id, WorkloadMetric.ORDERS, old_status, -1)
+            _bump_completed(old_completed_at, old_master_id, -1)
+            if old_master_id != order.master_id:
+                # Xizmatlar ham yangi ustaga o'tadi
+                for status, n in _order_services(order.pk).items():
+                    _bump(old_master_id, WorkloadMetric.SERVICES, status, -n)
+                    _bump(order.master_id, WorkloadMetric.SERVICES, status, n)
+        _bump(order.master_id, WorkloadMetric.ORDERS, order.status, 1)
+        _bump_completed(order.completed_at, order.master_id, 1)
+    order._saved_workload_key = new
+
+
+def order_deleted(order) -> None:
+    # Xizmatlar kaskad bilan alohida o'chiriladi (service_deleted)
+    status, master_id, completed_at = getattr(
+        order, "_saved_workload_key", (order.status, order.master_id, order.completed_at)
+    )
+    with transaction.atomic():
+        _bump(master_id, WorkloadMetric.ORDERS, status, -1)
+        _bump_completed(completed_at, master_id, -1)
+
+
+def _order_master(order_id):
+    row = Order.objects.filter(pk=order_id).values_list("master_id").first()
+    return row[0] if row else None
+
+
+def services_saved(master_id, new=(), changed=()) -> None:
+    """
+    Bir buyurtmaning yangi va o'zgargan xizmat qatorlari (masalan ``bulk_*``
+    dan keyin): status bo'yicha farqlar bitta tranzaksiyada qo'llanadi.
+    """
+    deltas = Counter()
+    for item in new:
+        deltas[item.status] += 1
+        item._saved_workload_key = (item.order_id, item.status)
+    for item in changed:
+        old = getattr(item, "_saved_workload_key", None)
+        if old is not None:
+            deltas[old[1]] -= 1
+            deltas[item.status] += 1
+        item._saved_workload_key = (item.order_id, item.status)
+    with transaction.atomic():
+        for status, delta in deltas.items():
+            _bump(master_id, WorkloadMetric.SERVICES, status, delta)
+
+
+def services_moved(master_id, old_statuses, new_status: str) -> None:
+    """``update()`` bilan status o'zgartirilgan xizmatlar uchun."""
+    with transaction.atomic():
+        for status, n in Counter(old_statuses).items():
+            if status != new_status:
+                _bump(master_id, WorkloadMetric.SERVICES, status, -n)
+                _bump(master_id, WorkloadMetric.SERVICES, new_status, n)
+
+
+def service_saved(item, created: bool) -> None:
+    old = None if created else getattr(item, "_saved_workload_key", None)
+    if not created and old is None:
+        old = OrderService.objects.filter(pk=item.pk).values_list("order_id", "status").first()
+    new = (item.order_id, item.status)
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _bump(_order_master(old[0]), WorkloadMetric.SERVICES, old[1], -1)
+        _bump(_order_master(item.order_id), WorkloadMetric.SERVICES, item.status, 1)
+    item._saved_workload_key = new
+
+
+def service_deleted(item) -> None:
+    order_id, status = getattr(item, "_saved_workload_key", (item.order_id, item.status))
+    _bump(_order_master(order_id), WorkloadMetric.SERVICES, status, -1)
+
+
+def rebuild_workload() -> tuple[int, int]:
+    """Yuklama va kunlik unumdorlik jadvallarini buyurtmalardan qaytadan qurish."""
+    orders = (
+        Order.objects.order_by()
+        .values("master_id", "status")
+        .annotate(n=Count("id"))
+    )
+    services = (
+        OrderService.objects.order_by()
+        .values("order__master_id", "status")
+        .annotate(n=Count("id"))
+    )
+    completed = (
+        Order.objects.filter(completed_at__isnull=False)
+        .order_by()
+        .annotate(day=TruncDate("completed_at"))
+        .values("day", "master_id")
+        .annotate(n=Count("id"))
+    )
+    with transaction.atomic():
+        MasterWorkload.objects.all().delete()
+        MasterDailyThroughput.objects.all().delete()
+        rows = [
+            MasterWorkload(
+                master_id=g["master_id"], metric=WorkloadMetric.ORDERS, status=g["status"], count=g["n"]
+            )
+            for g in orders
+        ] + [
+            MasterWorkload(
+                master_id=g["order__master_id"],
+                metric=WorkloadMetric.SERVICES,
+                status=g["status"],
+                count=g["n"],
+            )
+            for g in services
+        ]
+        MasterWorkload.objects.bulk_create(rows, batch_size=1000)
+        days = [
+            MasterDailyThroughput(day=g["day"], master_id=g["master_id"], completed_orders=g["n"])
+            for g in completed.iterator()
+        ]
+        MasterDailyThroughput.objects.bulk_create(days, batch_size=1000)
+    return len(rows), len(days)
+
+
+def _empty_load() -> dict:
+    return {
+        "orders": {status: 0 for status in OrderStatus.values},
+        "services": {status: 0 for status in ServiceStatus.values},
+        "open_orders": 0,
+        "active_services": 0,
+        "completed": 0,
+        "revenue": 0,
+    }
+
+
+def workload_snapshot(master_ids, days: int = 7) -> dict:
+    """
+    Ustalar uchun joriy yuklama va oxirgi ``days`` kunlik unumdorlik.
+
+    Faqat hisoblagich jadvallari o'qiladi (3 ta so'rov) - buyurtmalar soniga
+    bog'liq emas. Kalit ``None`` - ustasi biriktirilmagan buyurtmalar.
+    """
+    since = timezone.localdate() - timedelta(days=days - 1)
+    loads = {pk: _empty_load() for pk in master_ids}
+    loads[None] = _empty_load()
+
+    for master_id, metric, status, count in MasterWorkload.objects.values_list(
+        "master_id", "metric", "status", "count"
+    ):
+        load = loads.setdefault(master_id, _empty_load())
+        load[metric][status] = load[metric].get(status, 0) + count
+    for master_id, completed in (
+        MasterDailyThroughput.objects.filter(day__gte=since)
+        .order_by()
+        .values("master_id")
+        .annotate(total=Sum("completed_orders"))
+        .values_list("master_id", "total")
+    ):
+        loads.setdefault(master_id, _empty_load())["completed"] = completed
+    for master_id, revenue in (
+        DailyRevenueRollup.objects.filter(day__gte=since)
+        .order_by()
+        .values("master_id")
+        .annotate(total=Sum("amount"))
+        .values_list("master_id", "total")
+    ):
+        loads.setdefault(master_id, _empty_load())["revenue"] = revenue
+
+    for load in loads.values():
+        load["open_orders"] = sum(
+            n for status, n in load["orders"].items() if status != OrderStatus.COMPLETED
+        )
+        load["active_services"] = sum(
+            n for status, n in load["services"].items() if status != ServiceStatus.DONE
+        )
+    return loads
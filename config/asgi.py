@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Sinxron ko'rinishlar har xil thread larda ishlaydi - doimiy ulanishlar o'chiq
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
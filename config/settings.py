@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,7 +57,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'apps.instrumentation.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -71,15 +73,197 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
+# Request metrics (apps.instrumentation)
+# URL nomi (yoki "METHOD url_nomi") -> {"queries": N, "ms": M}; oshib ketsa log yoziladi,
+# PERF_BUDGET_STRICT = True bo'lsa (testlarda) xatolik ko'tariladi.
+
+VIEW_BUDGETS = {
+    'apps:order_list': {'queries': 4},
+    'apps:order_detail': {'queries': 9},
+    'apps:order_receipt': {'queries': 5},
+    'apps:order_receipt_pdf': {'queries': 5},
+    'GET apps:order_create': {'queries': 8},
+    'GET apps:order_update': {'queries': 14},
+    'apps:customer_list': {'queries': 3},
+    'apps:customer_detail': {'queries': 4},
+    'apps:car_list': {'queries': 3},
+    'apps:car_history': {'queries': 4},
+    'apps:service_list': {'queries': 5},
+    'apps:part_list': {'queries': 5},
+    'apps:api_catalog': {'queries': 7},
+    'apps:master_workload': {'queries': 6},
+    'apps:api_master_workload': {'queries': 6},
+    'apps:api_service_price': {'queries': 5},
+    'apps:api_part_price': {'queries': 5},
+    'apps:api_order_search': {'queries': 3},
+    'apps:api_live_search': {'queries': 5},
+    'apps:order_events': {'queries': 2},
+}
+PERF_BUDGET_STRICT = False
+PERF_STATS_WINDOW = 1000
+
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite profili: SQLITE_PROFILE=tuned (standart) | plain
+# tuned - WAL (o'qish yozishni kutmaydi), synchronous=NORMAL, mmap/cache, kutish
+# vaqti va doimiy ulanishlar. Tranzaksiyalar DEFERRED; yozuvchi yo'llar
+# (stock.batch, summalar, to'lovlar) apps.db.write_atomic bilan yozish qulfini
+# boshida oladi (BEGIN IMMEDIATE), shuning uchun parallel yozuvchilar "database
+# is locked" o'rniga navbatda kutadi. Pragmalar har bir yangi ulanishda
+# init_command orqali beriladi. ASGI da DB_CONN_MAX_AGE standarti 0 (config/asgi.py):
+# har so'rov alohida thread da ishlaydi, doimiy ulanishlar yopilmay to'planadi.
+
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=20000',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+]
+
+_SQLITE_PROFILES = {
+    'plain': {},
+    'tuned': {
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'init_command': ';'.join(SQLITE_PRAGMAS),
+        },
+    },
+}
+
+# Ma'lumotlar bazasi: DB_ENGINE=sqlite (standart) | postgresql
+# postgresql: POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT
+# (kerak: pip install "psycopg[binary]"). Ulanishlar hovuzi - DB_POOL_MAX_SIZE
+# (standart 0 - hovuzsiz, CONN_MAX_AGE ishlatiladi; hovuz uchun "psycopg[pool]").
+# .iterator() (CSV hisobotlar) PostgreSQL da server tomonidagi kursor bilan
+# o'qiydi; pgbouncer (transaction pooling) orqasida DB_DISABLE_SERVER_SIDE_CURSORS=1 qiling.
+
+def _postgres_database():
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'avtoservis'),
+        'USER': os.environ.get('POSTGRES_USER', 'avtoservis'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'DISABLE_SERVER_SIDE_CURSORS': os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS') == '1',
+        'OPTIONS': {},
+    }
+    pool_size = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+    if pool_size:
+        # Hovuz bilan CONN_MAX_AGE 0 bo'lishi shart
+        database['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': pool_size,
+            'timeout': 10,
+        }
+    else:
+        database['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 600))
+        database['CONN_HEALTH_CHECKS'] = True
+    return database
+
+
+_SQLITE_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+    **_SQLITE_PROFILES[os.environ.get('SQLITE_PROFILE', 'tuned')],
+}
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': (
+        _postgres_database()
+        if os.environ.get('DB_ENGINE', 'sqlite') == 'postgresql'
+        else _SQLITE_DATABASE
+    ),
+}
+
+# O'qish replikasi (ixtiyoriy): POSTGRES_REPLICA_HOST (/_PORT, /_DB) - oqimli
+# replikatsiya qilingan server yoki lokal sinov uchun ikkinchi baza; SQLite da SQLITE_REPLICA_PATH - lokal sinov uchun ikkinchi fayl
+# (python manage.py sync_replica bilan nusxalanadi). apps.replicas.read_replica
+# bilan belgilangan ko'rinishlar o'qishni replikadan qiladi; replika
+# REPLICA_MAX_LAG soniyadan ortiq orqada qolsa yoki ishlamasa - primary dan.
+# Buyurtma saqlangandan keyin REPLICA_STICKY_SECONDS davomida sessiya primary
+# dan o'qiydi (o'z yozuvini ko'rishi uchun).
+
+if os.environ.get('POSTGRES_REPLICA_HOST') and DATABASES['default']['ENGINE'].endswith('postgresql'):
+    DATABASES['replica'] = {
+        **_postgres_database(),
+        'HOST': os.environ['POSTGRES_REPLICA_HOST'],
+        'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'NAME': os.environ.get('POSTGRES_REPLICA_DB', DATABASES['default']['NAME']),
+        'TEST': {'MIRROR': 'default'},
+    }
+elif os.environ.get('SQLITE_REPLICA_PATH') and DATABASES['default']['ENGINE'].endswith('sqlite3'):
+    DATABASES['replica'] = {
+        **_SQLITE_DATABASE,
+        'NAME': os.environ['SQLITE_REPLICA_PATH'],
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['apps.replicas.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))
+REPLICA_LAG_CHECK_INTERVAL = 2.0
+REPLICA_STICKY_SECONDS = 15
+
+
+# Jonli buyurtmalar paneli (SSE, faqat ASGI): apps.events
+# Standart - jarayon ichidagi broker; bir nechta worker/server uchun
+# ORDER_EVENTS_BROKER=apps.events.PostgresBroker (LISTEN/NOTIFY).
+# queue_size - har bir mijoz navbati (to'lsa "resync"), history - qayta
+# ulanishda Last-Event-ID dan keyin yuboriladigan hodisalar.
+
+ORDER_EVENTS_BROKER = os.environ.get('ORDER_EVENTS_BROKER', 'apps.events.InMemoryBroker')
+ORDER_EVENTS_OPTIONS = {
+    'queue_size': 100,
+    'max_clients': int(os.environ.get('ORDER_EVENTS_MAX_CLIENTS', 200)),
+    'history': 256,
 }
+ORDER_EVENTS_HEARTBEAT = 15
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Katalog keshi: CATALOG_CACHE=locmem (standart) | file | db
+# ("db" uchun avval: python manage.py createcachetable)
+
+_CATALOG_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'avtoservis-catalog',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.cache' / 'catalog',
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'catalog_cache',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': _CATALOG_CACHE_BACKENDS[os.environ.get('CATALOG_CACHE', 'locmem')],
+    # Shablon fragmentlari (apps.fragments): ro'yxat qatorlari, buyurtma jadvallari.
+    # Kalit versiyali - eski fragmentlar MAX_ENTRIES to'lganda siqib chiqariladi
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'avtoservis-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+CATALOG_CACHE_ALIAS = 'catalog'
+# Katalog versiyasi bazadan qayta o'qilguncha (soniya); signal lokal nusxani darhol yangilaydi
+CATALOG_VERSION_TTL = 1.0
 
 
 # Password validation
@@ -122,6 +306,20 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Yuklangan fayllar xotirada emas, bo'laklab vaqtinchalik faylga yoziladi
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Foto nusxalari (apps.photos): fon oqimlari soni va format (WEBP yoki JPEG)
+PHOTO_WORKERS = int(os.environ.get('PHOTO_WORKERS', 2))
+PHOTO_DERIVATIVE_FORMAT = 'WEBP'
+# True bo'lsa nusxalar so'rov ichida (tranzaksiyadan keyin) yaratiladi
+PHOTO_PROCESSING_SYNC = False
+
+# Tayyor cheklar (HTML va PDF) - buyurtma versiyasi bo'yicha diskda
+RECEIPT_CACHE_DIR = BASE_DIR / '.cache' / 'receipts'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 